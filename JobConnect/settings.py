@@ -55,7 +55,10 @@ INSTALLED_APPS = [
     'jobs',
     'notifications',
     'resumes',
+    'taskqueue',
+    'uploads',
     'django.contrib.humanize',
+    'django.contrib.postgres',
 ]
 
 AWS_ACCESS_KEY_ID = os.getenv('SUPABASE_S3_ACCESS_KEY')
@@ -69,6 +72,12 @@ AWS_DEFAULT_ACL = os.getenv('AWS_DEFAULT_ACL', 'public-read')
 AWS_QUERYSTRING_AUTH = False
 AWS_S3_OBJECT_PARAMETERS = {'CacheControl': 'max-age=86400'}
 
+# Point at another S3-compatible service instead of Supabase (e.g. a local
+# MinIO or moto_server when trying direct uploads)
+if os.getenv('S3_ENDPOINT_URL'):
+    AWS_S3_ENDPOINT_URL = os.getenv('S3_ENDPOINT_URL')
+    AWS_S3_CUSTOM_DOMAIN = None
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -111,6 +120,9 @@ DATABASES = {
 }
 
 DATABASES['default']['CONN_MAX_AGE'] = 0
+# Large exports read rows through server-side cursors. Set this when DATABASE_URL
+# points at a transaction-mode pooler (Supabase port 6543), which cannot hold them.
+DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = os.getenv('DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True'
 
 # Cache configuration
 # Use Redis in production, local-memory cache in development
@@ -121,9 +133,30 @@ CACHES = {
         'OPTIONS': {
             'MAX_ENTRIES': 1000
         }
-    }
+    },
+    # Rendered template fragments (utils/fragment_cache.py), kept apart so a
+    # page of results does not push sessions out of the default cache
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragments',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000
+        }
+    },
 }
 
+# Cache shared by every web process and the task worker, for entries one
+# process must be able to drop for all of them (signed-in identities,
+# sessions). Without REDIS_URL there is none: identities are loaded on every
+# request and sessions are kept in the database only.
+SHARED_CACHE_ALIAS = 'shared'
+if os.getenv('REDIS_URL'):
+    CACHES[SHARED_CACHE_ALIAS] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+        'KEY_PREFIX': 'jobconnect',
+    }
+
 # For production with Redis, use this configuration:
 # CACHES = {
 #     'default': {
@@ -141,6 +174,19 @@ CACHES = {
 CACHE_TTL = 60 * 15  # 15 minutes default
 CACHE_TTL_LONG = 60 * 60 * 24  # 24 hours for rarely-changing data
 
+# Search snapshots (cached result-ID lists used to paginate search results)
+SEARCH_SNAPSHOT_TTL = 60 * 10  # 10 minutes
+SEARCH_SNAPSHOT_MAX_RESULTS = 10000
+
+# Listings stop counting exactly past this many rows and show "10,000+"
+PAGINATION_COUNT_LIMIT = 10000
+
+# {% cachefragment %} blocks (job cards and rows, company headers). Without a
+# shared cache, other processes may show renamed lookups (job types,
+# categories) for up to FRAGMENT_CACHE_TIMEOUT; see utils/fragment_cache.py
+FRAGMENT_CACHE_ALIAS = 'fragments'
+FRAGMENT_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -169,6 +215,41 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    'utils.assets.BuildFinder',
+]
+
+# Build-time asset pipeline (utils/assets.py): `manage.py build_assets` writes
+# the bundles below and WebP/AVIF copies of static images to STATIC_BUILD_DIR,
+# then collectstatic fingerprints and precompresses everything. Templates load
+# a bundle with {% bundle 'name' 'css' %}; with bundles disabled, or before
+# they are built, its source files are linked one by one.
+STATIC_BUILD_DIR = BASE_DIR / 'static_build'
+STATIC_BUNDLES_ENABLED = os.getenv('STATIC_BUNDLES_ENABLED', str(not DEBUG)) == 'True'
+STATIC_BUNDLES = {
+    'site': {
+        'css': ['css/global.css', 'css/messages_toast.css'],
+        'js': ['js/messages_toast.js'],
+    },
+    'signed_in': {
+        'js': ['js/notifications.js', 'js/direct_upload.js'],
+    },
+    'applicant_dashboard': {
+        'css': ['css/dashboard/dashboard_base.css', 'css/dashboard/applicant/applicant_dashboard.css',
+                'css/dashboard/messages.css'],
+        'js': ['js/dashboard/dashboard.js'],
+    },
+    'employer_dashboard': {
+        'css': ['css/dashboard/dashboard_base.css', 'css/dashboard/employer/employer_dashboard.css',
+                'css/dashboard/messages.css'],
+        'js': ['js/dashboard/dashboard.js'],
+    },
+    'admin_dashboard': {
+        'css': ['css/dashboard/dashboard_base.css'],
+    },
+}
 
 # Media files are stored in Supabase S3 bucket (handled by django-storages)
 MEDIA_URL = f"https://{os.getenv('SUPABASE_PROJECT_ID')}.supabase.co/storage/v1/object/public/{os.getenv('SUPABASE_BUCKET_NAME')}/"
@@ -177,16 +258,70 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'accounts.User'
 
+# IdentityBackend loads the signed-in user with their profile in one query and
+# caches it in the shared cache, if there is one (accounts/backends.py). ModelBackend stays listed so sessions
+# started before it was added remain signed in.
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.IdentityBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+IDENTITY_CACHE_TIMEOUT = 60 * 5  # 5 minutes
+
+# Sessions are read from the shared cache, if there is one, and written to the
+# database only when they change (utils/sessions.py); `manage.py prune_sessions`
+# deletes expired rows
+SESSION_ENGINE = 'utils.sessions'
+SESSION_CACHE_ALIAS = SHARED_CACHE_ALIAS
+
 
 STORAGES = {
     "default": {
         "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
     },
+    # Fingerprinted through staticfiles.json, with .gz and .br copies for WhiteNoise
     "staticfiles": {
-        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        "BACKEND": "utils.assets.StaticAssetStorage",
     },
 }
 
+# Keep uploads on local disk instead of the Supabase bucket (development and tests)
+if os.getenv('USE_LOCAL_MEDIA', 'False') == 'True':
+    MEDIA_ROOT = BASE_DIR / 'media'
+    MEDIA_URL = '/media/'
+    STORAGES["default"] = {"BACKEND": "django.core.files.storage.FileSystemStorage"}
+
+# Background tasks (taskqueue app). Production runs `python manage.py run_worker`;
+# in eager mode tasks run in-process right after the request's transaction commits.
+TASKS_EAGER = os.getenv('TASKS_EAGER', str(DEBUG)) == 'True'
+TASKS_RETRY_BASE_DELAY = 30  # seconds; doubles with each failed attempt
+TASKS_RETRY_MAX_DELAY = 60 * 60
+TASKS_HEARTBEAT_INTERVAL = 60  # seconds between lock refreshes for running tasks
+TASKS_LOCK_TIMEOUT = 60 * 15  # requeue tasks whose lock went unrefreshed (crashed worker)
+TASKS_RETENTION = 60 * 60 * 24 * 7  # keep completed tasks for a week
+
+# Resume text extraction (resumes/extraction.py)
+RESUME_EXTRACTION_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
+RESUME_EXTRACTION_TIMEOUT = 30  # seconds per file
+RESUME_TEXT_MAX_CHARS = 100000
+
+# Direct-to-storage uploads (uploads/direct.py). The bucket needs a CORS rule
+# allowing PUT from the site's origin.
+DIRECT_UPLOAD_GRANT_TTL = 60 * 15  # seconds to start and finish the upload
+DIRECT_UPLOAD_TOKEN_MAX_AGE = 60 * 60 * 24  # a verified upload must be saved within a day
+
+# Resized profile image, logo and banner variants (uploads/images.py)
+IMAGE_VARIANT_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
+IMAGE_VARIANT_MAX_PIXELS = 25 * 1000 * 1000  # refuse to decode anything larger (about 75 MB as RGB)
+
+# Downloads from the job applications board: CSV/XLSX and resume ZIPs (dashboard/exports.py)
+APPLICATION_EXPORT_CHUNK_SIZE = 2000  # rows fetched per server-side cursor round trip
+RESUME_ARCHIVE_MAX_FILE_BYTES = 10 * 1024 * 1024  # larger resumes are listed in SKIPPED.txt instead
+RESUME_ARCHIVE_WORKERS = 8  # resumes downloaded from storage at once for a ZIP
+
+# Job detail view counts (jobs/impressions.py), buffered per web process
+JOB_VIEWS_FLUSH_INTERVAL = 30  # seconds between batched writes
+JOB_VIEWS_MAX_PENDING = 10000  # flush sooner once this many views are buffered
+
 # Email configuration for password reset
 # For development: emails are printed to console
 # For production: configure a real email backend (SMTP, SendGrid, etc.)
@@ -202,4 +337,7 @@ else:
     EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@jobconnect.com')
+
+# Absolute base URL for links in emails sent outside a request (job alert digests)
+SITE_URL = os.getenv('SITE_URL', 'https://csit327-g1-jobconnect.onrender.com')
 SERVER_EMAIL = os.getenv('SERVER_EMAIL', 'noreply@jobconnect.com')
\ No newline at end of file
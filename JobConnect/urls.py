@@ -30,6 +30,7 @@ urlpatterns = [
     path("jobs/", include(("jobs.urls", "jobs"), namespace="jobs")),
     path('notifications/', include('notifications.urls')),
     path('resumes/', include(('resumes.urls', 'resumes'), namespace='resumes')),
+    path('uploads/', include(('uploads.urls', 'uploads'), namespace='uploads')),
 ]
 
 # Custom error handlers
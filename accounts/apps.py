@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class AccountsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'accounts'
+
+    def ready(self):
+        """Drop cached identities (accounts/backends.py) when the user or a row loaded with it changes."""
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save
+        from .backends import IDENTITY_RELATED, invalidate_identity_on_change
+
+        User = get_user_model()
+        models = [User] + [User._meta.get_field(name).related_model for name in IDENTITY_RELATED]
+        for model in models:
+            label = model._meta.label_lower
+            post_save.connect(invalidate_identity_on_change, sender=model, dispatch_uid=f'identity_save_{label}')
+            post_delete.connect(invalidate_identity_on_change, sender=model, dispatch_uid=f'identity_delete_{label}')
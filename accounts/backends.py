@@ -0,0 +1,68 @@
+"""
+Authentication backend that loads the signed-in user together with the rows
+pages read about them on every request.
+
+AuthenticationMiddleware calls get_user() to turn the session's user id into
+request.user. IdentityBackend does it with one query that also joins the
+user's applicant or employer profile, verification and notification
+preferences (user.profile, base.html's avatar, the settings pages), and keeps
+the result in the shared cache, so most requests of a session need no query
+for it. Without a shared cache (see utils.caching.shared_cache) nothing is
+cached: a password change or deactivation saved by one process has to reach
+every other web process and the task worker at once.
+
+Cached identities are stored under a per-user version. Saving or deleting the
+user or any of the joined rows replaces the version (see AccountsConfig.ready),
+so the next request reloads, and a request that read the old rows meanwhile
+can only write them under the old version. Code changing those rows with
+queryset.update() or bulk_create() must call invalidate_identity() itself
+(e.g. UserVerificationManager.set_status).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from utils.caching import bump_cache_version, cache_version, shared_cache
+
+
+# One-to-one rows loaded with the user. Only one of the profiles exists for a
+# given user; the other join finds nothing and is remembered as missing.
+IDENTITY_RELATED = ('applicant_profile_rel', 'employer_profile_rel', 'verification', 'notification_preferences')
+
+
+def _version_key(user_id):
+    return f'identity:version:{user_id}'
+
+
+def invalidate_identity(user_id):
+    cache = shared_cache()
+    if cache is not None:
+        bump_cache_version(_version_key(user_id), cache)
+
+
+def load_identity(user_id):
+    """The user with IDENTITY_RELATED joined, or None."""
+    User = get_user_model()
+    return User._default_manager.select_related(*IDENTITY_RELATED).filter(pk=user_id).first()
+
+
+class IdentityBackend(ModelBackend):
+    def get_user(self, user_id):
+        cache = shared_cache()
+        if cache is None:
+            user = load_identity(user_id)
+        else:
+            key = f'identity:{user_id}:{cache_version(_version_key(user_id), cache)}'
+            user = cache.get(key)
+            if user is None:
+                user = load_identity(user_id)
+                if user is not None:
+                    cache.set(key, user, getattr(settings, 'IDENTITY_CACHE_TIMEOUT', 300))
+        if user is None:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+def invalidate_identity_on_change(sender, instance, **kwargs):
+    """post_save/post_delete receiver for the user and the rows in IDENTITY_RELATED."""
+    invalidate_identity(instance.pk if isinstance(instance, get_user_model()) else instance.user_id)
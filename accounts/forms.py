@@ -178,6 +178,19 @@ class CustomPasswordResetForm(PasswordResetForm):
         })
     )
 
+    def send_mail(self, subject_template_name, email_template_name, context,
+                  from_email, to_email, html_email_template_name=None):
+        """Render the reset email here and hand the SMTP delivery to a background task."""
+        from django.template import loader
+        from .tasks import send_email
+
+        subject = ''.join(loader.render_to_string(subject_template_name, context).splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        html_body = None
+        if html_email_template_name is not None:
+            html_body = loader.render_to_string(html_email_template_name, context)
+        send_email.enqueue(subject, body, from_email, [to_email], html_body)
+
 
 class CustomSetPasswordForm(SetPasswordForm):
     """Custom set password form with styled fields"""
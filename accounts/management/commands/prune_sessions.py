@@ -0,0 +1,32 @@
+"""
+Delete expired sessions from the django_session table in batches (see
+utils/sessions.py), e.g. daily from cron:
+    30 3 * * *  cd /app && python manage.py prune_sessions
+Smaller batches with a pause between them on a busy database:
+    python manage.py prune_sessions --batch-size 1000 --pause 0.5
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.sessions import PRUNE_BATCH_SIZE, prune_expired_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions from the database in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PRUNE_BATCH_SIZE,
+                            help='Sessions deleted per statement.')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Seconds to wait between batches.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        start = time.perf_counter()
+        deleted = prune_expired_sessions(batch_size=options['batch_size'], pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} expired session(s) in {time.perf_counter() - start:.2f}s.'
+        ))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.25 on 2026-10-19 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_user_accepted_terms'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['user_type', '-date_joined'], name='accounts_us_user_ty_65efcc_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@
 from django.contrib.auth.models import AbstractUser
 import os
 
+from utils.managers import UserVerificationManager
+
 
 def resume_upload_path(instance, filename):
     ext = os.path.splitext(filename)[1]
@@ -65,6 +67,12 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Admin listings: users of one type, newest or oldest first
+            models.Index(fields=['user_type', '-date_joined']),
+        ]
+
 
 class UserVerification(models.Model):
     """
@@ -105,6 +113,8 @@ class UserVerification(models.Model):
         blank=True,
         help_text='Admin comments on the verification decision'
     )
+
+    objects = UserVerificationManager()
     
     class Meta:
         verbose_name = 'User Verification'
@@ -0,0 +1,15 @@
+"""
+Background tasks for accounts (run by `manage.py run_worker`, see taskqueue).
+"""
+from django.core.mail import EmailMultiAlternatives
+
+from taskqueue.queue import PRIORITY_HIGH, task
+
+
+@task(priority=PRIORITY_HIGH)
+def send_email(subject, body, from_email, recipient_list, html_body=None):
+    """Send an already-rendered email, so the SMTP round trip happens outside the request."""
+    message = EmailMultiAlternatives(subject, body, from_email, recipient_list)
+    if html_body:
+        message.attach_alternative(html_body, 'text/html')
+    message.send()
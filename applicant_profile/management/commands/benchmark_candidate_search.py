@@ -0,0 +1,145 @@
+"""
+Time the employer candidate search against a synthetic population of profiles.
+
+Profiles, users and social links are generated inside a transaction that is
+rolled back at the end, so the database is left untouched (PostgreSQL only):
+    python manage.py benchmark_candidate_search
+    python manage.py benchmark_candidate_search --profiles 500000 --query "python developer"
+"""
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import UserSocialLink
+from applicant_profile.models import ApplicantProfile
+from applicant_profile.search import (
+    get_candidate_facets, search_candidates, update_search_vectors,
+)
+from utils.pagination import KeysetPaginator
+
+
+TITLES = [
+    'Python Developer', 'Frontend Engineer', 'Data Analyst', 'Registered Nurse',
+    'Accountant', 'Graphic Designer', 'Customer Support Specialist', 'Project Manager',
+    'Mechanical Engineer', 'Marketing Associate', 'DevOps Engineer', 'Teacher',
+]
+SKILLS = [
+    'django', 'react', 'sql', 'excel', 'figma', 'kubernetes', 'aws', 'tableau',
+    'payroll', 'seo', 'autocad', 'communication', 'leadership', 'java', 'nursing',
+]
+PLACES = [
+    ('Cebu City', 'Philippines'), ('Manila', 'Philippines'), ('Davao', 'Philippines'),
+    ('Singapore', 'Singapore'), ('Tokyo', 'Japan'), ('Sydney', 'Australia'),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark candidate search queries on generated profiles (rolled back afterwards).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=500000, help='Number of profiles to generate.')
+        parser.add_argument('--query', default='python django', help='Text query to time.')
+        parser.add_argument('--pages', type=int, default=50, help='Pages to walk for the deep-page timing.')
+        parser.add_argument('--per-page', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Candidate search needs PostgreSQL full-text search.')
+
+        self.random = random.Random(options['seed'])
+        try:
+            with transaction.atomic():
+                self.seed(options['profiles'], options['batch_size'])
+                self.run(options)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('Generated rows rolled back.')
+
+    def seed(self, total, batch_size):
+        User = get_user_model()
+        rng = self.random
+        education = [value for value, _ in ApplicantProfile.EDUCATION_LEVEL_CHOICES]
+        experience = [value for value, _ in ApplicantProfile._meta.get_field('experience').choices]
+
+        start = time.perf_counter()
+        for offset in range(0, total, batch_size):
+            users = User.objects.bulk_create([
+                User(
+                    username=f'bench-{i}', email=f'bench-{i}@example.invalid',
+                    user_type='applicant', password='!',
+                )
+                for i in range(offset, min(offset + batch_size, total))
+            ])
+            profiles = []
+            links = []
+            for user in users:
+                city, country = rng.choice(PLACES)
+                profiles.append(ApplicantProfile(
+                    user=user,
+                    first_name='Bench',
+                    last_name=str(user.pk),
+                    title=rng.choice(TITLES),
+                    biography=' '.join(rng.sample(SKILLS, 5)),
+                    location_city=city,
+                    location_country=country,
+                    education_level=rng.choice(education),
+                    experience=rng.choice(experience),
+                    is_public=rng.random() < 0.8,
+                ))
+                links.append(UserSocialLink(user=user, platform='linkedin', url='https://linkedin.com/in/bench'))
+            ApplicantProfile.objects.bulk_create(profiles)
+            UserSocialLink.objects.bulk_create(links)
+        update_search_vectors(ApplicantProfile.objects.filter(user__email__endswith='@example.invalid'))
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(f'Seeded {total} profiles in {time.perf_counter() - start:.1f}s')
+
+    def run(self, options):
+        query = options['query']
+        per_page = options['per_page']
+
+        def profiles(text):
+            return search_candidates(text).select_related('user').prefetch_related('user__social_links')
+
+        for label, text, sort_field, parse_value in (
+            ('browse', '', 'updated_at', None),
+            ('search', query, 'rank', float),
+        ):
+            paginator = KeysetPaginator(profiles(text), per_page, sort_field=sort_field, parse_value=parse_value)
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                page = paginator.page()
+                for profile in page:
+                    [link.url for link in profile.user.social_links.all()]
+                first = time.perf_counter() - start
+
+            cursor = page.next_cursor
+            walked = 1
+            deep = 0.0
+            while cursor and walked < options['pages']:
+                start = time.perf_counter()
+                page = paginator.page(cursor)
+                deep = time.perf_counter() - start
+                cursor = page.next_cursor
+                walked += 1
+
+            self.stdout.write(
+                f'{label:<7} first page {first * 1000:7.1f} ms ({len(queries)} queries), '
+                f'page {walked} {deep * 1000:7.1f} ms'
+            )
+
+        # Bypass the cache so the facet aggregation itself is timed
+        start = time.perf_counter()
+        get_candidate_facets.__wrapped__(query)
+        self.stdout.write(self.style.SUCCESS(f'facets  {(time.perf_counter() - start) * 1000:7.1f} ms (uncached)'))
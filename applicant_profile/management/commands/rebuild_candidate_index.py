@@ -0,0 +1,37 @@
+"""
+Rebuild the full-text search vectors used by the employer candidate search.
+
+Profiles are reindexed on save and when a resume finishes extraction; run this
+after bulk imports or changes to the vector definition:
+    python manage.py rebuild_candidate_index
+"""
+from django.core.management.base import BaseCommand
+
+from applicant_profile.models import ApplicantProfile
+from applicant_profile.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Recompute ApplicantProfile.search_vector for all (or only public) profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--public-only', action='store_true', help='Only reindex public profiles.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Profiles updated per statement.')
+
+    def handle(self, *args, **options):
+        profiles = ApplicantProfile.objects.order_by('pk')
+        if options['public_only']:
+            profiles = profiles.filter(is_public=True)
+
+        batch_size = options['batch_size']
+        updated = 0
+        last_pk = 0
+        while True:
+            # Keyset batches keep each UPDATE (and its row locks) short
+            pks = list(profiles.filter(pk__gt=last_pk).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            updated += update_search_vectors(ApplicantProfile.objects.filter(pk__in=pks))
+            last_pk = pks[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Reindexed {updated} applicant profile(s).'))
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:35
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicant_profile', '0005_applicantprofile_setup_completed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full-text index of title, biography, location and resume text (see applicant_profile/search.py)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='applicant_p_search__24f449_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(fields=['is_public', '-updated_at', '-user'], name='applicant_p_is_publ_118099_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(fields=['is_public', 'education_level'], name='applicant_p_is_publ_deea65_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(fields=['is_public', 'experience'], name='applicant_p_is_publ_cc50dc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicantprofile',
+            index=models.Index(fields=['is_public', 'location_country'], name='applicant_p_is_publ_7267da_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicant_profile', '0006_applicantprofile_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicantprofile',
+            name='profile_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of profile_image, written by uploads.images'),
+        ),
+    ]
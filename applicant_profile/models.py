@@ -1,5 +1,7 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinLengthValidator, FileExtensionValidator
 
 
@@ -21,6 +23,12 @@ class ApplicantProfile(models.Model):
         null=True,
         help_text="Applicant's profile picture"
     )
+    profile_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized copies of profile_image, written by uploads.images"
+    )
     
     contact_number = models.CharField(
         max_length=20,
@@ -139,11 +147,24 @@ class ApplicantProfile(models.Model):
         default=False,
         help_text="Indicates whether the user has completed the initial profile setup wizard"
     )
+
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Full-text index of title, biography, location and resume text (see applicant_profile/search.py)"
+    )
     
     class Meta:
         verbose_name = 'Applicant Profile'
         verbose_name_plural = 'Applicant Profiles'
         ordering = ['-updated_at']
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            models.Index(fields=['is_public', '-updated_at', '-user']),
+            models.Index(fields=['is_public', 'education_level']),
+            models.Index(fields=['is_public', 'experience']),
+            models.Index(fields=['is_public', 'location_country']),
+        ]
     
     @property
     def full_name(self):
@@ -186,6 +207,12 @@ class ApplicantProfile(models.Model):
             pass
         return '/media/defaults/default-avatar.png'
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the candidate search vector in step with the profile text
+        from .search import update_search_vectors
+        update_search_vectors(ApplicantProfile.objects.filter(pk=self.pk))
+
     def __str__(self):
         return f"{self.full_name or 'Unnamed'} ({self.user.email})"
 
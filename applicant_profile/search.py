@@ -0,0 +1,98 @@
+"""
+Full-text candidate search over public applicant profiles.
+
+Each ApplicantProfile carries a weighted search vector built from its title (A),
+biography (B), location (C) and the extracted text of the applicant's default
+(or newest) resume (D). The vector is refreshed when the profile is saved and
+when a resume finishes extraction; `manage.py rebuild_candidate_index`
+rebuilds it for every profile.
+
+Search and vectors rely on PostgreSQL full-text search; on other databases the
+vector stays empty and text queries match nothing.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Count, F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+from utils.caching import cache_result
+
+from .models import ApplicantProfile
+
+
+SEARCH_CONFIG = 'english'
+
+FACET_LIMIT = 10
+
+
+def profile_search_vector():
+    """Expression that computes ApplicantProfile.search_vector in the database."""
+    from resumes.models import Resume
+
+    resume_text = Subquery(
+        Resume.objects.filter(
+            user=OuterRef('user'), extraction_status=Resume.EXTRACTION_DONE
+        ).order_by('-is_default', '-uploaded_at').values('extracted_text')[:1]
+    )
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('biography', weight='B', config=SEARCH_CONFIG) +
+        SearchVector('location_city', 'location_country', weight='C', config=SEARCH_CONFIG) +
+        SearchVector(resume_text, weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset=None):
+    """Recompute search vectors for `queryset` (all profiles by default) in one UPDATE."""
+    if connection.vendor != 'postgresql':
+        return 0
+    if queryset is None:
+        queryset = ApplicantProfile.objects.all()
+    return queryset.update(search_vector=profile_search_vector())
+
+
+def public_profiles():
+    return ApplicantProfile.objects.filter(is_public=True, user__is_active=True)
+
+
+def search_candidates(query='', education='', experience='', country=''):
+    """
+    Public profiles matching a web-style text query and facet filters.
+    With a query, rows are annotated with `rank` (higher is better).
+    """
+    profiles = public_profiles()
+    if education:
+        profiles = profiles.filter(education_level=education)
+    if experience:
+        profiles = profiles.filter(experience=experience)
+    if country:
+        profiles = profiles.filter(location_country=country)
+    if query:
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        # ts_rank() returns a float4, whose text form does not read back as the
+        # same double; as a float8 the rank round-trips through keyset cursors
+        profiles = profiles.filter(search_vector=search_query).annotate(
+            rank=Cast(SearchRank(F('search_vector'), search_query), FloatField())
+        )
+    return profiles
+
+
+@cache_result(timeout=300, key_prefix='candidate_facets')
+def get_candidate_facets(query=''):
+    """
+    Value counts for the education, experience and country filters among public
+    profiles matching `query`. Cached for 5 minutes.
+    """
+    profiles = search_candidates(query).order_by()
+
+    def counts(field):
+        rows = profiles.exclude(**{field: ''}).values(field).annotate(
+            count=Count('pk')
+        ).order_by('-count', field)[:FACET_LIMIT]
+        return [(row[field], row['count']) for row in rows]
+
+    return {
+        'education': counts('education_level'),
+        'experience': counts('experience'),
+        'country': counts('location_country'),
+    }
@@ -4,5 +4,8 @@ set -o errexit
 
 pip install -r requirements.txt
 
+# Bundles, minifies and converts static assets; collectstatic then fingerprints
+# and precompresses them (utils/assets.py)
+python manage.py build_assets
 python manage.py collectstatic --no-input
 python manage.py migrate
\ No newline at end of file
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+
+    def ready(self):
+        """Check at startup that every dashboard route requires a role or a signed-in user."""
+        from django.core import checks
+        from utils.permissions import check_route_permissions
+
+        checks.register(check_route_permissions, checks.Tags.urls)
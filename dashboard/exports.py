@@ -0,0 +1,216 @@
+"""
+Downloads of a job's applications board: CSV and XLSX exports and a ZIP of
+the submitted resumes.
+
+Rows come straight from a values() projection of JobApplication joined to the
+applicant, their profile, the pipeline stage and the resume, read with
+.iterator(chunk_size=APPLICATION_EXPORT_CHUNK_SIZE) (a server-side cursor on
+PostgreSQL) and written by the streaming writers in utils/exports.py. No model
+instances are built and memory stays flat however many applications a job has.
+
+Resume files are read from storage on a small thread pool and added to the ZIP
+as each one arrives, so the member order varies but the names do not: every
+file is named after its application ID, applicant and resume.
+"""
+import os
+import zipfile
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+
+from utils.exports import (
+    CSV_CONTENT_TYPE, XLSX_CONTENT_TYPE, ZIP_CONTENT_TYPE,
+    fetch_stored_files, stream_csv, stream_xlsx, stream_zip,
+)
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, CSV_CONTENT_TYPE),
+    'xlsx': (stream_xlsx, XLSX_CONTENT_TYPE),
+}
+
+EXPORT_FIELDS = (
+    'id',
+    'applicant__first_name',
+    'applicant__last_name',
+    'applicant__email',
+    'applicant__applicant_profile_rel__first_name',
+    'applicant__applicant_profile_rel__middle_name',
+    'applicant__applicant_profile_rel__last_name',
+    'applicant__applicant_profile_rel__contact_number',
+    'applicant__applicant_profile_rel__title',
+    'applicant__applicant_profile_rel__education_level',
+    'applicant__applicant_profile_rel__experience',
+    'applicant__applicant_profile_rel__location_city',
+    'applicant__applicant_profile_rel__location_country',
+    'stage__name',
+    'status',
+    'match_score',
+    'employer_rating',
+    'application_date',
+    'hired_date',
+    'resume__name',
+)
+
+EXPORT_HEADER = (
+    'Application ID',
+    'Name',
+    'Email',
+    'Contact Number',
+    'Title',
+    'Education',
+    'Experience',
+    'City',
+    'Country',
+    'Stage',
+    'Status',
+    'Match Score',
+    'Rating',
+    'Applied On',
+    'Hired On',
+    'Resume',
+)
+
+
+RESUME_ARCHIVE_FIELDS = (
+    'id',
+    'applicant__first_name',
+    'applicant__last_name',
+    'applicant__email',
+    'applicant__applicant_profile_rel__first_name',
+    'applicant__applicant_profile_rel__middle_name',
+    'applicant__applicant_profile_rel__last_name',
+    'resume__name',
+    'resume__file',
+    'resume__uploaded_at',
+)
+
+
+def applicant_name(row):
+    """The board's name for an applicant (ApplicantProfile.full_name), else the account's."""
+    profile = 'applicant__applicant_profile_rel__'
+    parts = [row[profile + 'first_name'], row[profile + 'middle_name'], row[profile + 'last_name']]
+    if not any(parts):
+        parts = [row['applicant__first_name'], row['applicant__last_name']]
+    return ' '.join(part for part in parts if part)
+
+
+def application_rows(applications, chunk_size=None):
+    """
+    Export rows (tuples matching EXPORT_HEADER) for a filtered and ordered
+    JobApplication queryset, fetched `chunk_size` rows at a time.
+    """
+    from applicant_profile.models import ApplicantProfile
+    from jobs.models import JobApplication
+
+    if chunk_size is None:
+        chunk_size = getattr(settings, 'APPLICATION_EXPORT_CHUNK_SIZE', 2000)
+    education_labels = dict(ApplicantProfile.EDUCATION_LEVEL_CHOICES)
+    experience_labels = dict(ApplicantProfile._meta.get_field('experience').choices)
+    status_labels = dict(JobApplication.STATUS_CHOICES)
+    current_timezone = timezone.get_current_timezone()
+    profile = 'applicant__applicant_profile_rel__'
+
+    for row in applications.values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        applied = row['application_date']
+        yield (
+            row['id'],
+            applicant_name(row),
+            row['applicant__email'],
+            row[profile + 'contact_number'],
+            row[profile + 'title'],
+            education_labels.get(row[profile + 'education_level'], row[profile + 'education_level']),
+            experience_labels.get(row[profile + 'experience'], row[profile + 'experience']),
+            row[profile + 'location_city'],
+            row[profile + 'location_country'],
+            row['stage__name'] or 'All Applications',
+            status_labels.get(row['status'], row['status']),
+            row['match_score'],
+            row['employer_rating'],
+            timezone.localtime(applied, current_timezone) if applied else None,
+            row['hired_date'],
+            row['resume__name'],
+        )
+
+
+def export_filename(job, what, extension):
+    stem = slugify(job.title)[:50] or f'job-{job.pk}'
+    return f'{stem}-{what}-{timezone.localdate():%Y-%m-%d}.{extension}'
+
+
+def export_applications_response(job, applications, export_format):
+    """StreamingHttpResponse downloading `applications` as CSV or XLSX."""
+    writer, content_type = EXPORT_FORMATS[export_format]
+    filename = export_filename(job, 'applications', export_format)
+    if export_format == 'xlsx':
+        content = writer(EXPORT_HEADER, application_rows(applications), sheet_name='Applications')
+    else:
+        content = writer(EXPORT_HEADER, application_rows(applications))
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    # Keep reverse proxies from buffering the whole download before sending it
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def resume_archive_name(row):
+    """
+    Name of an application's resume inside the ZIP, e.g.
+    `0001234_maria-santos_software-engineer-cv.pdf`: unique thanks to the
+    application ID, which also keeps an applicant's files sorted together.
+    """
+    applicant = slugify(applicant_name(row))[:40] or slugify(row['applicant__email'].split('@')[0])[:40]
+    resume = slugify(row['resume__name'] or '')[:40] or 'resume'
+    extension = os.path.splitext(row['resume__file'])[1].lower()[:10]
+    return f'{row["id"]:07d}_{applicant or "applicant"}_{resume}{extension}'
+
+
+def resume_archive_files(applications, max_bytes=None, workers=None, chunk_size=None):
+    """
+    (ZipInfo, bytes) pairs for the resumes submitted with `applications`, in
+    the order they finish downloading, followed by a SKIPPED.txt listing the
+    applications whose resume is missing, unreadable or over `max_bytes`.
+    """
+    from resumes.models import Resume
+
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'RESUME_ARCHIVE_MAX_FILE_BYTES', 10 * 1024 * 1024)
+    if workers is None:
+        workers = getattr(settings, 'RESUME_ARCHIVE_WORKERS', 8)
+    if chunk_size is None:
+        chunk_size = getattr(settings, 'APPLICATION_EXPORT_CHUNK_SIZE', 2000)
+    storage = Resume._meta.get_field('file').storage
+    skipped = []
+
+    def stored_resumes():
+        rows = applications.values(*RESUME_ARCHIVE_FIELDS).iterator(chunk_size=chunk_size)
+        for row in rows:
+            if not row['resume__file']:
+                skipped.append(f'Application {row["id"]} ({applicant_name(row) or row["applicant__email"]}): '
+                               f'no resume submitted')
+                continue
+            yield (resume_archive_name(row), row['resume__uploaded_at']), row['resume__file']
+
+    for (name, uploaded_at), data, error in fetch_stored_files(storage, stored_resumes(), max_bytes, workers):
+        if error:
+            skipped.append(f'{name}: {error}')
+            continue
+        info = zipfile.ZipInfo(name, date_time=timezone.localtime(uploaded_at).timetuple()[:6])
+        info.external_attr = 0o644 << 16
+        yield info, data
+
+    if skipped:
+        yield 'SKIPPED.txt', '\n'.join(sorted(skipped)) + '\n'
+
+
+def resume_archive_response(job, applications):
+    """StreamingHttpResponse downloading the resumes submitted with `applications` as a ZIP."""
+    filename = export_filename(job, 'resumes', 'zip')
+    response = StreamingHttpResponse(stream_zip(resume_archive_files(applications)), content_type=ZIP_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -3,6 +3,7 @@ from accounts.models import User, UserSocialLink
 from applicant_profile.models import ApplicantProfile
 from employer_profile.models import EmployerProfile
 from django.contrib.auth.forms import PasswordChangeForm
+from uploads.forms import DirectUploadFormMixin
 from .models import Message
 
 
@@ -42,8 +43,9 @@ class ApplicantSocialLinkForm(forms.ModelForm):
         return url
 
 
-class ApplicantPersonalInfoForm(forms.ModelForm):
+class ApplicantPersonalInfoForm(DirectUploadFormMixin, forms.ModelForm):
     """Form for Personal Information tab"""
+    direct_upload_fields = {'profile_image': 'applicant_profile_image'}
 
     class Meta:
         model = ApplicantProfile
@@ -289,8 +291,12 @@ class ApplicantProfilePrivacyForm(forms.ModelForm):
 # EMPLOYER FORMS
 # =====================================================
 
-class EmployerCompanyInfoForm(forms.ModelForm):
+class EmployerCompanyInfoForm(DirectUploadFormMixin, forms.ModelForm):
     """Form for Company Info tab"""
+    direct_upload_fields = {
+        'company_profile_image': 'company_profile_image',
+        'company_banner_image': 'company_banner_image',
+    }
 
     class Meta:
         model = EmployerProfile
@@ -453,8 +459,9 @@ class EmployerContactInfoForm(forms.ModelForm):
         return profile
 
 
-class EmployerBusinessPermitForm(forms.ModelForm):
+class EmployerBusinessPermitForm(DirectUploadFormMixin, forms.ModelForm):
     """Form for business permit upload"""
+    direct_upload_fields = {'company_business_permit': 'company_business_permit'}
 
     class Meta:
         model = EmployerProfile
@@ -541,7 +548,7 @@ class JobSearchForm(forms.Form):
         min_value=0,
         widget=forms.NumberInput(attrs={
             'class': 'salary-input',
-            'placeholder': 'Min',
+            'placeholder': 'Min / year',
             'id': 'salary_min'
         }),
         label='Minimum Salary'
@@ -554,7 +561,7 @@ class JobSearchForm(forms.Form):
         min_value=0,
         widget=forms.NumberInput(attrs={
             'class': 'salary-input',
-            'placeholder': 'Max',
+            'placeholder': 'Max / year',
             'id': 'salary_max'
         }),
         label='Maximum Salary'
@@ -650,6 +657,7 @@ class EmployerApplicationFilterForm(forms.Form):
             ('newest', 'Newest First'),
             ('oldest', 'Oldest First'),
             ('name', 'Name (A-Z)'),
+            ('match', 'Best Match'),
         ],
         widget=forms.RadioSelect(attrs={'class': 'sort-radio'}),
         label='Sort By'
@@ -664,6 +672,44 @@ class EmployerApplicationFilterForm(forms.Form):
         self.fields['experience'].choices = [('', 'All Experience Levels')] + list(experience_choices)
 
 
+class CandidateSearchForm(forms.Form):
+    """Employer talent search over public applicant profiles."""
+
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={
+            'class': 'search-input',
+            'placeholder': 'Skills, job title or keywords (e.g. "python developer" -intern)',
+        }),
+        label='Search'
+    )
+    education = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All Education Levels')] + ApplicantProfile.EDUCATION_LEVEL_CHOICES,
+        widget=forms.Select(attrs={'class': 'filter-dropdown'}),
+        label='Education'
+    )
+    experience = forms.ChoiceField(
+        required=False,
+        choices=[('', 'All Experience Levels')] + ApplicantProfile._meta.get_field('experience').choices,
+        widget=forms.Select(attrs={'class': 'filter-dropdown'}),
+        label='Experience'
+    )
+    country = forms.CharField(
+        required=False,
+        max_length=100,
+        widget=forms.TextInput(attrs={'class': 'filter-input', 'placeholder': 'Country'}),
+        label='Country'
+    )
+
+    def clean_q(self):
+        return ' '.join(self.cleaned_data.get('q', '').split())
+
+    def clean_country(self):
+        return self.cleaned_data.get('country', '').strip()
+
+
 class FavoriteJobForm(forms.Form):
     """Form for favoriting/unfavoriting a job with validation"""
 
@@ -715,7 +761,7 @@ class FavoriteJobForm(forms.Form):
 
 
 # ---------- Messaging forms (updated) ----------
-class ComposeForm(forms.Form):
+class ComposeForm(DirectUploadFormMixin, forms.Form):
     """
     Compose form uses recipient_email (visible email input) instead of numeric hidden id.
     Validate that the recipient email exists in the system.
@@ -750,6 +796,7 @@ class ComposeForm(forms.Form):
         required=False,
         widget=forms.ClearableFileInput(attrs={'id': 'id_attachment'})
     )
+    direct_upload_fields = {'attachment': 'message_attachment'}
 
     def clean_recipient_email(self):
         email = self.cleaned_data.get('recipient_email', '').strip()
@@ -761,7 +808,9 @@ class ComposeForm(forms.Form):
         return email
 
 
-class ReplyForm(forms.ModelForm):
+class ReplyForm(DirectUploadFormMixin, forms.ModelForm):
+    direct_upload_fields = {'attachment': 'message_attachment'}
+
     class Meta:
         model = Message
         fields = ['body', 'attachment']
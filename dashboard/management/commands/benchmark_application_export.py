@@ -0,0 +1,172 @@
+"""
+Time the job applications CSV/XLSX export on a synthetic job.
+
+An employer, a job with pipeline stages and `--applications` applicants (with
+profiles and resumes) are generated inside a transaction that is rolled back
+at the end, so the database is left untouched:
+    python manage.py benchmark_application_export
+    python manage.py benchmark_application_export --applications 200000 --chunk-size 5000
+
+Each export is consumed the way StreamingHttpResponse would send it and
+reported in rows/second, followed by a second pass under tracemalloc for the
+peak Python memory, which should not grow with the number of applications.
+"""
+import random
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from applicant_profile.models import ApplicantProfile
+from dashboard.exports import EXPORT_FORMATS, EXPORT_HEADER, application_rows
+from jobs.models import ApplicationStage, Job, JobApplication
+from resumes.models import Resume
+
+
+STAGES = ['Shortlisted', 'Phone Screen', 'Interview', 'Offer']
+TITLES = ['Python Developer', 'Data Analyst', 'Registered Nurse', 'Accountant', 'Project Manager']
+PLACES = [('Cebu City', 'Philippines'), ('Manila', 'Philippines'), ('Singapore', 'Singapore')]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark streaming exports of a job\'s applications (generated rows are rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=50000, help='Number of applications to generate.')
+        parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Rows per cursor fetch (default: APPLICATION_EXPORT_CHUNK_SIZE).')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        try:
+            with transaction.atomic():
+                job = self.seed(options['applications'], options['batch_size'])
+                self.run(job, options['chunk_size'])
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('Generated rows rolled back.')
+
+    def seed(self, total, batch_size):
+        User = get_user_model()
+        rng = self.random
+        education = [value for value, _ in ApplicantProfile.EDUCATION_LEVEL_CHOICES]
+        experience = [value for value, _ in ApplicantProfile._meta.get_field('experience').choices]
+        statuses = [value for value, _ in JobApplication.STATUS_CHOICES]
+
+        start = time.perf_counter()
+        employer = User.objects.create(
+            username='bench-employer', email='bench-employer@example.invalid',
+            user_type='employer', password='!',
+        )
+        job = Job.objects.create(
+            employer=employer, title='Benchmark Export Job', location='Cebu City',
+            description='Generated by benchmark_application_export and rolled back when it finishes.',
+            expiration_date=timezone.localdate() + timedelta(days=30),
+        )
+        stages = [None] + [
+            ApplicationStage.objects.get_or_create(job=job, name=name, defaults={'order': order})[0]
+            for order, name in enumerate(STAGES, 1)
+        ]
+
+        for offset in range(0, total, batch_size):
+            users = User.objects.bulk_create([
+                User(
+                    username=f'bench-{i}', email=f'bench-{i}@example.invalid',
+                    first_name='Bench', last_name=f'Applicant {i}',
+                    user_type='applicant', password='!',
+                )
+                for i in range(offset, min(offset + batch_size, total))
+            ])
+            profiles = []
+            resumes = []
+            for user in users:
+                city, country = rng.choice(PLACES)
+                profiles.append(ApplicantProfile(
+                    user=user,
+                    first_name='Bench',
+                    last_name=str(user.pk),
+                    title=rng.choice(TITLES),
+                    contact_number='09171234567',
+                    location_city=city,
+                    location_country=country,
+                    education_level=rng.choice(education),
+                    experience=rng.choice(experience),
+                ))
+                resumes.append(Resume(
+                    user=user, name=f'Resume {user.pk}', file=f'resumes/bench/{user.pk}.pdf',
+                    is_default=True, extraction_status=Resume.EXTRACTION_UNSUPPORTED,
+                ))
+            ApplicantProfile.objects.bulk_create(profiles)
+            resumes = Resume.objects.bulk_create(resumes)
+            JobApplication.objects.bulk_create([
+                JobApplication(
+                    applicant=resume.user,
+                    job=job,
+                    resume=resume,
+                    stage=rng.choice(stages),
+                    status=rng.choice(statuses),
+                    match_score=rng.randint(0, 100),
+                    applicant_notes='Generated for the export benchmark.',
+                )
+                for resume in resumes
+            ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(f'Seeded {total} applications in {time.perf_counter() - start:.1f}s')
+        return job
+
+    def run(self, job, chunk_size):
+        applications = JobApplication.objects.filter(job=job)
+        education = ApplicantProfile.EDUCATION_LEVEL_CHOICES[2][0]
+        cases = [
+            ('csv', 'all', applications.order_by('-application_date')),
+            ('xlsx', 'all', applications.order_by('-application_date')),
+            ('csv', education, applications.filter(
+                applicant__applicant_profile_rel__education_level=education
+            ).order_by('applicant__first_name', 'applicant__last_name')),
+        ]
+
+        for export_format, label, queryset in cases:
+            writer = EXPORT_FORMATS[export_format][0]
+
+            with CaptureQueriesContext(connection) as queries:
+                rows, size, elapsed = self.consume(writer, queryset, chunk_size)
+            self.stdout.write(
+                f'{export_format:<4} {label:<9} {rows:>7} rows {size / 1024 / 1024:7.1f} MB '
+                f'{elapsed:6.2f}s {rows / elapsed if elapsed else 0:>9,.0f} rows/s ({len(queries)} queries)'
+            )
+
+            tracemalloc.start()
+            self.consume(writer, queryset, chunk_size)
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.stdout.write(f'{"":<14} peak Python memory {peak / 1024 / 1024:.1f} MB')
+
+        self.stdout.write(self.style.SUCCESS('Export benchmark finished.'))
+
+    def consume(self, writer, queryset, chunk_size):
+        """Read an export to the end like a streaming response. Returns (rows, bytes, seconds)."""
+        count = 0
+
+        def counting(source):
+            nonlocal count
+            for row in source:
+                count += 1
+                yield row
+
+        size = 0
+        start = time.perf_counter()
+        for chunk in writer(EXPORT_HEADER, counting(application_rows(queryset, chunk_size=chunk_size))):
+            size += len(chunk)
+        return count, size, time.perf_counter() - start
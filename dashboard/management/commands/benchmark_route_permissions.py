@@ -0,0 +1,144 @@
+"""
+Measure the per-request cost of RoleBasedAccessMiddleware's route check.
+
+    python manage.py benchmark_route_permissions
+    python manage.py benchmark_route_permissions --rounds 20000
+
+Every named route of the project is resolved once, then for each user type
+the benchmark times:
+- the prefix loops the middleware used to run on every request
+  (startswith/endswith over tuples of paths, kept below for comparison),
+- the compiled table lookup it runs now (utils/permissions.py),
+and reports where the two disagree, which should only be the routes the old
+prefixes missed.
+"""
+import re
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import Resolver404, resolve
+
+from utils.permissions import ROLE_DENIED_MESSAGES, has_role, iter_routes, route_roles
+
+
+# The prefix rules RoleBasedAccessMiddleware checked before the route table
+_LEGACY_ADMIN_PREFIXES = ('/dashboard/admin/',)
+_LEGACY_APPLICANT_PREFIXES = (
+    '/dashboard/applicant/settings', '/dashboard/applicant/job-alerts', '/dashboard/applicant/search-jobs',
+    '/dashboard/applicant/favorite-jobs', '/dashboard/applicant/applied-jobs', '/applicant/setup/',
+)
+_LEGACY_APPLICANT_JOB_ACTIONS = ('/favorite/', '/apply/')
+_LEGACY_APPLICANT_JOB_PATHS = ('/jobs/favorites/',)
+_LEGACY_EMPLOYER_PREFIXES = (
+    '/dashboard/employer/settings', '/dashboard/employer/post-job', '/dashboard/employer/edit-job',
+    '/dashboard/employer/my-jobs', '/dashboard/employer/job-applications', '/dashboard/employer/move-application',
+    '/dashboard/employer/candidate-detail', '/dashboard/employer/hire-candidate',
+    '/dashboard/employer/toggle-save-candidate', '/dashboard/employer/saved-candidates',
+    '/dashboard/employer/candidates', '/employer/setup/',
+)
+_LEGACY_EMPLOYER_JOB_ACTIONS = ('/delete/', '/mark-expired/')
+_LEGACY_EMPLOYER_OWN_PROFILE = '/dashboard/employer/profile/'
+
+
+def legacy_denied(path, user):
+    """Whether the old prefix loops turned `user` away from `path`."""
+    user_type = user.user_type
+    for pref in _LEGACY_ADMIN_PREFIXES:
+        if path.startswith(pref) and not (user.is_staff or user_type == 'admin'):
+            return True
+    for pref in _LEGACY_APPLICANT_PREFIXES:
+        if path.startswith(pref) and user_type != 'applicant':
+            return True
+    if path.startswith('/jobs/'):
+        for action in _LEGACY_APPLICANT_JOB_ACTIONS:
+            if path.endswith(action) and user_type != 'applicant':
+                return True
+        for job_path in _LEGACY_APPLICANT_JOB_PATHS:
+            if path.startswith(job_path) and user_type != 'applicant':
+                return True
+        for action in _LEGACY_EMPLOYER_JOB_ACTIONS:
+            if path.endswith(action) and user_type != 'employer':
+                return True
+    for pref in _LEGACY_EMPLOYER_PREFIXES:
+        if path.startswith(pref) and user_type != 'employer':
+            return True
+    return path == _LEGACY_EMPLOYER_OWN_PROFILE and user_type != 'employer'
+
+
+def table_denied(view_name, user):
+    """Whether the compiled route table turns `user` away from `view_name`."""
+    role = route_roles().get(view_name)
+    return role in ROLE_DENIED_MESSAGES and not has_role(user, role)
+
+
+def sample_path(route):
+    """A concrete path for a route pattern, with 1 for every converter."""
+    return '/' + re.sub(r'<(?:\w+:)?\w+>', '1', route)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the route permission lookup of RoleBasedAccessMiddleware against the old prefix loops.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=5000, help='Passes over every route per user type.')
+
+    def handle(self, *args, **options):
+        routes = []
+        for view_name, route, _callback in iter_routes():
+            if '^' in route or '(?P' in route:
+                continue  # regex routes (Django admin) are not checked by the middleware
+            path = sample_path(route)
+            try:
+                match = resolve(path)
+            except Resolver404:
+                continue
+            routes.append((path, match.view_name))
+        if not routes:
+            raise CommandError('No routes to benchmark.')
+
+        users = {
+            'applicant': SimpleNamespace(user_type='applicant', is_staff=False),
+            'employer': SimpleNamespace(user_type='employer', is_staff=False),
+            'admin': SimpleNamespace(user_type='admin', is_staff=True),
+        }
+        route_roles.cache_clear()
+        start = time.perf_counter()
+        table = route_roles()
+        self.stdout.write(
+            f'Compiled {len(table)} route requirements from {len(routes)} routes '
+            f'in {(time.perf_counter() - start) * 1000:.1f} ms'
+        )
+
+        rounds = options['rounds']
+        checks = len(routes) * rounds
+        for label, user in users.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for path, _view_name in routes:
+                    legacy_denied(path, user)
+            legacy = (time.perf_counter() - start) / checks
+
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for _path, view_name in routes:
+                    table_denied(view_name, user)
+            compiled = (time.perf_counter() - start) / checks
+
+            self.stdout.write(
+                f'{label:<10} prefix loops {legacy * 1e9:6.0f} ns  table lookup {compiled * 1e9:6.0f} ns  '
+                f'({legacy / compiled:.1f}x)'
+            )
+
+        self.stdout.write('Routes where the table and the old prefixes differ:')
+        differences = 0
+        for path, view_name in routes:
+            for label, user in users.items():
+                old, new = legacy_denied(path, user), table_denied(view_name, user)
+                if old != new:
+                    differences += 1
+                    verdict = 'now denied' if new else 'now allowed'
+                    self.stdout.write(f'  {label:<10} {verdict:<11} {view_name} ({path})')
+        if not differences:
+            self.stdout.write('  none')
+        self.stdout.write(self.style.SUCCESS('Route permission benchmark finished.'))
@@ -0,0 +1,47 @@
+"""
+Build the static bundles and image variants (see utils/assets.py). Run before
+collectstatic, as build.sh does:
+    python manage.py build_assets
+    python manage.py collectstatic --no-input
+Only one step:
+    python manage.py build_assets --skip-images
+"""
+import shutil
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.assets import available_image_formats, build_bundles, build_dir, build_image_variants
+
+
+class Command(BaseCommand):
+    help = 'Concatenate and minify the static bundles and write WebP/AVIF copies of static images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-bundles', action='store_true', help='Do not build the CSS/JS bundles.')
+        parser.add_argument('--skip-images', action='store_true', help='Do not convert static images.')
+
+    def handle(self, *args, **options):
+        # Start clean so bundles or images removed from the settings do not linger
+        shutil.rmtree(build_dir(), ignore_errors=True)
+
+        if not options['skip_bundles']:
+            try:
+                bundles = build_bundles()
+            except ImproperlyConfigured as exc:
+                raise CommandError(str(exc))
+            for path, source_bytes, bundle_bytes in bundles:
+                self.stdout.write(f'{path:<36} {source_bytes:>8,} -> {bundle_bytes:>8,} bytes')
+
+        if not options['skip_images']:
+            missing = sorted(set(('avif', 'webp')) - set(available_image_formats()))
+            if missing:
+                self.stderr.write(f"This Pillow build cannot write {', '.join(missing)}; skipping those copies.")
+            for path, fmt, original_bytes, variant_bytes in build_image_variants():
+                if variant_bytes is None:
+                    self.stdout.write(f'{path:<36} {fmt:<5} not smaller than the original, skipped')
+                else:
+                    self.stdout.write(f'{path:<36} {fmt:<5} {original_bytes:>8,} -> {variant_bytes:>8,} bytes')
+
+        self.stdout.write(self.style.SUCCESS(f'Static assets built in {settings.STATIC_BUILD_DIR}.'))
@@ -0,0 +1,60 @@
+"""
+Roll up the platform's daily activity into DailyPlatformStats for the admin
+dashboard (see dashboard/stats.py).
+
+Each run picks up from the last day it stored, so it can run as often as the
+dashboard should be refreshed, e.g. hourly from cron:
+    15 * * * *  cd /app && python manage.py rollup_stats
+Recompute older days, e.g. after deleting data, or everything from scratch:
+    python manage.py rollup_stats --since 2025-01-01
+    python manage.py rollup_stats --rebuild
+"""
+import argparse
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from dashboard.models import DailyPlatformStats
+from dashboard.stats import first_activity_date, rollup_stats
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid date "{value}", expected YYYY-MM-DD')
+
+
+class Command(BaseCommand):
+    help = 'Aggregate daily platform stats for the admin dashboard, starting from the last day rolled up.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=_date, help='Recompute from this day (YYYY-MM-DD).')
+        parser.add_argument('--until', type=_date, help='Stop at this day instead of today (YYYY-MM-DD).')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Delete every stored day and recompute from the first signup.')
+
+    def handle(self, *args, **options):
+        if options['rebuild'] and options['since']:
+            raise CommandError('Use either --since or --rebuild.')
+
+        start = time.perf_counter()
+        with transaction.atomic():
+            since = options['since']
+            if options['rebuild']:
+                DailyPlatformStats.objects.all().delete()
+                since = first_activity_date()
+                if since is None:
+                    self.stdout.write('Nothing to roll up yet.')
+                    return
+            rows = rollup_stats(start=since, end=options['until'])
+
+        if not rows:
+            self.stdout.write('Already up to date.')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Rolled up {len(rows)} day(s) from {rows[0].date} to {rows[-1].date} '
+            f'in {time.perf_counter() - start:.2f}s.'
+        ))
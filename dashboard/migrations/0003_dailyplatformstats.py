@@ -0,0 +1,40 @@
+# Generated by Django 4.2.25 on 2026-10-19 01:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_conversation_message'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('applicant_signups', models.PositiveIntegerField(default=0)),
+                ('employer_signups', models.PositiveIntegerField(default=0)),
+                ('employers_verified', models.PositiveIntegerField(default=0)),
+                ('employers_rejected', models.PositiveIntegerField(default=0)),
+                ('jobs_posted', models.PositiveIntegerField(default=0)),
+                ('jobs_expired', models.PositiveIntegerField(default=0, help_text='Jobs whose deadline was the day before')),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('applications_by_status', models.JSONField(blank=True, default=dict, help_text="The day's applications counted by their status when the day was rolled up")),
+                ('hires', models.PositiveIntegerField(default=0)),
+                ('messages_sent', models.PositiveIntegerField(default=0)),
+                ('total_applicants', models.PositiveIntegerField(default=0)),
+                ('total_employers', models.PositiveIntegerField(default=0)),
+                ('total_verified_employers', models.PositiveIntegerField(default=0)),
+                ('active_jobs', models.PositiveIntegerField(default=0, help_text='Jobs open for applications at the end of the day')),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name_plural': 'daily platform stats',
+                'ordering': ['date'],
+            },
+        ),
+    ]
@@ -66,4 +66,42 @@ class Message(models.Model):
         ordering = ['created_at']
 
     def __str__(self):
-        return f"Msg {self.pk} in Conv {self.conversation_id} by {self.sender_id}"
\ No newline at end of file
+        return f"Msg {self.pk} in Conv {self.conversation_id} by {self.sender_id}"
+
+class DailyPlatformStats(models.Model):
+    """
+    One row per day of platform activity, written by `manage.py rollup_stats`
+    (see dashboard/stats.py) so the admin dashboard and its charts never count
+    the live tables. The `total_*` and `active_jobs` fields are end-of-day
+    totals, the rest are what happened during the day.
+    """
+    date = models.DateField(unique=True)
+
+    applicant_signups = models.PositiveIntegerField(default=0)
+    employer_signups = models.PositiveIntegerField(default=0)
+    employers_verified = models.PositiveIntegerField(default=0)
+    employers_rejected = models.PositiveIntegerField(default=0)
+    jobs_posted = models.PositiveIntegerField(default=0)
+    jobs_expired = models.PositiveIntegerField(default=0, help_text="Jobs whose deadline was the day before")
+    applications = models.PositiveIntegerField(default=0)
+    applications_by_status = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="The day's applications counted by their status when the day was rolled up"
+    )
+    hires = models.PositiveIntegerField(default=0)
+    messages_sent = models.PositiveIntegerField(default=0)
+
+    total_applicants = models.PositiveIntegerField(default=0)
+    total_employers = models.PositiveIntegerField(default=0)
+    total_verified_employers = models.PositiveIntegerField(default=0)
+    active_jobs = models.PositiveIntegerField(default=0, help_text="Jobs open for applications at the end of the day")
+
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['date']
+        verbose_name_plural = 'daily platform stats'
+
+    def __str__(self):
+        return f"Platform stats for {self.date}"
@@ -0,0 +1,212 @@
+"""
+Daily rollups of platform activity for the admin dashboard.
+
+`manage.py rollup_stats` (run from cron) calls rollup_stats(), which counts
+signups, verifications, jobs, applications, hires and messages per day with
+one grouped query per metric and upserts a DailyPlatformStats row for each
+day. Each run starts again from the last stored day, which may have been
+rolled up before it was over, so only the days since the previous run are
+read from the live tables.
+
+Days are calendar days in TIME_ZONE. Counts follow the rows as they are when
+the day is rolled up: an application's status, or a user who is deleted
+afterwards, is not revisited unless the day is rolled up again (--since).
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, Min
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+
+# Counters written for each day, with the labels used by the dashboard charts
+DAILY_FIELDS = {
+    'applicant_signups': 'Applicant signups',
+    'employer_signups': 'Employer signups',
+    'employers_verified': 'Employers verified',
+    'employers_rejected': 'Employers rejected',
+    'jobs_posted': 'Jobs posted',
+    'jobs_expired': 'Jobs expired',
+    'applications': 'Applications',
+    'hires': 'Hires',
+    'messages_sent': 'Messages sent',
+    'total_applicants': 'Applicants',
+    'total_employers': 'Employers',
+    'total_verified_employers': 'Verified employers',
+    'active_jobs': 'Active jobs',
+}
+
+# Jobs in these states are not counted as active whatever their deadline
+INACTIVE_JOB_STATUSES = ('closed', 'draft')
+
+# Longest range the dashboard charts may ask for
+MAX_CHART_DAYS = 3 * 366
+
+
+def day_start(day):
+    """Aware datetime at midnight starting `day` in the current time zone."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _in_range(queryset, field, start, end, dates):
+    """Filter `queryset` to `field` between `start` and `end` and annotate its `day`."""
+    if dates:
+        return queryset.filter(**{f'{field}__range': (start, end)}).annotate(day=F(field))
+    # Bounds on the raw datetime column rather than __date, so indexes still apply
+    return queryset.filter(**{
+        f'{field}__gte': day_start(start),
+        f'{field}__lt': day_start(end + timedelta(days=1)),
+    }).annotate(day=TruncDate(field))
+
+
+def count_by_day(queryset, field, start, end, dates=False):
+    """
+    {date: count} of the rows of `queryset` whose `field` falls on each day
+    from `start` to `end`. `field` holds datetimes, or dates if `dates`.
+    """
+    rows = _in_range(queryset, field, start, end, dates).order_by().values('day').annotate(n=Count('pk'))
+    return {row['day']: row['n'] for row in rows}
+
+
+def count_by_day_and(queryset, field, start, end, by):
+    """{date: {value of `by`: count}} for the rows of `queryset`, see count_by_day()."""
+    counts = defaultdict(dict)
+    rows = _in_range(queryset, field, start, end, False).order_by().values('day', by).annotate(n=Count('pk'))
+    for row in rows:
+        counts[row['day']][row[by]] = row['n']
+    return counts
+
+
+def count_before(queryset, field, day, dates=False):
+    """Number of rows of `queryset` whose `field` is before `day`."""
+    return queryset.filter(**{f'{field}__lt': day if dates else day_start(day)}).count()
+
+
+def first_activity_date():
+    """Day of the earliest signup, or None on an empty database."""
+    first = get_user_model().objects.aggregate(first=Min('date_joined'))['first']
+    return timezone.localdate(first) if first else None
+
+
+def next_rollup_date():
+    """Where an incremental run starts: the last stored day, else the first day with activity."""
+    from .models import DailyPlatformStats
+
+    last = DailyPlatformStats.objects.order_by('-date').values_list('date', flat=True).first()
+    return last or first_activity_date()
+
+
+def compute_daily_stats(start, end):
+    """
+    Unsaved DailyPlatformStats for every day from `start` to `end`, computed
+    with a fixed number of queries however long the range is.
+    """
+    from accounts.models import UserVerification
+    from jobs.models import Job, JobApplication
+    from .models import DailyPlatformStats, Message
+
+    User = get_user_model()
+    applicants = User.objects.filter(user_type='applicant')
+    employers = User.objects.filter(user_type='employer')
+    # Verifications recorded before verification_date was kept count from the signup
+    verifications = UserVerification.objects.filter(user__user_type='employer').annotate(
+        decided_at=Coalesce('verification_date', 'user__date_joined')
+    )
+    verified = verifications.filter(status='verified')
+    jobs = Job.objects.exclude(status__in=INACTIVE_JOB_STATUSES)
+    # A job stops being open the day after its deadline
+    expiring = count_by_day(jobs, 'expiration_date', start - timedelta(days=1), end - timedelta(days=1), dates=True)
+
+    daily = {
+        'applicant_signups': count_by_day(applicants, 'date_joined', start, end),
+        'employer_signups': count_by_day(employers, 'date_joined', start, end),
+        'employers_verified': count_by_day(verified, 'decided_at', start, end),
+        'employers_rejected': count_by_day(verifications.filter(status='rejected'), 'decided_at', start, end),
+        'jobs_posted': count_by_day(Job.objects.all(), 'posted_at', start, end),
+        'jobs_expired': {day + timedelta(days=1): n for day, n in expiring.items()},
+        'applications': count_by_day(JobApplication.objects.all(), 'application_date', start, end),
+        'hires': count_by_day(JobApplication.objects.filter(status='hired'), 'hired_date', start, end, dates=True),
+        'messages_sent': count_by_day(Message.objects.all(), 'created_at', start, end),
+    }
+    by_status = count_by_day_and(JobApplication.objects.all(), 'application_date', start, end, 'status')
+    active_posted = count_by_day(jobs, 'posted_at', start, end)
+
+    total_applicants = count_before(applicants, 'date_joined', start)
+    total_employers = count_before(employers, 'date_joined', start)
+    total_verified = count_before(verified, 'decided_at', start)
+    # Open at the end of the day before `start`
+    active_jobs = (count_before(jobs, 'posted_at', start)
+                   - count_before(jobs, 'expiration_date', start - timedelta(days=1), dates=True))
+
+    computed_at = timezone.now()
+    rows = []
+    day = start
+    while day <= end:
+        counts = {field: values.get(day, 0) for field, values in daily.items()}
+        total_applicants += counts['applicant_signups']
+        total_employers += counts['employer_signups']
+        total_verified += counts['employers_verified']
+        active_jobs += active_posted.get(day, 0) - counts['jobs_expired']
+        rows.append(DailyPlatformStats(
+            date=day,
+            applications_by_status=by_status.get(day, {}),
+            total_applicants=total_applicants,
+            total_employers=total_employers,
+            total_verified_employers=total_verified,
+            active_jobs=max(active_jobs, 0),
+            computed_at=computed_at,
+            **counts,
+        ))
+        day += timedelta(days=1)
+    return rows
+
+
+def rollup_stats(start=None, end=None):
+    """
+    Compute and store the rollups from `start` (default: next_rollup_date())
+    through `end` (default: today), replacing rows already stored for those
+    days. Returns the rows written.
+    """
+    from .models import DailyPlatformStats
+
+    end = end or timezone.localdate()
+    start = start or next_rollup_date() or end
+    if start > end:
+        return []
+    rows = compute_daily_stats(start, end)
+    fields = [
+        field.name for field in DailyPlatformStats._meta.concrete_fields
+        if not field.primary_key and field.name != 'date'
+    ]
+    DailyPlatformStats.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['date'], update_fields=fields,
+    )
+    return rows
+
+
+def stats_series(start, end):
+    """
+    Chart data for the stored days from `start` to `end`: {'dates': [...],
+    'series': {field: [...]}, 'labels': {field: label}}. Applications are also
+    split by status as `applications_<status>` series.
+    """
+    from jobs.models import JobApplication
+    from .models import DailyPlatformStats
+
+    statuses = dict(JobApplication.STATUS_CHOICES)
+    labels = dict(DAILY_FIELDS)
+    labels.update({f'applications_{status}': label for status, label in statuses.items()})
+    series = {field: [] for field in labels}
+    dates = []
+    rows = DailyPlatformStats.objects.filter(date__range=(start, end)).order_by('date').values(
+        'date', 'applications_by_status', *DAILY_FIELDS
+    )
+    for row in rows:
+        dates.append(row['date'].isoformat())
+        for field in DAILY_FIELDS:
+            series[field].append(row[field])
+        for status in statuses:
+            series[f'applications_{status}'].append(row['applications_by_status'].get(status, 0))
+    return {'start': start.isoformat(), 'end': end.isoformat(), 'dates': dates, 'series': series, 'labels': labels}
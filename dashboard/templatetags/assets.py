@@ -0,0 +1,47 @@
+"""
+Tags for the build-time asset pipeline (utils/assets.py).
+
+    {% load assets %}
+    {% bundle 'applicant_dashboard' 'css' %}
+    {% bundle 'applicant_dashboard' 'js' %}
+    {% static_picture 'img/Illustration.png' alt='...' %}
+
+{% bundle %} links the minified bundle once `manage.py build_assets` has
+written it and STATIC_BUNDLES_ENABLED is on, and each of its source files
+otherwise. {% static_picture %} offers the AVIF and WebP copies of a static
+image that were built, smallest first, falling back to the original.
+"""
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from utils.assets import built_image_variants, bundle_path, bundle_sources, is_built
+
+
+register = template.Library()
+
+BUNDLE_TAGS = {
+    'css': '<link rel="stylesheet" href="{}">',
+    'js': '<script src="{}"></script>',
+}
+
+
+@register.simple_tag
+def bundle(name, kind):
+    sources = bundle_sources(name, kind)
+    path = bundle_path(name, kind)
+    if getattr(settings, 'STATIC_BUNDLES_ENABLED', False) and is_built(path):
+        sources = [path]
+    return format_html_join('\n', BUNDLE_TAGS[kind], ((static(source),) for source in sources))
+
+
+@register.simple_tag
+def static_picture(path, alt='', **attrs):
+    # Browsers take the first source they support, so the smallest comes first
+    sources = format_html_join(
+        '', '<source type="image/{}" srcset="{}">',
+        ((fmt, static(variant)) for fmt, variant in built_image_variants(path)),
+    )
+    attributes = format_html_join('', ' {}="{}"', attrs.items())
+    return format_html('<picture>{}<img src="{}" alt="{}"{}></picture>', sources, static(path), alt, attributes)
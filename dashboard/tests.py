@@ -1,3 +1,144 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job, JobApplication
+from resumes.models import Resume
+from utils.exports import stream_zip
+from utils.permissions import check_route_permissions, iter_routes, route_roles
+
+from .exports import RESUME_ARCHIVE_FIELDS, resume_archive_files, resume_archive_name
+
+
+class RoutePermissionTests(SimpleTestCase):
+    """Every dashboard route has a role requirement (utils/permissions.py)."""
+
+    def test_route_permission_check_passes(self):
+        self.assertEqual(check_route_permissions(), [])
+
+    def test_every_dashboard_route_is_covered(self):
+        roles = route_roles()
+        uncovered = [
+            view_name for view_name, _route, _callback in iter_routes()
+            if view_name.startswith('dashboard:') and view_name not in roles
+        ]
+        self.assertEqual(uncovered, [])
+
+
+class ResumeArchiveTests(TestCase):
+    """The employer's resume ZIP (dashboard/exports.py) against a local FileSystemStorage."""
+
+    MAX_BYTES = 4096
+
+    @classmethod
+    def setUpClass(cls):
+        # Before super(), which runs setUpTestData()
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        storage = override_settings(
+            MEDIA_ROOT=cls.media_root,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+        )
+        storage.enable()
+        cls.addClassCleanup(storage.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        employer = User.objects.create(
+            username='archive-employer', email='archive-employer@example.com', user_type='employer',
+        )
+        cls.job = Job.objects.create(
+            employer=employer, title='Resume Archive', location='Cebu City',
+            description='A job whose applications are downloaded as one ZIP of resumes.',
+            expiration_date=timezone.localdate() + timedelta(days=30),
+        )
+        applicants = User.objects.bulk_create([
+            User(
+                username=f'archive-{i}', email=f'archive-{i}@example.com',
+                first_name='Maria', last_name=f'Santos {i}', user_type='applicant',
+            )
+            for i in range(6)
+        ])
+        # Two resumes over the size cap and one that was never written to storage
+        sizes = [1024, 2048, cls.MAX_BYTES, cls.MAX_BYTES + 1, 3 * cls.MAX_BYTES, None]
+        cls.contents = {}
+        resumes = []
+        for i, (user, size) in enumerate(zip(applicants, sizes)):
+            name = f'resumes/archive/{user.pk}.pdf'
+            if size is not None:
+                body = b'%PDF-1.4\n' + bytes(j % 251 for j in range(size - 9))
+                name = default_storage.save(name, ContentFile(body))
+                cls.contents[name] = body
+            resumes.append(Resume(
+                user=user, name=f'Software Engineer CV {i}', file=name,
+                extraction_status=Resume.EXTRACTION_UNSUPPORTED,
+            ))
+        resumes = Resume.objects.bulk_create(resumes)
+        JobApplication.objects.bulk_create([
+            JobApplication(applicant=resume.user, job=cls.job, resume=resume) for resume in resumes
+        ])
+
+    def download(self):
+        applications = JobApplication.objects.filter(job=self.job).order_by('id')
+        output = io.BytesIO()
+        for chunk in stream_zip(resume_archive_files(applications, max_bytes=self.MAX_BYTES, workers=4)):
+            output.write(chunk)
+        return zipfile.ZipFile(output)
+
+    def expected(self):
+        """({archive name: bytes} of the files that fit, archive names of the ones skipped)."""
+        applications = JobApplication.objects.filter(job=self.job).order_by('id')
+        included, skipped = {}, []
+        for row in applications.values(*RESUME_ARCHIVE_FIELDS):
+            body = self.contents.get(row['resume__file'])
+            if body is not None and len(body) <= self.MAX_BYTES:
+                included[resume_archive_name(row)] = body
+            else:
+                skipped.append(resume_archive_name(row))
+        return included, skipped
+
+    def test_members_match_storage(self):
+        archive = self.download()
+        included, _skipped = self.expected()
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(len(included), 3)
+        self.assertEqual(set(archive.namelist()) - {'SKIPPED.txt'}, set(included))
+        for name, body in included.items():
+            self.assertEqual(archive.read(name), body, name)
+
+    def test_member_names(self):
+        archive = self.download()
+        included, skipped = self.expected()
+        application_ids = sorted(JobApplication.objects.filter(job=self.job).values_list('id', flat=True))
+        self.assertEqual(
+            sorted(list(included) + skipped),
+            [f'{application_id:07d}_maria-santos-{i}_software-engineer-cv-{i}.pdf'
+             for i, application_id in enumerate(application_ids)],
+        )
+        self.assertEqual(sorted(archive.namelist()), sorted(list(included) + ['SKIPPED.txt']))
+        self.assertEqual(sorted(self.download().namelist()), sorted(archive.namelist()))
+
+    def test_oversized_and_missing_files_are_listed_in_skipped_txt(self):
+        archive = self.download()
+        included, skipped = self.expected()
+        self.assertEqual(len(skipped), 3)
+        skipped_text = archive.read('SKIPPED.txt').decode()
+        lines = skipped_text.splitlines()
+        self.assertEqual(len(lines), 3)
+        for name in skipped:
+            self.assertTrue(any(line.startswith(f'{name}: ') for line in lines), name)
+        for name in included:
+            self.assertNotIn(name, skipped_text)
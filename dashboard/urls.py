@@ -35,19 +35,25 @@ urlpatterns = [
     path('employer/post-job/', views.EmployerPostJobView.as_view(), name='employer_post_job'),
     path('employer/edit-job/<int:job_id>/', views.EmployerEditJobView.as_view(), name='employer_edit_job'),
     path('employer/my-jobs/', views.EmployerJobListView.as_view(), name='employer_my_jobs'),
+    path('employer/hiring-funnel/', views.EmployerHiringFunnelView.as_view(), name='employer_hiring_funnel'),
     path('employer/job-applications/<int:job_id>/', views.EmployerJobApplicationsView.as_view(), name='employer_job_applications'),
+    path('employer/job-applications/<int:job_id>/export/', views.EmployerJobApplicationsExportView.as_view(), name='employer_job_applications_export'),
+    path('employer/job-applications/<int:job_id>/resumes/', views.EmployerJobResumesDownloadView.as_view(), name='employer_job_resumes_download'),
     path('employer/move-application/<int:application_id>/', views.MoveApplicationStageView.as_view(), name='move_application_stage'),
     path('employer/candidate-detail/<int:application_id>/', views.EmployerCandidateDetailView.as_view(), name='employer_candidate_detail'),
     path('employer/hire-candidate/<int:application_id>/', views.HireCandidateView.as_view(), name='hire_candidate'),
     path('employer/toggle-save-candidate/<int:application_id>/', views.ToggleSaveCandidateView.as_view(), name='toggle_save_candidate'),
     path('employer/saved-candidates/', views.EmployerSavedCandidatesView.as_view(), name='employer_saved_candidates'),
+    path('employer/candidates/', views.EmployerCandidateSearchView.as_view(), name='employer_candidate_search'),
 
     # Admin URLs
     path('admin/dashboards', views.admin_dashboards, name='admin_dashboards'),
+    path('admin/platform-stats/', views.admin_platform_stats, name='admin_platform_stats'),
     path('admin/total-employers-verified', views.admin_total_employers_verified, name='admin_total_employers_verified'),
     path('admin/accept-reject-employer', views.admin_accept_reject_employer, name='admin_accept_reject_employer'),
     path('admin/approve-employer/<int:employer_id>/', views.approve_employer, name='approve_employer'),
     path('admin/reject-employer/<int:employer_id>/', views.reject_employer, name='reject_employer'),
+    path('admin/bulk-verify-employers/', views.admin_bulk_verify_employers, name='admin_bulk_verify_employers'),
     path('admin/applicants', views.admin_applicants, name='admin_applicants'),
     path('admin/applicants/<int:applicant_id>/', views.admin_applicant_detail, name='admin_applicant_detail'),
     path('admin/job-postings', views.admin_job_postings, name='admin_job_postings'),
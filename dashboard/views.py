@@ -1,18 +1,20 @@
 # dashboards/views.py
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
-from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm
 from django.utils import timezone
 from django.views.generic import ListView, TemplateView, FormView, UpdateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Q, Count
+from django.db.models import Q, Count, F
 from django.core.paginator import Paginator
-from django.http import JsonResponse, HttpResponseForbidden
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, JsonResponse, HttpResponseForbidden
 from django.contrib.auth import get_user_model
 from django.template.loader import select_template
+from django.views.decorators.http import require_POST
 
 from notifications.utils import (
     notify_application_status_change,
@@ -22,7 +24,9 @@ from notifications.utils import (
 from accounts.models import User, UserSocialLink, UserVerification
 from applicant_profile.models import ApplicantProfile
 from jobs.models import Job, JobApplication
-from utils.mixins import EmployerRequiredMixin, ApplicantRequiredMixin
+from utils.mixins import EmployerRequiredMixin, ApplicantRequiredMixin, SearchSnapshotMixin, admin_required
+from utils.pagination import CappedCountPaginator, KeysetPaginator
+from utils.sessions import session_readonly
 
 from .forms import (
     ApplicantPersonalInfoForm,
@@ -41,7 +45,8 @@ from .forms import (
 )
 
 # Messaging models
-from .models import Conversation, Message
+from .models import Conversation, DailyPlatformStats, Message
+from .stats import MAX_CHART_DAYS, stats_series
 
 
 # --------------------
@@ -89,6 +94,35 @@ def display_name_for(user):
         return getattr(user, 'email', 'Unknown')
 
 
+def own_profile_or_404(user):
+    """The signed-in user's applicant or employer profile, loaded with request.user."""
+    try:
+        profile = user.profile
+    except ObjectDoesNotExist:
+        profile = None
+    if profile is None:
+        raise Http404('No profile found for this account.')
+    return profile
+
+
+def notification_preferences_for(user):
+    """The user's notification preferences, loaded with request.user or created with the defaults."""
+    from applicant_profile.models import NotificationPreferences
+
+    try:
+        return user.notification_preferences
+    except ObjectDoesNotExist:
+        preferences, _ = NotificationPreferences.objects.get_or_create(
+            user=user,
+            defaults={
+                'notify_shortlisted': True,
+                'notify_applications': True,
+                'notify_job_alerts': True
+            }
+        )
+        return preferences
+
+
 # --------------------
 # Dashboard views
 # --------------------
@@ -111,8 +145,9 @@ class DashboardView(LoginRequiredMixin, View):
             return render(request, 'home.html')
 
     def _render_applicant_dashboard(self, request):
-        """Render applicant dashboard with stats"""
+        """Render applicant dashboard with stats and recommended jobs"""
         from jobs.models import JobApplication, FavoriteJob, JobAlert
+        from jobs.recommendations import get_recommended_jobs
 
         user = request.user
         applied_count = JobApplication.objects.filter(applicant=user).count()
@@ -125,11 +160,15 @@ class DashboardView(LoginRequiredMixin, View):
         except Exception:
             profile = None
 
+        # Precomputed by `manage.py build_recommendations`; one indexed query
+        recommended_jobs = [rec.job for rec in get_recommended_jobs(user)]
+
         context = {
             'applied_count': applied_count,
             'favorite_count': favorite_count,
             'alerts_count': alerts_count,
             'profile': profile,
+            'recommended_jobs': recommended_jobs,
         }
         return render(request, 'dashboard/applicant/applicant_overview.html', context)
 
@@ -160,20 +199,22 @@ class DashboardView(LoginRequiredMixin, View):
 
 
 # -----APPLICANT VIEWS-----#
-class ApplicantJobSearchView(ApplicantRequiredMixin, ListView):
+class ApplicantJobSearchView(ApplicantRequiredMixin, SearchSnapshotMixin, ListView):
     """
     Search jobs for applicants with filters using Django form validation.
     Matches the logic of the original applicant_search_jobs function-based view.
+    Results are paginated from a cached ID snapshot (see SearchSnapshotMixin).
     """
     model = Job
     template_name = 'dashboard/applicant/applicant_search_jobs.html'
     context_object_name = 'jobs'
     paginate_by = 10
+    snapshot_prefix = 'applicant_job_search'
 
     def get_queryset(self):
         from jobs.models import JobCategory, EducationLevel, ExperienceLevel, JobLevel
         from dashboard.forms import JobSearchForm
-        from django.db.models import Q, Count
+        from django.db.models import Q
 
         # Get filter options from lookup tables (only active items)
         all_categories = JobCategory.objects.filter(is_active=True)
@@ -196,16 +237,9 @@ class ApplicantJobSearchView(ApplicantRequiredMixin, ListView):
             job_level_choices=job_level_choices
         )
 
-        # Start with active jobs only with optimized queries
-        jobs = Job.objects.filter(status='active').select_related(
-            'employer',
-            'category',
-            'job_type',
-            'education',
-            'experience',
-            'job_level',
-            'salary_type'
-        ).annotate(applications_count=Count('applications'))
+        # Start with active jobs only; joins and annotations are applied per page
+        # in get_hydration_queryset(), which re-checks the status
+        jobs = Job.objects.filter(status='active')
 
         # Apply filters only if form is valid
         if self.form.is_valid():
@@ -220,7 +254,7 @@ class ApplicantJobSearchView(ApplicantRequiredMixin, ListView):
                     Q(description__icontains=query) |
                     Q(company_name__icontains=query) |
                     Q(tags__icontains=query)
-                ).distinct()
+                )
 
             # Category filter (single-select)
             category_val = cleaned_data.get('category')
@@ -242,18 +276,30 @@ class ApplicantJobSearchView(ApplicantRequiredMixin, ListView):
             if job_level_val:
                 jobs = jobs.filter(job_level_id=job_level_val)
 
-            # Salary filter
-            salary_min = cleaned_data.get('salary_min')
-            if salary_min:
-                jobs = jobs.filter(min_salary__gte=salary_min)
-
-            salary_max = cleaned_data.get('salary_max')
-            if salary_max:
-                jobs = jobs.filter(max_salary__lte=salary_max)
+            # Salary filter (yearly amounts)
+            jobs = jobs.filter_by_salary_range(
+                cleaned_data.get('salary_min'),
+                cleaned_data.get('salary_max'),
+            )
 
         # Order by most recent
         return jobs.order_by('-posted_at')
 
+    def get_hydration_queryset(self):
+        from django.db.models import Count
+
+        # Jobs closed or expired since the snapshot was taken drop out of the page
+        return Job.objects.filter(status='active').select_related(
+            'employer',
+            'employer__employer_profile_rel',
+            'category',
+            'job_type',
+            'education',
+            'experience',
+            'job_level',
+            'salary_type'
+        ).annotate(applications_count=Count('applications'))
+
     def get_context_data(self, **kwargs):
         from jobs.models import JobCategory, EducationLevel, ExperienceLevel, JobLevel, FavoriteJob
 
@@ -286,6 +332,7 @@ class ApplicantFavoriteJobsView(ApplicantRequiredMixin, ListView):
     template_name = 'dashboard/applicant/applicant_favorite_jobs.html'
     context_object_name = 'favorites'
     paginate_by = 10
+    paginator_class = CappedCountPaginator
 
     def get_queryset(self):
         from jobs.models import FavoriteJob
@@ -306,19 +353,15 @@ class ApplicantFavoriteJobsView(ApplicantRequiredMixin, ListView):
         return favorites_qs
 
     def get_context_data(self, **kwargs):
-        from jobs.models import FavoriteJob
-
         context = super().get_context_data(**kwargs)
 
-        # Single count to avoid repeated DB hits in template
-        favorites_qs = self.get_queryset()
-        context['favorite_count'] = favorites_qs.count()
+        # Reuse the paginator's (capped) count instead of counting again
+        context['favorite_count'] = context['paginator'].count
 
-        # Job ID lists (keeps compatibility with existing templates/JS)
-        context['favorited_job_ids'] = list(favorites_qs.values_list('job_id', flat=True))
-        context['favorited_job_ids_page'] = list(
-            context['page_obj'].object_list.values_list('job_id', flat=True)
-        )
+        # Every job on this page is a favorite, so the page's IDs are all templates/JS need
+        page_job_ids = [favorite.job_id for favorite in context['page_obj'].object_list]
+        context['favorited_job_ids'] = page_job_ids
+        context['favorited_job_ids_page'] = page_job_ids
 
         return context
 
@@ -332,6 +375,7 @@ class ApplicantAppliedJobsListView(ApplicantRequiredMixin, ListView):
     template_name = 'dashboard/applicant/applicant_applied_jobs.html'
     context_object_name = 'applied_jobs'
     paginate_by = 10
+    paginator_class = CappedCountPaginator
 
     def get_queryset(self):
         return JobApplication.objects.filter(
@@ -349,7 +393,9 @@ class ApplicantAppliedJobsListView(ApplicantRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['application_count'] = self.get_queryset().count()
+        paginator = context['paginator']
+        context['application_count'] = paginator.count
+        context['application_count_display'] = paginator.display_count
         return context
 
 
@@ -423,10 +469,10 @@ class ApplicantJobAlertsView(ApplicantRequiredMixin, TemplateView):
                     jobs_qs = jobs_qs.filter(job_type=alert.job_type)
                 if getattr(alert, 'job_category', None):
                     jobs_qs = jobs_qs.filter(category=alert.job_category)
-                if getattr(alert, 'min_salary', None):
-                    jobs_qs = jobs_qs.filter(min_salary__gte=alert.min_salary)
-                if getattr(alert, 'max_salary', None):
-                    jobs_qs = jobs_qs.filter(max_salary__lte=alert.max_salary)
+                jobs_qs = jobs_qs.filter_by_salary_range(
+                    getattr(alert, 'min_salary', None),
+                    getattr(alert, 'max_salary', None),
+                )
                 if getattr(alert, 'keywords', None):
                     for kw in [k.strip() for k in alert.keywords.split(',') if k.strip()]:
                         jobs_qs = jobs_qs.filter(
@@ -696,21 +742,11 @@ class ApplicantSettingsView(ApplicantRequiredMixin, TemplateView):
     template_name = 'dashboard/applicant/applicant_settings.html'
 
     def get_context_data(self, **kwargs):
-        from applicant_profile.models import NotificationPreferences
         from resumes.models import Resume
 
         context = super().get_context_data(**kwargs)
-        profile = get_object_or_404(ApplicantProfile, user=self.request.user)
-
-        # Get or create notification preferences
-        notification_prefs, created = NotificationPreferences.objects.get_or_create(
-            user=self.request.user,
-            defaults={
-                'notify_shortlisted': True,
-                'notify_applications': True,
-                'notify_job_alerts': True
-            }
-        )
+        profile = own_profile_or_404(self.request.user)
+        notification_prefs = notification_preferences_for(self.request.user)
 
         # Get all resumes for the user
         resumes = Resume.objects.filter(user=self.request.user)
@@ -730,23 +766,15 @@ class ApplicantSettingsView(ApplicantRequiredMixin, TemplateView):
         return context
 
     def post(self, request, *args, **kwargs):
-        from applicant_profile.models import NotificationPreferences
         from django.contrib.auth import authenticate
 
-        profile = get_object_or_404(ApplicantProfile, user=request.user)
-        notification_prefs, _ = NotificationPreferences.objects.get_or_create(
-            user=request.user,
-            defaults={
-                'notify_shortlisted': True,
-                'notify_applications': True,
-                'notify_job_alerts': True
-            }
-        )
+        profile = own_profile_or_404(request.user)
+        notification_prefs = notification_preferences_for(request.user)
 
         form_type = request.POST.get('form_type')
 
         if form_type == 'personal_info':
-            form = ApplicantPersonalInfoForm(request.POST, request.FILES, instance=profile)
+            form = ApplicantPersonalInfoForm(request.POST, request.FILES, instance=profile, upload_user=request.user)
             if form.is_valid():
                 try:
                     form.save()
@@ -879,15 +907,17 @@ class ApplicantSettingsView(ApplicantRequiredMixin, TemplateView):
                         messages.error(request, f'{field_label}: {error}')
 
         elif form_type == 'resume_upload':
+            from resumes.extraction import schedule_extraction
             from resumes.forms import ResumeUploadForm
             from resumes.models import Resume
 
-            form = ResumeUploadForm(request.POST, request.FILES)
+            form = ResumeUploadForm(request.POST, request.FILES, upload_user=request.user)
             if form.is_valid():
                 try:
                     resume = form.save(commit=False)
                     resume.user = request.user
                     resume.save()
+                    schedule_extraction(resume)
                     messages.success(request, f'Resume "{resume.name}" uploaded successfully!')
                     return redirect('dashboard:applicant_settings')
                 except Exception as e:
@@ -1058,8 +1088,8 @@ class EmployerJobApplicationsView(EmployerRequiredMixin, TemplateView):
 
     def post(self, request, *args, **kwargs):
         """Handle stage management POST requests"""
-        from jobs.models import ApplicationStage, JobApplication
-        from django.db import models
+        from jobs.models import ApplicationStage, ApplicationStageTransition, JobApplication
+        from django.db import models, transaction
 
         job = self.get_job()
         form_type = request.POST.get('form_type')
@@ -1101,8 +1131,14 @@ class EmployerJobApplicationsView(EmployerRequiredMixin, TemplateView):
                 if stage.is_system:
                     messages.error(request, 'Cannot delete system-generated columns.')
                 else:
-                    JobApplication.objects.filter(stage=stage).update(stage=None)
-                    stage.delete()
+                    # Log the move out of the deleted column for the hiring funnel
+                    with transaction.atomic():
+                        moved = list(JobApplication.objects.select_for_update().filter(stage=stage))
+                        JobApplication.objects.filter(pk__in=[a.pk for a in moved]).update(stage=None)
+                        ApplicationStageTransition.objects.record_many(
+                            moved, stage, None, moved_by=request.user
+                        )
+                        stage.delete()
                     messages.success(request, 'Column deleted. Applications moved to "All Applications".')
             except ApplicationStage.DoesNotExist:
                 messages.error(request, 'Stage not found.')
@@ -1152,6 +1188,9 @@ class EmployerJobApplicationsView(EmployerRequiredMixin, TemplateView):
                 base_qs = base_qs.order_by('application_date')
             elif sort_val == 'name':
                 base_qs = base_qs.order_by('applicant__first_name', 'applicant__last_name')
+            elif sort_val == 'match':
+                # Uses the (job, -match_score) index; unscored applications go last
+                base_qs = base_qs.order_by(F('match_score').desc(nulls_last=True), '-application_date')
             else:  # 'newest' or default
                 base_qs = base_qs.order_by('-application_date')
         else:
@@ -1159,10 +1198,18 @@ class EmployerJobApplicationsView(EmployerRequiredMixin, TemplateView):
 
         return base_qs
 
+    def get_filter_form(self, education_choices, experience_choices):
+        from dashboard.forms import EmployerApplicationFilterForm
+
+        return EmployerApplicationFilterForm(
+            self.request.GET or None,
+            education_choices=education_choices,
+            experience_choices=experience_choices,
+        )
+
     def get_context_data(self, **kwargs):
         from jobs.models import ApplicationStage
         from django.db.models import Prefetch
-        from dashboard.forms import EmployerApplicationFilterForm
 
         context = super().get_context_data(**kwargs)
         job = self.get_job()
@@ -1171,11 +1218,7 @@ class EmployerJobApplicationsView(EmployerRequiredMixin, TemplateView):
         education_choices, experience_choices = self.get_education_experience_choices()
 
         # Initialize filter form
-        filter_form = EmployerApplicationFilterForm(
-            self.request.GET or None,
-            education_choices=education_choices,
-            experience_choices=experience_choices,
-        )
+        filter_form = self.get_filter_form(education_choices, experience_choices)
 
         # Get filtered applications
         base_qs = self.get_filtered_applications(job, filter_form)
@@ -1209,6 +1252,47 @@ class EmployerJobApplicationsView(EmployerRequiredMixin, TemplateView):
         return context
 
 
+class EmployerJobApplicationsExportView(EmployerJobApplicationsView):
+    """
+    Download a job's applications as CSV or XLSX (?format=csv|xlsx), with the
+    board's education/experience filters and sort order. The file is streamed
+    row by row (see dashboard/exports.py), so large jobs stay cheap to export.
+    """
+    http_method_names = ['get']
+
+    def get(self, request, *args, **kwargs):
+        from django.http import HttpResponseBadRequest
+        from .exports import EXPORT_FORMATS, export_applications_response
+
+        job = self.get_job()
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest('Unsupported export format.')
+
+        education_choices, experience_choices = self.get_education_experience_choices()
+        filter_form = self.get_filter_form(education_choices, experience_choices)
+        applications = self.get_filtered_applications(job, filter_form)
+        return export_applications_response(job, applications, export_format)
+
+
+class EmployerJobResumesDownloadView(EmployerJobApplicationsView):
+    """
+    Download the resumes submitted for a job as one ZIP, limited by the board's
+    education/experience filters. Files are streamed from storage into the
+    response as they arrive (see dashboard/exports.py).
+    """
+    http_method_names = ['get']
+
+    def get(self, request, *args, **kwargs):
+        from .exports import resume_archive_response
+
+        job = self.get_job()
+        education_choices, experience_choices = self.get_education_experience_choices()
+        filter_form = self.get_filter_form(education_choices, experience_choices)
+        applications = self.get_filtered_applications(job, filter_form)
+        return resume_archive_response(job, applications)
+
+
 class EmployerCandidateDetailView(EmployerRequiredMixin, TemplateView):
     """
     Display detailed information about a candidate/applicant for a specific job application.
@@ -1291,7 +1375,8 @@ class HireCandidateView(EmployerRequiredMixin, View):
         return application
 
     def post(self, request, *args, **kwargs):
-        from jobs.models import ApplicationStage
+        from django.db import transaction
+        from jobs.models import ApplicationStage, ApplicationStageTransition
 
         try:
             application = self.get_application()
@@ -1306,11 +1391,18 @@ class HireCandidateView(EmployerRequiredMixin, View):
                 }
             )
 
-            # Update application
+            # Update application and log the move for the hiring funnel
+            previous_stage = application.stage
+            already_hired = application.status == 'hired'
             application.stage = hired_stage
             application.status = 'hired'
             application.hired_date = timezone.now().date()
-            application.save()
+            with transaction.atomic():
+                application.save()
+                if not already_hired:
+                    ApplicationStageTransition.objects.record(
+                        application, previous_stage, hired_stage, moved_by=request.user, hired=True
+                    )
 
             messages.success(
                 request,
@@ -1419,11 +1511,13 @@ class MoveApplicationStageView(EmployerRequiredMixin, View):
         return application
 
     def post(self, request, *args, **kwargs):
+        from django.db import transaction
         from django.http import JsonResponse
-        from jobs.models import ApplicationStage
+        from jobs.models import ApplicationStage, ApplicationStageTransition
 
         try:
             application = self.get_application()
+            previous_stage = application.stage
 
             # Get target stage from POST data
             stage_id = request.POST.get('stage_id')
@@ -1441,7 +1535,12 @@ class MoveApplicationStageView(EmployerRequiredMixin, View):
                 )
                 application.stage = stage
 
-            application.save()
+            # The transition log feeds the hiring funnel (jobs/funnel.py)
+            with transaction.atomic():
+                application.save()
+                ApplicationStageTransition.objects.record(
+                    application, previous_stage, stage, moved_by=request.user
+                )
 
             # Notify applicant about stage change if moved to a significant stage
             if stage and stage.name.lower() in ['shortlisted', 'interview', 'offer']:
@@ -1528,10 +1627,11 @@ class EmployerJobListView(EmployerRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        queryset = self.get_queryset()
+        # The template renders every job anyway, so count the already-fetched list
+        total_jobs = len(self.object_list)
         context['status_filter'] = self.request.GET.get('status', 'all')
-        context['has_jobs'] = queryset.exists()
-        context['total_jobs'] = queryset.count()
+        context['has_jobs'] = total_jobs > 0
+        context['total_jobs'] = total_jobs
         return context
 
 
@@ -1606,6 +1706,77 @@ class EmployerSavedCandidatesView(EmployerRequiredMixin, ListView):
         ).order_by('-saved_at')
 
 
+class EmployerCandidateSearchView(EmployerRequiredMixin, TemplateView):
+    """
+    Talent search over public applicant profiles (title, biography, location and
+    resume text) with education/experience/country facets.
+
+    Results are keyset-paginated: by relevance when there is a text query,
+    otherwise by most recently updated profile. Profile images and social links
+    for a page are loaded with one join and one prefetch, whatever the page size.
+    """
+    template_name = 'dashboard/employer/employer_candidate_search.html'
+    paginate_by = 20
+
+    def get_context_data(self, **kwargs):
+        from applicant_profile.search import get_candidate_facets, search_candidates
+        from utils.pagination import KeysetPaginator
+        from .forms import CandidateSearchForm
+
+        context = super().get_context_data(**kwargs)
+        form = CandidateSearchForm(self.request.GET or None)
+        filters = form.cleaned_data if form.is_valid() else {}
+        query = filters.get('q', '')
+
+        profiles = search_candidates(
+            query,
+            education=filters.get('education', ''),
+            experience=filters.get('experience', ''),
+            country=filters.get('country', ''),
+        ).select_related('user').prefetch_related('user__social_links')
+
+        if query:
+            paginator = KeysetPaginator(profiles, self.paginate_by, sort_field='rank', parse_value=float)
+        else:
+            paginator = KeysetPaginator(profiles, self.paginate_by, sort_field='updated_at')
+        page = paginator.page(self.request.GET.get('cursor'))
+
+        # Query string for the "next page" link, without the current cursor
+        params = self.request.GET.copy()
+        params.pop('cursor', None)
+
+        facets = get_candidate_facets(query)
+        labels = {
+            'education': dict(ApplicantProfile.EDUCATION_LEVEL_CHOICES),
+            'experience': dict(ApplicantProfile._meta.get_field('experience').choices),
+            'country': {},
+        }
+        facet_groups = []
+        for name in ('education', 'experience', 'country'):
+            options = []
+            for value, count in facets[name]:
+                facet_params = params.copy()
+                facet_params[name] = value
+                options.append({
+                    'label': labels[name].get(value, value),
+                    'count': count,
+                    'selected': filters.get(name) == value,
+                    'querystring': facet_params.urlencode(),
+                })
+            facet_groups.append((name, options))
+
+        context.update({
+            'form': form,
+            'query': query,
+            'filters': filters,
+            'candidates': page.object_list,
+            'page': page,
+            'facet_groups': facet_groups,
+            'querystring': params.urlencode(),
+        })
+        return context
+
+
 class EmployerEditJobView(EmployerRequiredMixin, UpdateView):
     """
     Handle job editing (limited to 7 days after posting).
@@ -1690,10 +1861,8 @@ class EmployerSettingsView(EmployerRequiredMixin, TemplateView):
     template_name = 'dashboard/employer/employer_settings.html'
 
     def get_context_data(self, **kwargs):
-        from employer_profile.models import EmployerProfile
-
         context = super().get_context_data(**kwargs)
-        profile = get_object_or_404(EmployerProfile, user=self.request.user)
+        profile = own_profile_or_404(self.request.user)
 
         # Initialize all forms with current data
         context['profile'] = profile
@@ -1708,13 +1877,11 @@ class EmployerSettingsView(EmployerRequiredMixin, TemplateView):
         return context
 
     def post(self, request, *args, **kwargs):
-        from employer_profile.models import EmployerProfile
-
-        profile = get_object_or_404(EmployerProfile, user=request.user)
+        profile = own_profile_or_404(request.user)
         form_type = request.POST.get('form_type')
 
         if form_type == 'company_info':
-            form = EmployerCompanyInfoForm(request.POST, request.FILES, instance=profile)
+            form = EmployerCompanyInfoForm(request.POST, request.FILES, instance=profile, upload_user=request.user)
             if form.is_valid():
                 form.save()
                 messages.success(request, 'Company information updated successfully!')
@@ -1741,7 +1908,7 @@ class EmployerSettingsView(EmployerRequiredMixin, TemplateView):
                 messages.error(request, 'Please correct the errors below.')
 
         elif form_type == 'business_permit':
-            form = EmployerBusinessPermitForm(request.POST, request.FILES, instance=profile)
+            form = EmployerBusinessPermitForm(request.POST, request.FILES, instance=profile, upload_user=request.user)
             if form.is_valid():
                 form.save()
                 messages.success(request, 'Business permit updated successfully!')
@@ -1897,149 +2064,314 @@ class EmployerProfileView(EmployerRequiredMixin, TemplateView):
             applications_count=Count('applications')
         ).order_by('-posted_at')[:3]
 
-        # Calculate statistics (optimized single query for total applications)
-        total_jobs = Job.objects.filter(employer=self.request.user).count()
-        active_jobs = Job.objects.filter(employer=self.request.user, status='active').count()
-
-        # Single query for total applications instead of looping
-        total_applications = JobApplication.objects.filter(job__employer=self.request.user).count()
-        hired_count = JobApplication.objects.filter(job__employer=self.request.user, status='hired').count()
-
         context.update({
             'profile': profile,
             'social_links': social_links,
             'recent_jobs': recent_jobs,
-            'total_jobs': total_jobs,
-            'active_jobs': active_jobs,
-            'total_applications': total_applications,
-            'hired_count': hired_count,
             'is_owner': True,
+            **employer_hiring_totals(self.request.user),
         })
 
         return context
 
 
-# -----ADMIN VIEWS-----#
-@login_required
-def admin_dashboards(request):
-    # Count verified employers (those with verification status = 'verified')
-    total_verified_employers = UserVerification.objects.filter(
-        user__user_type='employer',
-        status='verified'
-    ).count()
-
-    # Count pending/unverified employers (pending or no verification record)
-    total_unverified_employers = User.objects.filter(
-        user_type='employer'
-    ).exclude(
-        verification__status='verified'
-    ).count()
+def employer_hiring_totals(employer):
+    """Lifetime job, view, application and hire totals of an employer in two queries."""
+    from django.db.models import Sum
+
+    job_totals = Job.objects.filter(employer=employer).aggregate(
+        total_jobs=Count('id'),
+        active_jobs=Count('id', filter=Q(status='active')),
+        total_views=Sum('view_count'),
+    )
+    application_totals = JobApplication.objects.filter(job__employer=employer).aggregate(
+        total_applications=Count('id'),
+        hired_count=Count('id', filter=Q(status='hired')),
+    )
+    job_totals['total_views'] = job_totals['total_views'] or 0
+    return {**job_totals, **application_totals}
+
+
+# Jobs per page of the hiring funnel report
+HIRING_FUNNEL_PAGE_SIZE = 20
+
+
+class EmployerHiringFunnelView(EmployerRequiredMixin, TemplateView):
+    """
+    Per-job hiring funnel: views, applications, each pipeline stage and hires,
+    with median time in stage and time to hire. Jobs are keyset-paginated and
+    each funnel comes from its cached summary (jobs/funnel.py), so the page
+    costs the same for an employer with five postings or five thousand.
+    """
+    template_name = 'dashboard/employer/employer_hiring_funnel.html'
+
+    def get_context_data(self, **kwargs):
+        from jobs.funnel import funnel_steps, job_funnels
+
+        context = super().get_context_data(**kwargs)
+        status_filter = self.request.GET.get('status', 'all')
+        jobs = Job.objects.filter(employer=self.request.user)
+        if status_filter in ('active', 'expired', 'closed', 'draft'):
+            jobs = jobs.filter(status=status_filter)
+        else:
+            status_filter = 'all'
+
+        page = KeysetPaginator(jobs, HIRING_FUNNEL_PAGE_SIZE).page(self.request.GET.get('cursor'))
+        funnels = job_funnels(page)
+        rows = [{'job': job, 'steps': funnel_steps(job.view_count, funnels[job.pk])} for job in page]
 
-    total_applicants = User.objects.filter(user_type='applicant').count()
+        params = self.request.GET.copy()
+        params.pop('cursor', None)
+        context.update({
+            'rows': rows,
+            'page': page,
+            'status_filter': status_filter,
+            'querystring': params.urlencode(),
+            **employer_hiring_totals(self.request.user),
+        })
+        return context
 
-    # Optional: count active job postings if needed
-    total_job_postings = Job.objects.filter(status='active').count()
+
+# -----ADMIN VIEWS-----#
+@admin_required
+def admin_dashboards(request):
+    """
+    Platform totals from the latest DailyPlatformStats rollup (see
+    dashboard/stats.py), counted live only until `rollup_stats` has run once.
+    """
+    stats = DailyPlatformStats.objects.order_by('-date').first()
+    if stats is not None:
+        totals = {
+            'total_verified_employers': stats.total_verified_employers,
+            'total_unverified_employers': stats.total_employers - stats.total_verified_employers,
+            'total_applicants': stats.total_applicants,
+            'total_job_postings': stats.active_jobs,
+        }
+    else:
+        totals = {
+            'total_verified_employers': UserVerification.objects.filter(
+                user__user_type='employer', status='verified'
+            ).count(),
+            # Pending or rejected, or no verification record yet
+            'total_unverified_employers': User.objects.filter(
+                user_type='employer'
+            ).exclude(verification__status='verified').count(),
+            'total_applicants': User.objects.filter(user_type='applicant').count(),
+            'total_job_postings': Job.objects.filter(status='active').count(),
+        }
 
     context = {
-        'total_verified_employers': total_verified_employers,
-        'total_unverified_employers': total_unverified_employers,
-        'total_applicants': total_applicants,
-        'total_job_postings': total_job_postings,
+        **totals,
+        'stats': stats,
+        'chart_ranges': ADMIN_CHART_RANGES,
     }
     return render(request, 'dashboard/admin/admin_dashboards.html', context)
 
 
-@login_required
+# Date ranges offered above the dashboard charts, in days
+ADMIN_CHART_RANGES = (30, 90, 365)
+
+
+@admin_required
+def admin_platform_stats(request):
+    """
+    Chart data for the admin dashboard, read from the DailyPlatformStats rows:
+    the last `?days=` days (default 30), or `?start=` to `?end=` (YYYY-MM-DD).
+    """
+    from datetime import date, timedelta
+
+    try:
+        if request.GET.get('start'):
+            start = date.fromisoformat(request.GET['start'])
+            end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else timezone.localdate()
+        else:
+            days = int(request.GET.get('days', ADMIN_CHART_RANGES[0]))
+            end = timezone.localdate()
+            start = end - timedelta(days=days - 1)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date range.'}, status=400)
+    if start > end or (end - start).days >= MAX_CHART_DAYS:
+        return JsonResponse({'error': f'Choose a range of 1 to {MAX_CHART_DAYS} days.'}, status=400)
+
+    response = JsonResponse(stats_series(start, end))
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
+
+
+# Admin listings are keyset-paginated (see utils/pagination.py) and show a
+# capped count, so they stay fast however many users and jobs there are.
+ADMIN_PAGE_SIZE = 25
+
+# sort key -> (label, field, descending)
+ADMIN_USER_SORTS = {
+    'newest': ('Newest first', 'date_joined', True),
+    'oldest': ('Oldest first', 'date_joined', False),
+    'email': ('Email (A-Z)', 'email', False),
+}
+ADMIN_JOB_SORTS = {
+    'newest': ('Newest first', 'posted_at', True),
+    'oldest': ('Oldest first', 'posted_at', False),
+    'title': ('Title (A-Z)', 'title', False),
+}
+
+# The largest number of employers one bulk approve/reject may change
+ADMIN_BULK_LIMIT = 500
+
+
+def admin_listing_context(request, queryset, search_fields, sorts, default_sort):
+    """
+    Search (?q=), sort (?sort=) and keyset-paginate (?cursor=) an admin listing.
+    Returns the context shared by the listing templates; the page's rows are
+    in `page.object_list`.
+    """
+    from utils.pagination import KeysetPaginator, capped_count
+
+    query = request.GET.get('q', '').strip()[:100]
+    if query:
+        condition = Q()
+        for field in search_fields:
+            condition |= Q(**{f'{field}__icontains': query})
+        queryset = queryset.filter(condition)
+
+    sort = request.GET.get('sort', '')
+    if sort not in sorts:
+        sort = default_sort
+    _label, sort_field, descending = sorts[sort]
+    paginator = KeysetPaginator(queryset, ADMIN_PAGE_SIZE, sort_field=sort_field, descending=descending)
+    page = paginator.page(request.GET.get('cursor'))
+    total_count, count_capped, count_estimated = capped_count(queryset)
+    if count_estimated:
+        count_display = f'about {total_count:,}'
+    elif count_capped:
+        count_display = f'{total_count:,}+'
+    else:
+        count_display = f'{total_count:,}'
+
+    # Query string for the "next page" link, without the current cursor
+    params = request.GET.copy()
+    params.pop('cursor', None)
+
+    return {
+        'page': page,
+        'query': query,
+        'sort': sort,
+        'sort_options': [(key, label) for key, (label, _field, _desc) in sorts.items()],
+        'total_count': total_count,
+        'count_capped': count_capped,
+        'count_display': count_display,
+        'querystring': params.urlencode(),
+    }
+
+
+EMPLOYER_SEARCH_FIELDS = ('email', 'username', 'employer_profile_rel__company_name')
+
+
+@admin_required
 def admin_total_employers_verified(request):
     verified_employers = User.objects.filter(
         user_type='employer',
         verification__status='verified'
     ).select_related('employer_profile_rel', 'verification')
 
-    context = {
-        'verified_employers': verified_employers,
-    }
+    context = admin_listing_context(
+        request, verified_employers, EMPLOYER_SEARCH_FIELDS, ADMIN_USER_SORTS, 'newest'
+    )
+    context['verified_employers'] = context['page'].object_list
     return render(request, "dashboard/admin/admin_total_employers_verified.html", context)
 
 
-@login_required
+@admin_required
 def admin_accept_reject_employer(request):
-    # Show employers that are pending or have no verification record yet
+    # Show employers that are pending or have no verification record yet. Both
+    # conditions use the same LEFT JOIN, so the verification comes with the row.
     unverified_employers = User.objects.filter(
-        user_type='employer'
-    ).exclude(
-        verification__status='verified'
-    ).select_related('employer_profile_rel').prefetch_related('verification')
+        Q(verification__isnull=True) | Q(verification__status__in=['pending', 'rejected']),
+        user_type='employer',
+    ).select_related('employer_profile_rel', 'verification')
 
-    context = {
-        'unverified_employers': unverified_employers
-    }
+    context = admin_listing_context(
+        request, unverified_employers, EMPLOYER_SEARCH_FIELDS, ADMIN_USER_SORTS, 'oldest'
+    )
+    context['unverified_employers'] = context['page'].object_list
+    context['bulk_limit'] = ADMIN_BULK_LIMIT
     return render(request, 'dashboard/admin/admin_accept_reject_employer.html', context)
 
 
-@login_required
-@user_passes_test(lambda u: u.user_type == 'ADMIN')  # Only admins can approve
-def approve_employer(request, employer_id):
-    if request.method == 'POST':
-        employer = get_object_or_404(User, id=employer_id, user_type='employer')
+def _admin_listing_redirect(request, default='dashboard:admin_accept_reject_employer'):
+    """Back to the listing the form was posted from (same search, sort and page)."""
+    from django.utils.http import url_has_allowed_host_and_scheme
 
-        # Create or update verification record
-        verification, created = UserVerification.objects.get_or_create(
-            user=employer,
-            defaults={
-                'admin_verifier': request.user,
-                'status': 'verified',
-                'verification_date': timezone.now(),
-                'notes': 'Approved by admin'
-            }
-        )
+    next_url = request.POST.get('next', '')
+    if url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()},
+                                       require_https=request.is_secure()):
+        return redirect(next_url)
+    return redirect(default)
 
-        if not created:
-            verification.admin_verifier = request.user
-            verification.status = 'verified'
-            verification.verification_date = timezone.now()
-            verification.notes = 'Approved by admin'
-            verification.save()
 
+@admin_required
+def approve_employer(request, employer_id):
+    if request.method == 'POST':
+        employer = get_object_or_404(User, id=employer_id, user_type='employer')
+        UserVerification.objects.set_status([employer.id], 'verified', request.user, 'Approved by admin')
         messages.success(request, f'Employer {employer.email} has been verified successfully.')
 
-    return redirect('dashboard:admin_accept_reject_employer')
+    return _admin_listing_redirect(request)
 
 
-@login_required
-@user_passes_test(lambda u: u.user_type == 'ADMIN')  # Only admins can reject
+@admin_required
 def reject_employer(request, employer_id):
     if request.method == 'POST':
         employer = get_object_or_404(User, id=employer_id, user_type='employer')
         rejection_note = request.POST.get('rejection_note', 'Rejected by admin')
-
-        # Create or update verification record
-        verification, created = UserVerification.objects.get_or_create(
-            user=employer,
-            defaults={
-                'admin_verifier': request.user,
-                'status': 'rejected',
-                'verification_date': timezone.now(),
-                'notes': rejection_note
-            }
-        )
-
-        if not created:
-            verification.admin_verifier = request.user
-            verification.status = 'rejected'
-            verification.verification_date = timezone.now()
-            verification.notes = rejection_note
-            verification.save()
-
+        UserVerification.objects.set_status([employer.id], 'rejected', request.user, rejection_note)
         messages.warning(request, f'Employer {employer.email} has been rejected.')
 
-    return redirect('dashboard:admin_accept_reject_employer')
+    return _admin_listing_redirect(request)
 
 
-@login_required
+@admin_required
+@require_POST
+def admin_bulk_verify_employers(request):
+    """Approve or reject the selected employers with a single upsert of their verifications."""
+    action = request.POST.get('action')
+    if action not in ('approve', 'reject'):
+        messages.error(request, 'Choose whether to approve or reject the selected employers.')
+        return _admin_listing_redirect(request)
+
+    try:
+        selected = {int(value) for value in request.POST.getlist('employer_ids')}
+    except ValueError:
+        selected = set()
+    if not selected:
+        messages.error(request, 'Select at least one employer.')
+        return _admin_listing_redirect(request)
+    if len(selected) > ADMIN_BULK_LIMIT:
+        messages.error(request, f'Select at most {ADMIN_BULK_LIMIT} employers at a time.')
+        return _admin_listing_redirect(request)
+
+    employer_ids = list(User.objects.filter(id__in=selected, user_type='employer').values_list('id', flat=True))
+    if action == 'approve':
+        count = UserVerification.objects.set_status(employer_ids, 'verified', request.user, 'Approved by admin')
+        messages.success(request, f'{count} employer(s) verified.')
+    else:
+        note = request.POST.get('rejection_note', '').strip() or 'Rejected by admin'
+        count = UserVerification.objects.set_status(employer_ids, 'rejected', request.user, note)
+        messages.warning(request, f'{count} employer(s) rejected.')
+    return _admin_listing_redirect(request)
+
+
+@admin_required
 def admin_applicants(request):
-    applicants = User.objects.filter(user_type='applicant')
-    context = {'applicants': applicants}
+    applicants = User.objects.filter(user_type='applicant').select_related('applicant_profile_rel')
+    context = admin_listing_context(
+        request,
+        applicants,
+        ('email', 'first_name', 'last_name', 'applicant_profile_rel__first_name',
+         'applicant_profile_rel__last_name', 'applicant_profile_rel__title'),
+        ADMIN_USER_SORTS,
+        'newest',
+    )
+    context['applicants'] = context['page'].object_list
     return render(request, 'dashboard/admin/admin_applicants.html', context)
 
 
@@ -2062,14 +2394,15 @@ def admin_applicant_detail(request, applicant_id):
     return render(request, 'dashboard/admin/admin_candidate_detail.html', context)
 
 
-@login_required
+@admin_required
 def admin_job_postings(request):
-    # Only show jobs with status 'active' (lowercase)
-    active_jobs = Job.objects.filter(status__in=['active', 'expired']).order_by('-posted_at')
+    # Active and expired jobs; the template shows each job's status
+    jobs = Job.objects.filter(status__in=['active', 'expired'])
 
-    context = {
-        'active_jobs': active_jobs
-    }
+    context = admin_listing_context(
+        request, jobs, ('title', 'company_name', 'location'), ADMIN_JOB_SORTS, 'newest'
+    )
+    context['active_jobs'] = context['page'].object_list
     return render(request, "dashboard/admin/admin_job_postings.html", context)
 
 
@@ -2136,7 +2469,7 @@ class ConversationView(LoginRequiredMixin, View):
         conv = get_object_or_404(Conversation, id=convo_id)
         if not conv.participants.filter(id=request.user.id).exists():
             return HttpResponseForbidden("Not allowed")
-        form = ReplyForm(request.POST, request.FILES)
+        form = ReplyForm(request.POST, request.FILES, upload_user=request.user)
         if form.is_valid():
             msg = form.save(commit=False)
             msg.conversation = conv
@@ -2187,7 +2520,7 @@ class ComposeView(LoginRequiredMixin, View):
         return render(request, template_name, {'form': form})
 
     def post(self, request):
-        form = ComposeForm(request.POST, request.FILES)
+        form = ComposeForm(request.POST, request.FILES, upload_user=request.user)
         template_name = choose_template_for_user(request.user, 'messages_compose.html')
         if not form.is_valid():
             return render(request, template_name, {'form': form})
@@ -2227,6 +2560,7 @@ class ComposeView(LoginRequiredMixin, View):
         return redirect(reverse('dashboard:conversation', args=[conv.id]))
 
 
+@session_readonly
 @login_required
 def messages_unread_counts(request):
     convs = Conversation.objects.filter(participants=request.user)
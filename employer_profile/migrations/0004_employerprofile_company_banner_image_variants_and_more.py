@@ -0,0 +1,23 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_profile', '0003_employerprofile_setup_completed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employerprofile',
+            name='company_banner_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of company_banner_image, written by uploads.images'),
+        ),
+        migrations.AddField(
+            model_name='employerprofile',
+            name='company_profile_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized copies of company_profile_image, written by uploads.images'),
+        ),
+    ]
@@ -22,6 +22,12 @@ class EmployerProfile(models.Model):
         null=True,
         help_text="Company logo"
     )
+    company_profile_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized copies of company_profile_image, written by uploads.images"
+    )
     
     company_banner_image = models.ImageField(
         upload_to='employer_documents/banners/',
@@ -29,6 +35,12 @@ class EmployerProfile(models.Model):
         null=True,
         help_text="Large banner image for company profile page"
     )
+    company_banner_image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Resized copies of company_banner_image, written by uploads.images"
+    )
     
     company_business_permit = models.FileField(
         upload_to='employer_documents/permits/',
@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     Job, JobApplication, FavoriteJob,
     JobCategory, EmploymentType, EducationLevel,
-    ExperienceLevel, JobLevel, SalaryType
+    ExperienceLevel, JobLevel, SalaryType, JobAlertDigestRun
 )
 
 
@@ -97,3 +97,9 @@ class FavoriteJobAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at']
     autocomplete_fields = ['applicant', 'job']
     date_hierarchy = 'created_at'
+
+
+@admin.register(JobAlertDigestRun)
+class JobAlertDigestRunAdmin(admin.ModelAdmin):
+    list_display = ['window_start', 'window_end', 'alerts_checked', 'emails_sent', 'started_at', 'finished_at']
+    readonly_fields = ['window_start', 'window_end', 'last_user_id', 'alerts_checked', 'emails_sent', 'started_at', 'finished_at']
@@ -0,0 +1,250 @@
+"""
+Job-alert digest emails.
+
+A digest run covers the jobs posted since the previous run's high-water mark
+on Job.posted_at. Those new jobs are loaded once; every active alert is then
+streamed from the database in user order and checked against them in Python
+(criteria_match mirrors JobAlert.get_matching_jobs), so the cost is one pass
+over the alerts rather than one query per alert. Alerts with identical
+criteria share a cached result.
+
+Matches are grouped into one email per user, rendered from
+jobs/emails/job_alert_digest.{txt,html} and sent in chunks, each over a
+single reused connection to the email backend. After every chunk the run
+records the last user it finished, so an interrupted run resumes where it
+stopped instead of emailing anyone twice.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Job, JobAlert, JobAlertDigestRun
+
+
+logger = logging.getLogger(__name__)
+
+# Jobs listed per alert in one email
+MAX_JOBS_PER_ALERT = 10
+
+# Only jobs posted at least this long ago are included, so a job whose
+# transaction commits just after the run starts is not skipped by the next run
+SETTLE_SECONDS = 60
+
+# Distinct alert criteria whose matches are cached during a run
+CRITERIA_CACHE_SIZE = 100000
+
+ALERT_FIELDS = (
+    'id', 'user_id', 'alert_name', 'job_title', 'location', 'job_type_id',
+    'job_category_id', 'min_salary', 'max_salary', 'keywords',
+    'user__email', 'user__first_name',
+)
+
+
+def alert_criteria(alert):
+    """Hashable, normalized criteria of an alert given as a values() row."""
+    keywords = tuple(k.strip().lower() for k in (alert['keywords'] or '').split(',') if k.strip())
+    return (
+        (alert['job_title'] or '').lower(),
+        (alert['location'] or '').lower(),
+        alert['job_type_id'],
+        alert['job_category_id'],
+        alert['min_salary'] or None,
+        alert['max_salary'] or None,
+        keywords,
+    )
+
+
+def criteria_match(criteria, job):
+    title, location, job_type_id, category_id, min_salary, max_salary, keywords = criteria
+    if title and title not in job.title.lower():
+        return False
+    if location and location not in job.location.lower():
+        return False
+    if job_type_id and job.job_type_id != job_type_id:
+        return False
+    if category_id and job.category_id != category_id:
+        return False
+    if min_salary and job.annual_min is not None and job.annual_min < Decimal(min_salary):
+        return False
+    if max_salary and job.annual_max is not None and job.annual_max > Decimal(max_salary):
+        return False
+    if keywords:
+        text = f'{job.title}\n{job.description}'.lower()
+        if not any(keyword in text for keyword in keywords):
+            return False
+    return True
+
+
+class NewJobMatcher:
+    """Matches alert criteria against a fixed list of new jobs, newest first."""
+
+    def __init__(self, jobs):
+        self.jobs = sorted(jobs, key=lambda job: job.posted_at, reverse=True)
+        self.by_category = defaultdict(list)
+        site_url = getattr(settings, 'SITE_URL', '').rstrip('/')
+        for job in self.jobs:
+            self.by_category[job.category_id].append(job)
+            # Reversed once here rather than once per email in the template
+            job.digest_url = site_url + reverse('jobs:job_detail', kwargs={'job_id': job.id})
+        self._cache = {}
+
+    def match(self, criteria):
+        if criteria in self._cache:
+            return self._cache[criteria]
+        category_id = criteria[3]
+        candidates = self.by_category.get(category_id, []) if category_id else self.jobs
+        matches = [job for job in candidates if criteria_match(criteria, job)]
+        if len(self._cache) >= CRITERIA_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[criteria] = matches
+        return matches
+
+
+def digest_recipients(after_user_id=0):
+    """Active alerts of active applicants who have not turned job-alert emails off."""
+    return JobAlert.objects.filter(
+        is_active=True,
+        user__is_active=True,
+        user_id__gt=after_user_id,
+    ).exclude(
+        user__notification_preferences__notify_job_alerts=False
+    ).order_by('user_id', 'id').values(*ALERT_FIELDS)
+
+
+def iter_user_digests(alerts, matcher):
+    """
+    Group streamed alert rows (ordered by user) into (user_id, email, first_name, sections).
+    Users whose alerts matched nothing are yielded with no sections, so progress still advances.
+    """
+    current = None
+    sections = []
+    for alert in alerts:
+        if current is not None and alert['user_id'] != current[0]:
+            yield current + (sections,)
+            sections = []
+        current = (alert['user_id'], alert['user__email'], alert['user__first_name'])
+        jobs = matcher.match(alert_criteria(alert))
+        if jobs:
+            sections.append({
+                'alert_name': alert['alert_name'],
+                'jobs': jobs[:MAX_JOBS_PER_ALERT],
+                'total': len(jobs),
+            })
+    if current is not None:
+        yield current + (sections,)
+
+
+def build_digest_email(email, first_name, sections):
+    site_url = getattr(settings, 'SITE_URL', '').rstrip('/')
+    total = sum(section['total'] for section in sections)
+    context = {
+        'first_name': first_name,
+        'sections': sections,
+        'total': total,
+        'site_url': site_url,
+        'alerts_url': site_url + reverse('dashboard:applicant_job_alerts'),
+        'settings_url': site_url + reverse('dashboard:applicant_settings'),
+    }
+    subject = f'{total} new job{"s" if total != 1 else ""} matching your alerts'
+    message = EmailMultiAlternatives(
+        subject,
+        render_to_string('jobs/emails/job_alert_digest.txt', context),
+        settings.DEFAULT_FROM_EMAIL,
+        [email],
+    )
+    message.attach_alternative(render_to_string('jobs/emails/job_alert_digest.html', context), 'text/html')
+    return message
+
+
+def start_or_resume_run(initial_lookback=timedelta(days=1), save=True):
+    """
+    Return the unfinished run if there is one, otherwise a new run covering
+    jobs posted since the last finished run's high-water mark.
+    """
+    unfinished = JobAlertDigestRun.objects.filter(finished_at__isnull=True).order_by('started_at').first()
+    if unfinished is not None:
+        return unfinished
+
+    window_end = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    last = JobAlertDigestRun.objects.filter(finished_at__isnull=False).order_by('-window_end').first()
+    window_start = last.window_end if last else window_end - initial_lookback
+    run = JobAlertDigestRun(window_start=window_start, window_end=window_end)
+    if save:
+        run.save()
+    return run
+
+
+def send_job_alert_digests(chunk_size=500, connection=None, dry_run=False, initial_lookback=timedelta(days=1)):
+    """
+    Run (or resume) one digest run. Returns a dict of counts for reporting.
+
+    `connection` is an email backend connection (for example a file-based
+    backend); by default the configured EMAIL_BACKEND is used. With `dry_run`
+    emails are built but not sent, and no progress is recorded.
+    """
+    run = start_or_resume_run(initial_lookback, save=not dry_run)
+    resumed = run.last_user_id > 0
+    new_jobs = Job.objects.filter(
+        status='active',
+        posted_at__gt=run.window_start,
+        posted_at__lte=run.window_end,
+        expiration_date__gte=timezone.localdate(),
+    ).only(
+        'id', 'title', 'company_name', 'location', 'description', 'category_id',
+        'job_type_id', 'annual_min', 'annual_max', 'posted_at',
+    )
+    matcher = NewJobMatcher(new_jobs)
+
+    if matcher.jobs:
+        alerts = _counted(digest_recipients(run.last_user_id).iterator(chunk_size=2000), run)
+        batch = []
+        last_user_id = run.last_user_id
+        for user_id, email, first_name, sections in iter_user_digests(alerts, matcher):
+            if sections and email:
+                batch.append(build_digest_email(email, first_name, sections))
+            last_user_id = user_id
+            if len(batch) >= chunk_size:
+                _send_batch(run, batch, last_user_id, connection, dry_run)
+                batch = []
+        _send_batch(run, batch, last_user_id, connection, dry_run)
+
+    if not dry_run:
+        run.finished_at = timezone.now()
+        run.save(update_fields=['finished_at', 'alerts_checked'])
+    return {
+        'window_start': run.window_start,
+        'window_end': run.window_end,
+        'resumed': resumed,
+        'new_jobs': len(matcher.jobs),
+        'alerts': run.alerts_checked,
+        'emails': run.emails_sent,
+    }
+
+
+def _counted(alerts, run):
+    for alert in alerts:
+        run.alerts_checked += 1
+        yield alert
+
+
+def _send_batch(run, messages, last_user_id, connection, dry_run):
+    """Send one chunk over a single connection and record the run's progress."""
+    if dry_run:
+        run.emails_sent += len(messages)
+        return
+    if messages:
+        connection = connection or get_connection()
+        # send_messages() opens the connection once for the whole chunk
+        sent = connection.send_messages(messages) or 0
+        run.emails_sent += sent
+        if sent < len(messages):
+            logger.warning('Job alert digest: %s of %s emails were not sent', len(messages) - sent, len(messages))
+    run.last_user_id = last_user_id
+    run.save(update_fields=['last_user_id', 'alerts_checked', 'emails_sent'])
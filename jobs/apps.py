@@ -4,3 +4,23 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        """
+        Flush buffered job views after requests and when the process exits, and
+        retire cached fragments when a lookup table they show changes.
+        """
+        import atexit
+        from django.core.signals import request_finished
+        from django.db.models.signals import post_delete, post_save
+        from utils.fragment_cache import bump_registry_version
+        from .impressions import flush_job_views, flush_job_views_if_due
+        from .models import EducationLevel, EmploymentType, ExperienceLevel, JobCategory, JobLevel, SalaryType
+
+        request_finished.connect(flush_job_views_if_due, dispatch_uid='jobs.flush_job_views')
+        atexit.register(flush_job_views)
+
+        for model in (JobCategory, EmploymentType, EducationLevel, ExperienceLevel, JobLevel, SalaryType):
+            label = model._meta.label_lower
+            post_save.connect(bump_registry_version, sender=model, dispatch_uid=f'fragment_registry_save_{label}')
+            post_delete.connect(bump_registry_version, sender=model, dispatch_uid=f'fragment_registry_delete_{label}')
@@ -249,13 +249,13 @@ class JobAlertForm(forms.ModelForm):
             }),
             'min_salary': forms.NumberInput(attrs={
                 'class': 'form-control',
-                'placeholder': 'Minimum salary',
+                'placeholder': 'Minimum yearly salary',
                 'id': 'min_salary',
                 'min': '0'
             }),
             'max_salary': forms.NumberInput(attrs={
                 'class': 'form-control',
-                'placeholder': 'Maximum salary',
+                'placeholder': 'Maximum yearly salary',
                 'id': 'max_salary',
                 'min': '0'
             }),
@@ -0,0 +1,242 @@
+"""
+Hiring funnel of a job: views -> applications -> each pipeline stage -> hired,
+with the time applications spend in each stage and the time to hire.
+
+Built from the job's applications and its ApplicationStageTransition log. A
+window query (LEAD/ROW_NUMBER over each application's transitions) gives the
+time every stint in a stage lasted; the result is cached per job in
+JobFunnelSummary and only recomputed when the job has new applications, stage
+moves, or stages added, edited or deleted (see funnel_signatures()), so a
+page of funnels costs a couple of queries however many jobs the employer has.
+Views are read live from Job.view_count and are not part of the cached summary.
+
+A stage counts the applications that reached it or any later stage, so the
+steps only ever narrow. Applications already in a stage before transitions
+were logged count as having reached it, but have no time-in-stage.
+"""
+import statistics
+from datetime import datetime, time
+
+from django.db.models import Count, F, Max, OuterRef, Subquery, Window
+from django.db.models.functions import Lead, RowNumber
+from django.utils import timezone
+
+
+ALL_APPLICATIONS = 'All Applications'
+
+
+def _durations(seconds):
+    """Median/mean summary of a list of durations in seconds."""
+    if not seconds:
+        return {'count': 0, 'median_seconds': None, 'mean_seconds': None}
+    return {
+        'count': len(seconds),
+        'median_seconds': round(statistics.median(seconds)),
+        'mean_seconds': round(statistics.fmean(seconds)),
+    }
+
+
+def stage_stints(job):
+    """
+    Yields (stage_id, seconds) for every finished stay of an application in a
+    stage of `job`, stage_id None being "All Applications".
+    """
+    from .models import ApplicationStageTransition
+
+    ordering = [F('created_at').asc(), F('id').asc()]
+    transitions = ApplicationStageTransition.objects.filter(job=job).annotate(
+        left_at=Window(Lead('created_at'), partition_by=[F('application_id')], order_by=ordering),
+        position=Window(RowNumber(), partition_by=[F('application_id')], order_by=ordering),
+    ).values_list(
+        'from_stage_id', 'from_stage_name', 'to_stage_id', 'to_stage_name', 'created_at', 'left_at',
+        'position', 'application__application_date',
+    )
+    for from_id, from_name, to_id, to_name, entered, left, position, applied in transitions:
+        if position == 1 and from_id is None and not from_name:
+            # The stay in "All Applications" between applying and the first move
+            yield None, (entered - applied).total_seconds()
+        # A null stage with a name is a stage deleted since
+        if left is not None and not (to_id is None and to_name):
+            yield to_id, (left - entered).total_seconds()
+
+
+def compute_job_funnel(job):
+    """The cacheable funnel of `job` as JSON-serializable data (no views)."""
+    from .models import ApplicationStage, ApplicationStageTransition
+
+    stages = list(
+        ApplicationStage.objects.filter(job=job, is_system=False)
+        .order_by('order', 'created_at', 'id').values_list('id', 'name')
+    )
+    position = {stage_id: index for index, (stage_id, _name) in enumerate(stages, 1)}
+    hired_position = len(stages) + 1
+
+    # How far each application got: 0 is "All Applications", hired is past every stage
+    furthest = {}
+    applied_at = {}
+    hired = {}
+    current = {}
+    for app_id, stage_id, status, applied, hired_date in job.applications.values_list(
+        'id', 'stage_id', 'status', 'application_date', 'hired_date'
+    ):
+        applied_at[app_id] = applied
+        furthest[app_id] = hired_position if status == 'hired' else position.get(stage_id, 0)
+        if status == 'hired':
+            hired[app_id] = hired_date
+        else:
+            column = stage_id if stage_id in position else None
+            current[column] = current.get(column, 0) + 1
+
+    hired_at = {}
+    moves = ApplicationStageTransition.objects.filter(job=job).values_list(
+        'application_id', 'to_stage_id', 'hired', 'created_at'
+    )
+    for app_id, to_id, was_hire, moved_at in moves:
+        if app_id not in furthest:
+            continue
+        furthest[app_id] = max(furthest[app_id], position.get(to_id, 0))
+        if was_hire and app_id in hired:
+            hired_at[app_id] = min(hired_at.get(app_id, moved_at), moved_at)
+
+    durations = {}
+    for stage_id, seconds in stage_stints(job):
+        durations.setdefault(stage_id, []).append(seconds)
+
+    steps = [{
+        'stage_id': None,
+        'name': ALL_APPLICATIONS,
+        'reached': len(furthest),
+        'current': current.get(None, 0),
+        **_durations(durations.get(None)),
+    }]
+    for stage_id, name in stages:
+        steps.append({
+            'stage_id': stage_id,
+            'name': name,
+            'reached': sum(1 for reached in furthest.values() if reached >= position[stage_id]),
+            'current': current.get(stage_id, 0),
+            **_durations(durations.get(stage_id)),
+        })
+
+    time_to_hire = []
+    for app_id, hired_date in hired.items():
+        if app_id in hired_at:
+            time_to_hire.append((hired_at[app_id] - applied_at[app_id]).total_seconds())
+        elif hired_date:
+            # Hired before moves were logged: only the day is known
+            hired_on = timezone.make_aware(datetime.combine(hired_date, time.min))
+            time_to_hire.append(max((hired_on - applied_at[app_id]).total_seconds(), 0))
+
+    return {
+        'applications': len(furthest),
+        'hired': len(hired),
+        'steps': steps,
+        'time_to_hire': _durations(time_to_hire),
+    }
+
+
+def funnel_signatures(job_ids):
+    """{job_id: signature} of what a cached funnel depends on, in one query."""
+    from .models import ApplicationStage, ApplicationStageTransition, Job
+
+    last_move = ApplicationStageTransition.objects.filter(job=OuterRef('pk')).order_by('-id').values('id')[:1]
+    stages = ApplicationStage.objects.filter(job=OuterRef('pk')).order_by().values('job')
+    last_stage_edit = stages.annotate(last=Max('updated_at')).values('last')
+    # Deleting a stage changes its job's count (or its last id) even when
+    # nothing else about the remaining stages does
+    stage_count = stages.annotate(n=Count('pk')).values('n')
+    last_stage = stages.annotate(last=Max('pk')).values('last')
+    rows = Job.objects.filter(pk__in=job_ids).annotate(
+        application_count=Count('applications'),
+        last_move=Subquery(last_move),
+        last_stage_edit=Subquery(last_stage_edit),
+        stage_count=Subquery(stage_count),
+        last_stage=Subquery(last_stage),
+    ).values_list('pk', 'application_count', 'last_move', 'last_stage_edit', 'stage_count', 'last_stage')
+    return {
+        pk: f'{count}:{move or 0}:{edit.timestamp() if edit else 0}:{stage_count or 0}:{last_stage or 0}'
+        for pk, count, move, edit, stage_count, last_stage in rows
+    }
+
+
+def job_funnels(jobs):
+    """
+    {job_id: funnel data} for `jobs`, from JobFunnelSummary where it is still
+    current and recomputed (and stored) where it is not.
+    """
+    from .models import JobFunnelSummary
+
+    jobs = list(jobs)
+    signatures = funnel_signatures([job.pk for job in jobs])
+    cached = {
+        summary.job_id: summary
+        for summary in JobFunnelSummary.objects.filter(job_id__in=signatures)
+    }
+    funnels = {}
+    stale = []
+    now = timezone.now()
+    for job in jobs:
+        summary = cached.get(job.pk)
+        signature = signatures.get(job.pk)
+        if summary is not None and summary.signature == signature:
+            funnels[job.pk] = summary.data
+            continue
+        data = compute_job_funnel(job)
+        funnels[job.pk] = data
+        stale.append(JobFunnelSummary(job=job, signature=signature, data=data, computed_at=now))
+    if stale:
+        JobFunnelSummary.objects.bulk_create(
+            stale, update_conflicts=True, unique_fields=['job'],
+            update_fields=['signature', 'data', 'computed_at'],
+        )
+    return funnels
+
+
+def format_duration(seconds):
+    """Short human duration: '45 min', '5 h', '3.5 days'."""
+    if seconds is None:
+        return ''
+    if seconds < 3600:
+        return f'{max(round(seconds / 60), 1)} min'
+    if seconds < 86400:
+        return f'{seconds / 3600:.0f} h'
+    days = seconds / 86400
+    return f'{days:.1f} days' if days < 10 else f'{days:.0f} days'
+
+
+def funnel_steps(views, data):
+    """
+    Display rows for a funnel: views, applications, each stage and hired,
+    each with its count, share of applications (or of views for applications)
+    and median time spent there.
+    """
+    applications = data['applications']
+
+    def share(count, total):
+        return round(100 * count / total) if total else 0
+
+    rows = [{'name': 'Views', 'count': views, 'percent': 100 if views else 0, 'kind': 'views'}]
+    for step in data['steps']:
+        first = step['stage_id'] is None
+        rows.append({
+            'name': 'Applications' if first else step['name'],
+            'count': step['reached'],
+            # Views were counted only from some point on, so they can trail applications
+            'percent': (share(step['reached'], views) if views >= step['reached'] else None) if first
+                       else share(step['reached'], applications),
+            'current': step['current'],
+            'median': format_duration(step['median_seconds']),
+            'kind': 'applications' if first else 'stage',
+        })
+    rows.append({
+        'name': 'Hired',
+        'count': data['hired'],
+        'percent': share(data['hired'], applications),
+        'median': format_duration(data['time_to_hire']['median_seconds']),
+        'kind': 'hired',
+    })
+    # Bar widths relative to the widest step
+    widest = max(row['count'] for row in rows) or 1
+    for row in rows:
+        row['width'] = max(round(100 * row['count'] / widest), 1 if row['count'] else 0)
+    return rows
@@ -0,0 +1,176 @@
+"""
+Buffered view counting for job detail pages.
+
+record_job_view() only touches this process's memory: it adds one to the
+job's count for the day and remembers a hash of the visitor. After a request
+has been answered, flush_job_views() writes everything buffered once
+JOB_VIEWS_FLUSH_INTERVAL seconds have passed or JOB_VIEWS_MAX_PENDING views
+have piled up (see JobsConfig.ready):
+
+- one `UPDATE jobs_job SET view_count = view_count + CASE ... END` per
+  batch of jobs,
+- one JobDailyViews row per job and day, whose count is increased and whose
+  HyperLogLog sketch of distinct visitors absorbs the buffered hashes.
+
+Views still buffered when a process is killed are lost; a normal shutdown
+flushes them. A flush that fails puts the views back into the buffer.
+"""
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from utils.hyperloglog import HyperLogLog, hash_item
+
+
+logger = logging.getLogger(__name__)
+
+# Jobs updated per UPDATE statement
+FLUSH_BATCH_SIZE = 500
+
+_lock = threading.Lock()
+_views = Counter()              # (job_id, date) -> views
+_viewers = defaultdict(set)     # (job_id, date) -> visitor hashes
+_pending = 0
+_last_flush = time.monotonic()
+
+
+def visitor_key(request):
+    """
+    Identifies a visitor for the unique viewer estimate: the account, else the
+    session, else the client address and browser.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f'session:{session.session_key}'
+    # Behind Render's proxy REMOTE_ADDR is the proxy; the first forwarded hop is the client
+    address = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip() or request.META.get('REMOTE_ADDR', '')
+    return f'anon:{address}:{request.META.get("HTTP_USER_AGENT", "")[:200]}'
+
+
+def record_job_view(request, job):
+    """Count a view of `job`'s detail page. Views by the job's own employer are ignored."""
+    global _pending
+
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.pk == job.employer_id:
+        return
+    hashed = hash_item(visitor_key(request))
+    key = (job.pk, timezone.localdate())
+    with _lock:
+        _views[key] += 1
+        _viewers[key].add(hashed)
+        _pending += 1
+
+
+def flush_due():
+    interval = getattr(settings, 'JOB_VIEWS_FLUSH_INTERVAL', 30)
+    max_pending = getattr(settings, 'JOB_VIEWS_MAX_PENDING', 10000)
+    return _pending and (_pending >= max_pending or time.monotonic() - _last_flush >= interval)
+
+
+def _take_buffer():
+    global _views, _viewers, _pending, _last_flush
+
+    with _lock:
+        views, viewers = _views, _viewers
+        _views, _viewers = Counter(), defaultdict(set)
+        _pending = 0
+        _last_flush = time.monotonic()
+    return views, viewers
+
+
+def _restore_buffer(views, viewers):
+    global _pending
+
+    with _lock:
+        _views.update(views)
+        for key, hashes in viewers.items():
+            _viewers[key] |= hashes
+        _pending += sum(views.values())
+
+
+def flush_job_views():
+    """Write this process's buffered views to the database. Returns the number of views written."""
+    views, viewers = _take_buffer()
+    if not views:
+        return 0
+    try:
+        write_job_views(views, viewers)
+    except DatabaseError:
+        logger.exception('Could not save %s buffered job view(s), keeping them for the next flush',
+                         sum(views.values()))
+        _restore_buffer(views, viewers)
+        return 0
+    return sum(views.values())
+
+
+def flush_job_views_if_due(**kwargs):
+    """request_finished receiver: flush once the interval has passed or the buffer is full."""
+    if not flush_due():
+        return
+    # Django has usually closed the request's connection already; don't leave a new one open
+    opened = connection.connection is None
+    flush_job_views()
+    if opened and not connection.in_atomic_block:
+        connection.close()
+
+
+def write_job_views(views, viewers):
+    """Add `views` ({(job_id, date): n}) and `viewers` ({(job_id, date): hashes}) to the database."""
+    from .models import Job, JobDailyViews
+
+    per_job = Counter()
+    for (job_id, _day), count in views.items():
+        per_job[job_id] += count
+
+    with transaction.atomic():
+        # Jobs deleted since they were viewed are dropped
+        existing = set(Job.objects.filter(pk__in=list(per_job)).values_list('pk', flat=True))
+        job_ids = sorted(existing)
+        for offset in range(0, len(job_ids), FLUSH_BATCH_SIZE):
+            batch = job_ids[offset:offset + FLUSH_BATCH_SIZE]
+            increment = Case(*[When(pk=job_id, then=Value(per_job[job_id])) for job_id in batch])
+            Job.objects.filter(pk__in=batch).update(view_count=F('view_count') + increment)
+
+        keys = sorted(key for key in views if key[0] in existing)
+        JobDailyViews.objects.bulk_create(
+            [JobDailyViews(job_id=job_id, date=day) for job_id, day in keys],
+            ignore_conflicts=True,
+        )
+        # Lock the day rows in a fixed order so concurrent flushes cannot deadlock
+        rows = JobDailyViews.objects.select_for_update().filter(
+            job_id__in={job_id for job_id, _day in keys},
+            date__in={day for _job_id, day in keys},
+        ).order_by('pk')
+        changed = []
+        for row in rows:
+            key = (row.job_id, row.date)
+            if key not in views:
+                continue
+            sketch = HyperLogLog.from_bytes(row.viewers)
+            sketch.update(viewers[key])
+            row.views += views[key]
+            row.viewers = sketch.to_bytes()
+            changed.append(row)
+        JobDailyViews.objects.bulk_update(changed, ['views', 'viewers'], batch_size=FLUSH_BATCH_SIZE)
+
+
+def unique_viewers(job, days=30):
+    """Estimated distinct visitors of `job` over the last `days` days (flushed views only)."""
+    from .models import JobDailyViews
+
+    since = timezone.localdate() - timedelta(days=days - 1)
+    sketch = HyperLogLog()
+    for data in JobDailyViews.objects.filter(job=job, date__gte=since).values_list('viewers', flat=True):
+        sketch.merge(HyperLogLog.from_bytes(data))
+    return sketch.estimate()
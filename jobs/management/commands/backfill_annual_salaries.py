@@ -0,0 +1,27 @@
+"""
+Recompute the denormalized annual_min/annual_max salary columns on Job.
+
+Run after bulk imports, raw SQL edits, or changes to SALARY_PERIODS_PER_YEAR:
+    python manage.py backfill_annual_salaries
+"""
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Recompute annual_min/annual_max for all jobs from min/max salary and salary type.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--status',
+            help='Only backfill jobs with this status (e.g. active).',
+        )
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.all()
+        if options['status']:
+            jobs = jobs.filter(status=options['status'])
+
+        updated = jobs.update_annual_salaries()
+        self.stdout.write(self.style.SUCCESS(f'Updated annual salary for {updated} job(s).'))
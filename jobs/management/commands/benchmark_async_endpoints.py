@@ -0,0 +1,377 @@
+"""
+Compare the polling endpoints as the site serves them (sync views through
+JobConnect/wsgi.py) with async versions of them under uvicorn.
+
+    python manage.py benchmark_async_endpoints
+    python manage.py benchmark_async_endpoints --workers 2 --concurrency 64 --requests 4000
+    python manage.py benchmark_async_endpoints --db-latency 20
+
+For each server in turn the command starts gunicorn on --port:
+- sync:  the site's WSGI application with sync workers,
+- async: the site's ASGI application with uvicorn workers, answering the
+  benchmarked paths with the async views below,
+then sends --requests requests to each endpoint from --concurrency client
+threads and reports throughput and latency. The endpoints are the
+notification list and unread count, job title suggestions and the favorite
+toggle. Test users, jobs and notifications are written to the configured
+database (the servers have to see them) and deleted afterwards.
+
+--db-latency adds that many milliseconds to every query the servers run, to
+stand in for the round trips to a hosted database, which is where async
+workers have something to gain. The site keeps the sync views and WSGI
+(render.yaml): under ASGI, Django 4.2 runs every other (sync) view on one
+thread per worker, and the async views would only pay off in a service of
+their own.
+"""
+import http.client
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import ModuleType
+
+import django
+from django.apps import apps
+
+if not apps.ready:
+    # Imported by gunicorn to serve an application below rather than by manage.py
+    django.setup(set_prefix=False)
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.urls import include, path
+from django.utils.crypto import get_random_string
+
+from utils.async_views import aget_user, login_required, require_http_methods, require_POST
+from utils.mixins import applicant_required
+from utils.sessions import session_readonly
+
+
+# --- Async versions of the views, served only by the async server ---
+
+@login_required
+@require_http_methods(["GET"])
+async def async_get_notifications(request):
+    from notifications.models import Notification
+    from notifications.views import get_time_ago
+
+    user = await aget_user(request)
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return redirect('dashboard:dashboard')
+    notifications = Notification.objects.filter(user=user).order_by('-created_at')[:20]
+    notifications_data = [
+        {
+            'id': notif.id,
+            'type': notif.notification_type,
+            'title': notif.title,
+            'message': notif.message,
+            'link': notif.link or '',
+            'is_read': notif.is_read,
+            'created_at': notif.created_at.isoformat(),
+            'time_ago': get_time_ago(notif.created_at),
+        }
+        async for notif in notifications
+    ]
+    unread_count = await Notification.objects.filter(user=user, is_read=False).acount()
+    return JsonResponse({'success': True, 'notifications': notifications_data, 'unread_count': unread_count})
+
+
+@session_readonly
+@login_required
+@require_http_methods(["GET"])
+async def async_get_unread_count(request):
+    from notifications.models import Notification
+
+    user = await aget_user(request)
+    if not request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return redirect('dashboard:dashboard')
+    unread_count = await Notification.objects.filter(user=user, is_read=False).acount()
+    return JsonResponse({'success': True, 'unread_count': unread_count})
+
+
+async def async_job_suggestions(request):
+    from jobs.models import Job
+
+    term = request.GET.get("term", "")
+    if len(term) < 3:
+        return JsonResponse([], safe=False)
+    qs = Job.objects.filter(title__icontains=term)
+    suggestions = [title async for title in qs.values_list("title", flat=True)[:8]]
+    return JsonResponse(suggestions, safe=False)
+
+
+@applicant_required
+@require_POST
+async def async_toggle_favorite_job(request, job_id):
+    from dashboard.forms import FavoriteJobForm
+    from jobs.models import FavoriteJob
+
+    form = FavoriteJobForm(data={'job_id': job_id}, user=await aget_user(request))
+    if not await sync_to_async(form.is_valid)():
+        return JsonResponse({'success': False, 'error': 'Invalid request.'}, status=400)
+    job = form.cleaned_data['job']
+    favorite = await FavoriteJob.objects.filter(applicant=request.user, job=job).afirst()
+    if favorite:
+        await favorite.adelete()
+        is_favorited = False
+    else:
+        await FavoriteJob.objects.acreate(applicant=request.user, job=job)
+        is_favorited = True
+    return JsonResponse({'success': True, 'is_favorited': is_favorited})
+
+
+class AsyncViewsHandler(ASGIHandler):
+    """The project's ASGI handler, answering the benchmarked paths with the async views."""
+
+    def __init__(self):
+        super().__init__()
+        self.urlconf = ModuleType('benchmark_async_urls')
+        self.urlconf.urlpatterns = [
+            path('notifications/', async_get_notifications),
+            path('notifications/unread-count/', async_get_unread_count),
+            path('jobs/suggestions/', async_job_suggestions),
+            path('jobs/<int:job_id>/favorite/', async_toggle_favorite_job),
+            path('', include(settings.ROOT_URLCONF)),
+        ]
+
+    async def get_response_async(self, request):
+        request.urlconf = self.urlconf
+        return await super().get_response_async(request)
+
+
+def sync_application():
+    """The site's WSGI application, loaded through this module so --db-latency applies to it."""
+    return WSGIHandler()
+
+
+def async_application():
+    """ASGI application for the async server, loaded by gunicorn as `async_application()`."""
+    return AsyncViewsHandler()
+
+
+# Milliseconds the servers add to every query, passed down by --db-latency
+DB_LATENCY_ENV = 'BENCHMARK_DB_LATENCY_MS'
+
+
+def delay_query(execute, sql, params, many, context):
+    time.sleep(float(os.environ[DB_LATENCY_ENV]) / 1000)
+    return execute(sql, params, many, context)
+
+
+def add_db_latency(sender, connection, **kwargs):
+    # The same connection object reconnects for every request (CONN_MAX_AGE = 0)
+    if delay_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(delay_query)
+
+
+if os.environ.get(DB_LATENCY_ENV):
+    connection_created.connect(add_db_latency, dispatch_uid='benchmark_db_latency')
+
+
+SERVERS = {
+    'sync': ['--worker-class', 'sync', f'{__name__}:sync_application()'],
+    'async': ['--worker-class', 'uvicorn_worker.UvicornWorker', f'{__name__}:async_application()'],
+}
+
+SUGGESTION_TERM = 'Async Benchmark'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark async versions of the polling JSON endpoints under uvicorn against the sync views under gunicorn.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Client threads sending requests.')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint and server.')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--db-latency', type=float, default=0,
+            help='Milliseconds added to every query the servers run (simulated network round trip).',
+        )
+
+    def handle(self, *args, **options):
+        if min(options['workers'], options['concurrency'], options['requests']) < 1:
+            raise CommandError('--workers, --concurrency and --requests must be at least 1.')
+        if options['db_latency'] < 0:
+            raise CommandError('--db-latency cannot be negative.')
+
+        self.port = options['port']
+        self.db_latency = options['db_latency']
+        self.csrf_token = get_random_string(32)
+        seeded = self.seed(options['concurrency'])
+        try:
+            endpoints = self.endpoints(seeded['job_ids'])
+            results = {}
+            for server, server_args in SERVERS.items():
+                process = self.start_server(server, server_args, options['workers'])
+                try:
+                    for label, request in endpoints.items():
+                        self.run_load(request, seeded['cookie'], options['concurrency'], 50)  # warm up
+                        results[(label, server)] = self.run_load(
+                            request, seeded['cookie'], options['concurrency'], options['requests'],
+                        )
+                finally:
+                    process.send_signal(signal.SIGTERM)
+                    process.wait(timeout=30)
+        finally:
+            self.cleanup(seeded)
+
+        self.stdout.write(
+            f"{options['requests']} requests per endpoint, {options['concurrency']} client threads, "
+            f"{options['workers']} server workers, {options['db_latency']:g} ms added per query:"
+        )
+        for label in endpoints:
+            for server in SERVERS:
+                result = results[(label, server)]
+                self.stdout.write(
+                    f'  {label:<17} {server:<6} {result["rps"]:8.0f} req/s  p50 {result["p50"]:7.2f} ms  '
+                    f'p95 {result["p95"]:7.2f} ms  errors {result["errors"]}'
+                )
+            ratio = results[(label, 'async')]['rps'] / results[(label, 'sync')]['rps']
+            self.stdout.write(f'  {"":<17} async/sync throughput {ratio:.2f}x')
+        self.stdout.write('Benchmark rows deleted.')
+        self.stdout.write(self.style.SUCCESS('Async endpoint benchmark finished.'))
+
+    def seed(self, jobs):
+        from django.contrib.auth import get_user_model
+        from django.test import Client
+        from django.utils import timezone
+
+        from jobs.models import Job
+        from notifications.models import Notification
+
+        User = get_user_model()
+        employer = User.objects.create(
+            username='async-bench-employer', email='async-bench-employer@example.invalid',
+            user_type='employer', password='!',
+        )
+        applicant = User.objects.create(
+            username='async-bench-applicant', email='async-bench-applicant@example.invalid',
+            user_type='applicant', password='!',
+        )
+        expires = timezone.localdate() + timedelta(days=30)
+        created = Job.objects.bulk_create([
+            Job(
+                employer=employer, title=f'{SUGGESTION_TERM} Job {i}', location='Cebu City',
+                description='Generated by benchmark_async_endpoints and deleted when it finishes.',
+                expiration_date=expires,
+            )
+            for i in range(jobs)
+        ])
+        Notification.objects.bulk_create([
+            Notification(user=applicant, title=f'Benchmark notification {i}', message='Generated.', is_read=i % 3 != 0)
+            for i in range(30)
+        ])
+        client = Client()
+        client.force_login(applicant)
+        return {
+            'users': [employer.pk, applicant.pk],
+            'job_ids': [job.pk for job in created],
+            'cookie': client.cookies[settings.SESSION_COOKIE_NAME].value,
+        }
+
+    def cleanup(self, seeded):
+        from django.contrib.auth import get_user_model
+        from django.contrib.sessions.models import Session
+
+        Session.objects.filter(session_key=seeded['cookie']).delete()
+        get_user_model().objects.filter(pk__in=seeded['users']).delete()
+
+    def endpoints(self, job_ids):
+        """label -> function(thread index) giving (method, path)."""
+        term = SUGGESTION_TERM.replace(' ', '+')
+        return {
+            'unread count': lambda thread: ('GET', '/notifications/unread-count/'),
+            'notifications': lambda thread: ('GET', '/notifications/'),
+            'suggestions': lambda thread: ('GET', f'/jobs/suggestions/?term={term}'),
+            # One job per client thread, so two toggles of the same row never race
+            'favorite toggle': lambda thread: ('POST', f'/jobs/{job_ids[thread % len(job_ids)]}/favorite/'),
+        }
+
+    def start_server(self, server, server_args, workers):
+        try:
+            http.client.HTTPConnection('127.0.0.1', self.port, timeout=2).connect()
+        except OSError:
+            pass
+        else:
+            raise CommandError(f'Port {self.port} is already in use; pick another with --port.')
+        command = [
+            sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{self.port}',
+            '--workers', str(workers), '--log-level', 'warning',
+        ] + server_args
+        env = os.environ.copy()
+        if self.db_latency:
+            env[DB_LATENCY_ENV] = str(self.db_latency)
+        process = subprocess.Popen(command, cwd=str(settings.BASE_DIR), env=env)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'The {server} server exited with code {process.returncode}.')
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=2)
+                connection.request('GET', '/jobs/suggestions/', headers={'Host': '127.0.0.1'})
+                if connection.getresponse().status == 200:
+                    return process
+            except OSError:
+                pass
+            time.sleep(0.2)
+        process.kill()
+        raise CommandError(f'The {server} server did not start on port {self.port}.')
+
+    def run_load(self, request, cookie, concurrency, total):
+        headers = {
+            'Host': '127.0.0.1',
+            'X-Requested-With': 'XMLHttpRequest',
+            'X-CSRFToken': self.csrf_token,
+            'Cookie': f'{settings.SESSION_COOKIE_NAME}={cookie}; {settings.CSRF_COOKIE_NAME}={self.csrf_token}',
+        }
+        counter = iter(range(total))
+        lock = threading.Lock()
+        latencies = []
+        errors = []
+
+        def client(thread):
+            connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+            while True:
+                with lock:
+                    if next(counter, None) is None:
+                        break
+                method, url = request(thread)
+                start = time.perf_counter()
+                try:
+                    connection.request(method, url, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    if not ok:
+                        errors.append(url)
+            connection.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(client, range(concurrency)))
+        wall = time.perf_counter() - start
+        latencies.sort()
+        return {
+            'rps': len(latencies) / wall,
+            'p50': statistics.median(latencies) * 1000,
+            'p95': latencies[int(len(latencies) * 0.95)] * 1000,
+            'errors': len(errors),
+        }
@@ -0,0 +1,139 @@
+"""
+Measure what {% cachefragment %} saves when rendering a page of job results
+(see utils/fragment_cache.py).
+
+Jobs are generated inside a transaction that is rolled back at the end:
+    python manage.py benchmark_fragment_cache
+    python manage.py benchmark_fragment_cache --results 50 --rounds 200
+
+For the job search results fragment and a page of job cards, reports the
+render time of a --results page:
+- without fragment caching (every block rendered, as before),
+- cold (every fragment rendered and stored),
+- warm (every fragment read from the cache),
+alternating the variants so they see the same process state.
+"""
+import statistics
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache.backends.dummy import DummyCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.utils import timezone
+
+from employer_profile.models import EmployerProfile
+from jobs.models import EmploymentType, Job
+from utils.fragment_cache import fragment_cache
+
+
+class _Rollback(Exception):
+    pass
+
+
+JOB_CARDS_TEMPLATE = "{% for job in jobs %}{% include 'jobs/job_card.html' %}{% endfor %}"
+
+
+class Command(BaseCommand):
+    help = 'Benchmark rendering a page of job results with and without fragment caching (generated rows are rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--results', type=int, default=50, help='Jobs on the rendered page.')
+        parser.add_argument('--employers', type=int, default=10, help='Employers the jobs are spread over.')
+        parser.add_argument('--rounds', type=int, default=100, help='Renders per variant.')
+
+    def handle(self, *args, **options):
+        if options['results'] < 1 or options['employers'] < 1:
+            raise CommandError('--results and --employers must be at least 1.')
+        try:
+            with transaction.atomic():
+                jobs = self.seed(options['results'], options['employers'])
+                request = RequestFactory().get('/jobs/search/')
+                request.user = AnonymousUser()
+                pages = {
+                    'job search results': lambda: render_to_string(
+                        'jobs/components/job_search_results.html',
+                        {'jobs': jobs, 'total_count': len(jobs), 'favorited_job_ids': []},
+                        request=request,
+                    ),
+                    'job cards': lambda: engines['django'].from_string(JOB_CARDS_TEMPLATE).render(
+                        {'jobs': jobs}, request=request,
+                    ),
+                }
+                for label, render in pages.items():
+                    self.compare(label, render, request, options['results'], options['rounds'])
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.stdout.write('Generated rows rolled back.')
+        self.stdout.write(self.style.SUCCESS('Fragment cache benchmark finished.'))
+
+    def seed(self, results, employers):
+        User = get_user_model()
+        job_type = EmploymentType.objects.filter(is_active=True).first()
+        expires = timezone.localdate() + timedelta(days=30)
+        users = []
+        for i in range(employers):
+            user = User.objects.create(
+                username=f'fragment-bench-employer-{i}', email=f'fragment-bench-employer-{i}@example.invalid',
+                user_type='employer', password='!',
+            )
+            EmployerProfile.objects.create(
+                user=user, company_name=f'Fragment Benchmark Co {i}',
+                company_profile_image=f'employer_documents/logos/fragment-bench-{i}.png',
+            )
+            users.append(user)
+        ids = [
+            Job.objects.create(
+                employer=users[i % employers], company_name=f'Fragment Benchmark Co {i % employers}',
+                title=f'Fragment Benchmark Job {i}', location='Cebu City', job_type=job_type,
+                description='Generated by benchmark_fragment_cache and rolled back when it finishes.',
+                min_salary=20000 + i * 500, max_salary=30000 + i * 500, expiration_date=expires,
+            ).pk
+            for i in range(results)
+        ]
+        # Loaded the way job_search loads a page
+        return list(
+            Job.objects.select_related('employer__employer_profile_rel', 'job_type')
+            .filter(pk__in=ids).order_by('-posted_at', '-id')
+        )
+
+    def compare(self, label, render, request, results, rounds):
+        cache = fragment_cache()
+        uncached = DummyCache('fragment-benchmark', {})
+        variants = ('uncached', 'cold', 'warm')
+        timings = {variant: [] for variant in variants}
+        render()  # compile templates
+        for i in range(rounds):
+            for variant in (variants if i % 2 else reversed(variants)):
+                request.__dict__.pop('_fragment_registry_version', None)
+                if variant == 'uncached':
+                    with mock.patch('jobs.templatetags.fragment_cache.fragment_cache', return_value=uncached):
+                        start = time.perf_counter()
+                        render()
+                        timings[variant].append(time.perf_counter() - start)
+                    continue
+                if variant == 'cold':
+                    cache.clear()
+                else:
+                    render()  # make sure every fragment is stored
+                    request.__dict__.pop('_fragment_registry_version', None)
+                start = time.perf_counter()
+                render()
+                timings[variant].append(time.perf_counter() - start)
+
+        self.stdout.write(f'{label}, {results} results, {rounds} renders each (ms):')
+        for variant, values in timings.items():
+            self.stdout.write(
+                f'  {variant:<9} mean {statistics.mean(values) * 1000:6.2f}  '
+                f'median {statistics.median(values) * 1000:6.2f}'
+            )
+        baseline = statistics.median(timings['uncached'])
+        warm = statistics.median(timings['warm'])
+        self.stdout.write(f'  warm saves {(baseline - warm) * 1000:.2f} ms ({(baseline - warm) / baseline:.0%})')
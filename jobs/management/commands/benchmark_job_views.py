@@ -0,0 +1,164 @@
+"""
+Measure what buffered view counting costs (see jobs/impressions.py).
+
+Jobs are generated inside a transaction that is rolled back at the end:
+    python manage.py benchmark_job_views
+    python manage.py benchmark_job_views --requests 2000 --jobs 500
+
+Reports:
+- job_detail latency with and without record_job_view(), alternating the
+  two so both see the same caches and database load,
+- the cost of one record_job_view() call,
+- how long a flush of --views buffered views takes and how many queries it
+  runs, next to one UPDATE per view,
+- the unique viewer estimate and stored sketch size for a few cardinalities.
+"""
+import random
+import statistics
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import F
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs import impressions
+from jobs.models import Job, JobDailyViews
+from utils.hyperloglog import HyperLogLog
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark buffered job view counting (generated rows are rolled back).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=200, help='Number of jobs to generate.')
+        parser.add_argument('--requests', type=int, default=500, help='job_detail requests per variant.')
+        parser.add_argument('--views', type=int, default=20000, help='Buffered views written by the flush benchmark.')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        # Start from an empty buffer and leave nothing behind for this process to flush
+        impressions._take_buffer()
+        try:
+            with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*'], JOB_VIEWS_FLUSH_INTERVAL=10 ** 9,
+                                                         JOB_VIEWS_MAX_PENDING=10 ** 9):
+                jobs = self.seed(options['jobs'])
+                self.latency(jobs, options['requests'])
+                self.record_cost(jobs)
+                self.flush_cost(jobs, options['views'])
+                self.sketch_accuracy()
+                raise _Rollback
+        except _Rollback:
+            pass
+        finally:
+            impressions._take_buffer()
+        self.stdout.write('Generated rows rolled back.')
+        self.stdout.write(self.style.SUCCESS('View counting benchmark finished.'))
+
+    def seed(self, total):
+        employer = get_user_model().objects.create(
+            username='views-bench-employer', email='views-bench-employer@example.invalid',
+            user_type='employer', password='!',
+        )
+        expires = timezone.localdate() + timedelta(days=30)
+        return [
+            Job.objects.create(
+                employer=employer, title=f'View Benchmark Job {i}', location='Cebu City',
+                description='Generated by benchmark_job_views and rolled back when it finishes.',
+                expiration_date=expires,
+            )
+            for i in range(total)
+        ]
+
+    def latency(self, jobs, requests):
+        client = Client()
+        urls = [reverse('jobs:job_detail', args=[job.pk]) for job in jobs]
+        timings = {'without counting': [], 'with counting': []}
+        # Warm up templates and caches
+        for url in urls[:10]:
+            client.get(url)
+
+        for i in range(requests):
+            url = self.random.choice(urls)
+            address = f'10.0.{i % 250}.{self.random.randint(1, 250)}'
+            for label in (timings if i % 2 else reversed(list(timings))):
+                patch = mock.patch('jobs.views.record_job_view') if label == 'without counting' else nullcontext()
+                with patch:
+                    start = time.perf_counter()
+                    response = client.get(url, REMOTE_ADDR=address)
+                    timings[label].append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+        self.stdout.write(f'job_detail over {requests} requests each (ms):')
+        for label, values in timings.items():
+            values.sort()
+            self.stdout.write(
+                f'  {label:<17} mean {statistics.mean(values) * 1000:6.2f}  '
+                f'p50 {values[len(values) // 2] * 1000:6.2f}  p95 {values[int(len(values) * 0.95)] * 1000:6.2f}'
+            )
+        overhead = statistics.median(timings['with counting']) - statistics.median(timings['without counting'])
+        self.stdout.write(f'  median overhead {overhead * 1000:+.3f} ms')
+        impressions._take_buffer()
+
+    def record_cost(self, jobs, calls=50000):
+        factory = RequestFactory()
+        request = factory.get('/', REMOTE_ADDR='10.1.2.3', HTTP_USER_AGENT='benchmark')
+        request.user = mock.Mock(is_authenticated=False)
+        start = time.perf_counter()
+        for i in range(calls):
+            impressions.record_job_view(request, jobs[i % len(jobs)])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'record_job_view: {elapsed / calls * 1e6:.1f} us per call')
+        impressions._take_buffer()
+
+    def flush_cost(self, jobs, views):
+        factory = RequestFactory()
+        for i in range(views):
+            request = factory.get('/', REMOTE_ADDR=f'10.2.{i // 250 % 250}.{i % 250}')
+            request.user = mock.Mock(is_authenticated=False)
+            impressions.record_job_view(request, self.random.choice(jobs))
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            written = impressions.flush_job_views()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'Flush of {written} views over {len(jobs)} jobs: {elapsed * 1000:.0f} ms, {len(queries)} queries'
+        )
+        stored = sum(Job.objects.filter(pk__in=[job.pk for job in jobs]).values_list('view_count', flat=True))
+        daily = sum(JobDailyViews.objects.filter(job__in=jobs).values_list('views', flat=True))
+        self.stdout.write(f'  stored view_count total {stored}, daily rows total {daily}')
+
+        sample = jobs[:min(len(jobs), 200)]
+        start = time.perf_counter()
+        for job in self.random.choices(sample, k=min(views, 2000)):
+            Job.objects.filter(pk=job.pk).update(view_count=F('view_count') + 1)
+        per_update = (time.perf_counter() - start) / min(views, 2000)
+        self.stdout.write(
+            f'  one UPDATE per view instead: {per_update * 1000:.2f} ms each, '
+            f'{per_update * views * 1000:.0f} ms for {views} views'
+        )
+
+    def sketch_accuracy(self):
+        self.stdout.write('Unique viewer estimates:')
+        for distinct in (10, 100, 1000, 10000, 100000):
+            sketch = HyperLogLog()
+            for i in range(distinct):
+                sketch.add(f'visitor:{self.random.random()}:{i}')
+            estimate = sketch.estimate()
+            self.stdout.write(
+                f'  {distinct:>7} distinct -> {estimate:>7} ({(estimate - distinct) / distinct:+.1%}), '
+                f'{len(sketch.to_bytes())} bytes stored'
+            )
@@ -0,0 +1,36 @@
+"""
+Rebuild the precomputed job recommendations shown on the applicant dashboard.
+
+Run nightly for a full rebuild and more often with --incremental:
+    python manage.py build_recommendations
+    python manage.py build_recommendations --incremental --workers 4
+"""
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import TOP_K, build_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Score applicants against active jobs and store each applicant\'s top matches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only rescore changed applicants and merge in jobs posted or edited since the last run.',
+        )
+        parser.add_argument('--top-k', type=int, default=TOP_K, help='Recommendations kept per applicant.')
+        parser.add_argument('--workers', type=int, default=1, help='Processes used to score query blocks.')
+        parser.add_argument('--block-size', type=int, default=500, help='Applicants scored per block.')
+
+    def handle(self, *args, **options):
+        stats = build_recommendations(
+            incremental=options['incremental'],
+            top_k=options['top_k'],
+            workers=options['workers'],
+            block_size=options['block_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {stats['jobs']} active job(s): rescored {stats['rescored']} applicant(s), "
+            f"merged new jobs for {stats['merged']}, stored {stats['rows']} recommendation(s)."
+        ))
@@ -0,0 +1,36 @@
+"""
+Rebuild the precomputed "similar jobs" neighbours shown on job detail pages.
+
+Run a full rebuild nightly and --incremental after jobs are posted or expire:
+    python manage.py build_similar_jobs
+    python manage.py build_similar_jobs --incremental
+"""
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import SIMILAR_JOBS_K, build_similar_jobs
+
+
+class Command(BaseCommand):
+    help = 'Compute the most similar active jobs for each active job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only rescore new, edited or stale jobs and merge new jobs into the other lists.',
+        )
+        parser.add_argument('--top-k', type=int, default=SIMILAR_JOBS_K, help='Neighbours kept per job.')
+        parser.add_argument('--workers', type=int, default=1, help='Processes used to score query blocks.')
+        parser.add_argument('--block-size', type=int, default=500, help='Jobs scored per block.')
+
+    def handle(self, *args, **options):
+        stats = build_similar_jobs(
+            incremental=options['incremental'],
+            top_k=options['top_k'],
+            workers=options['workers'],
+            block_size=options['block_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {stats['jobs']} active job(s): rescored {stats['rescored']}, "
+            f"merged new jobs into {stats['merged']}, updated {stats['updated']}."
+        ))
@@ -0,0 +1,45 @@
+"""
+Compute match scores for job applications (see jobs/matching.py).
+
+New applications are scored when they are submitted; use this to backfill
+older ones or to rescore after profiles or jobs change:
+    python manage.py score_applications
+    python manage.py score_applications --rescore --job 42
+"""
+from django.core.management.base import BaseCommand
+
+from jobs.matching import RELATED, score_applications
+from jobs.models import JobApplication
+
+
+class Command(BaseCommand):
+    help = 'Compute applicant-to-job match scores for job applications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, help='Only score applications for this job id.')
+        parser.add_argument(
+            '--rescore',
+            action='store_true',
+            help='Rescore applications that already have a score.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Applications scored per batch.')
+
+    def handle(self, *args, **options):
+        applications = JobApplication.objects.select_related(*RELATED).order_by('pk')
+        if options['job']:
+            applications = applications.filter(job_id=options['job'])
+        if not options['rescore']:
+            applications = applications.filter(match_score__isnull=True)
+
+        batch_size = options['batch_size']
+        scored = 0
+        last_pk = 0
+        while True:
+            # Keyset batches, so rows scored in an earlier batch never shift later ones
+            batch = list(applications.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            scored += score_applications(batch)
+            last_pk = batch[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f'Scored {scored} application(s).'))
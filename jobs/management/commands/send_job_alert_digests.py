@@ -0,0 +1,55 @@
+"""
+Email each applicant the new jobs matching their job alerts (see jobs/alerts.py).
+
+Run periodically (e.g. daily from cron); each run picks up where the last one
+stopped, and an interrupted run is resumed by the next invocation:
+    python manage.py send_job_alert_digests
+    python manage.py send_job_alert_digests --dry-run
+    python manage.py send_job_alert_digests --email-backend django.core.mail.backends.filebased.EmailBackend --email-file-path /tmp/digests
+"""
+from datetime import timedelta
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from jobs.alerts import send_job_alert_digests
+
+
+class Command(BaseCommand):
+    help = 'Send batched job-alert digest emails for jobs posted since the last run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Emails sent per connection.')
+        parser.add_argument('--dry-run', action='store_true', help='Build the emails but do not send or record them.')
+        parser.add_argument(
+            '--initial-lookback-hours',
+            type=int,
+            default=24,
+            help='Window of the very first run, when there is no previous high-water mark.',
+        )
+        parser.add_argument('--email-backend', help='Override EMAIL_BACKEND (e.g. the console or file-based backend).')
+        parser.add_argument('--email-file-path', help='Directory for the file-based email backend.')
+
+    def handle(self, *args, **options):
+        connection = None
+        if options['email_backend']:
+            backend_kwargs = {}
+            if options['email_file_path']:
+                backend_kwargs['file_path'] = options['email_file_path']
+            connection = get_connection(options['email_backend'], **backend_kwargs)
+
+        start = time.perf_counter()
+        stats = send_job_alert_digests(
+            chunk_size=options['chunk_size'],
+            connection=connection,
+            dry_run=options['dry_run'],
+            initial_lookback=timedelta(hours=options['initial_lookback_hours']),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Resumed' if stats['resumed'] else 'Ran'} digest for jobs posted "
+            f"{stats['window_start']:%Y-%m-%d %H:%M} - {stats['window_end']:%Y-%m-%d %H:%M}: "
+            f"{stats['new_jobs']} new job(s), {stats['alerts']} alert(s) checked, "
+            f"{stats['emails']} email(s){' (dry run)' if options['dry_run'] else ''} "
+            f"in {time.perf_counter() - start:.1f}s."
+        ))
@@ -0,0 +1,156 @@
+"""
+Applicant-to-job match scores for the employer applications board.
+
+Each JobApplication gets a 0-100 match_score from four parts:
+  - keyword coverage: how many of the job's top keywords (title, tags,
+    description) appear in the applicant's text (profile title, biography,
+    cover letter and the extracted text of the submitted resume),
+  - text similarity: cosine of the two term-frequency vectors,
+  - education: the applicant's level against the job's required level,
+  - experience: the applicant's years against the job's experience and
+    seniority requirements.
+
+Scores are computed in batches grouped by job, so each job's keywords and
+vector are built once per batch, and are written back with bulk_update().
+"""
+from collections import defaultdict
+
+from utils.text_vectors import cosine, term_counts, tfidf_vector, tokenize
+
+from .models import JobApplication
+from .recommendations import job_term_counts
+
+
+KEYWORD_COUNT = 20
+
+WEIGHTS = {
+    'keywords': 0.4,
+    'similarity': 0.2,
+    'education': 0.2,
+    'experience': 0.2,
+}
+
+# Ordinal rank of job EducationLevel codes and ApplicantProfile.education_level values
+EDUCATION_RANKS = {
+    'none': 0,
+    'high_school': 1,
+    'vocational': 2,
+    'associate': 2,
+    'bachelor': 3,
+    'master': 4,
+    'phd_doctorate': 5,
+    'doctorate': 5,
+}
+
+# Lower bound of each ApplicantProfile.experience choice, in years
+PROFILE_EXPERIENCE_YEARS = {'0-1': 0, '1-3': 1, '3-5': 3, '5-10': 5, '10+': 10}
+
+# Years of experience implied by a JobLevel code
+JOB_LEVEL_MIN_YEARS = {
+    'intern': 0,
+    'entry': 0,
+    'mid': 3,
+    'senior': 5,
+    'lead': 5,
+    'manager': 5,
+    'director': 10,
+    'executive': 10,
+}
+
+RELATED = (
+    'job__category', 'job__job_level', 'job__education', 'job__experience',
+    'applicant__applicant_profile_rel', 'resume',
+)
+
+
+def job_keywords(job, limit=KEYWORD_COUNT):
+    """The job's most frequent tokens, title and tags counted more heavily."""
+    counts = defaultdict(int)
+    for text, weight in ((job.title, 3), (job.tags, 2), (job.description, 1)):
+        for token in tokenize(text):
+            counts[token] += weight
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return {token for token, _ in ranked[:limit]}
+
+
+def applicant_text(application):
+    profile = getattr(application.applicant, 'applicant_profile_rel', None)
+    parts = [application.applicant_notes]
+    if profile is not None:
+        parts += [profile.title, profile.biography]
+    if application.resume_id:
+        parts.append(application.resume.extracted_text)
+    return '\n'.join(part for part in parts if part)
+
+
+def education_score(job, profile):
+    if not job.education_id or not EDUCATION_RANKS.get(job.education.code):
+        return 1.0
+    required = EDUCATION_RANKS[job.education.code]
+    have = EDUCATION_RANKS.get(getattr(profile, 'education_level', ''), 0)
+    if have >= required:
+        return 1.0
+    return 0.5 if have == required - 1 else 0.0
+
+
+def required_years(job):
+    years = 0
+    if job.experience_id and job.experience.min_years:
+        years = job.experience.min_years
+    if job.job_level_id:
+        years = max(years, JOB_LEVEL_MIN_YEARS.get(job.job_level.code, 0))
+    return years
+
+
+def experience_score(job, profile):
+    required = required_years(job)
+    if not required:
+        return 1.0
+    have = PROFILE_EXPERIENCE_YEARS.get(getattr(profile, 'experience', ''), 0)
+    return min(1.0, have / required)
+
+
+def compute_match_score(application, keywords, job_vector):
+    """0-100 score for one application, given its job's keywords and unit TF vector."""
+    job = application.job
+    profile = getattr(application.applicant, 'applicant_profile_rel', None)
+    text = applicant_text(application)
+
+    tokens = set(tokenize(text))
+    parts = {
+        'keywords': len(keywords & tokens) / len(keywords) if keywords else 0.0,
+        'similarity': cosine(job_vector, tfidf_vector(term_counts(texts=[(text, 1)]), {})),
+        'education': education_score(job, profile),
+        'experience': experience_score(job, profile),
+    }
+    return round(100 * sum(WEIGHTS[name] * value for name, value in parts.items()))
+
+
+def score_applications(applications):
+    """
+    Compute and save match_score for an iterable of applications.
+    Applications should be fetched with select_related(*RELATED). Returns the count saved.
+    """
+    by_job = defaultdict(list)
+    for application in applications:
+        by_job[application.job_id].append(application)
+
+    updated = []
+    for batch in by_job.values():
+        job = batch[0].job
+        keywords = job_keywords(job)
+        # Plain term frequencies (no IDF) so a score does not depend on the batch it was computed in
+        job_vector = tfidf_vector(job_term_counts(job), {})
+        for application in batch:
+            application.match_score = compute_match_score(application, keywords, job_vector)
+            updated.append(application)
+
+    JobApplication.objects.bulk_update(updated, ['match_score'], batch_size=500)
+    return len(updated)
+
+
+def score_application(application):
+    """Score a single, freshly created application."""
+    application = JobApplication.objects.select_related(*RELATED).get(pk=application.pk)
+    score_applications([application])
+    return application.match_score
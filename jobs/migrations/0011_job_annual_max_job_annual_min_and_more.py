@@ -0,0 +1,58 @@
+# Generated by Django 4.2.25 on 2026-10-19 09:12
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+# Frozen copy of jobs.models.SALARY_PERIODS_PER_YEAR at the time of this migration
+SALARY_PERIODS_PER_YEAR = {
+    'hourly': 2080,
+    'daily': 260,
+    'weekly': 52,
+    'monthly': 12,
+    'annually': 1,
+}
+
+
+def backfill_annual_salaries(apps, schema_editor):
+    """Populate annual_min/annual_max for existing jobs, one UPDATE per salary type."""
+    Job = apps.get_model('jobs', 'Job')
+
+    low = Coalesce('min_salary', 'max_salary')
+    high = Coalesce('max_salary', 'min_salary')
+
+    Job.objects.filter(salary_type__isnull=True).update(annual_min=low, annual_max=high)
+    for code, multiplier in SALARY_PERIODS_PER_YEAR.items():
+        Job.objects.filter(salary_type__code=code).update(
+            annual_min=low * multiplier,
+            annual_max=high * multiplier,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_jobapplication_resume'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='annual_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Maximum salary per year (falls back to the minimum when no maximum is set)', max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='annual_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Minimum salary per year (falls back to the maximum when no minimum is set)', max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'annual_min'], name='jobs_job_status_c5ef40_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', '-annual_max'], name='jobs_job_status_3f7a1d_idx'),
+        ),
+        migrations.RunPython(backfill_annual_salaries, migrations.RunPython.noop),
+    ]
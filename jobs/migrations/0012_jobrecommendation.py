@@ -0,0 +1,35 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0011_job_annual_max_job_annual_min_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Cosine similarity between the applicant profile and the job (0-1)')),
+                ('rank', models.PositiveSmallIntegerField(help_text="Position in the applicant's list (1 = best match)")),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When this recommendation was scored')),
+                ('applicant', models.ForeignKey(limit_choices_to={'user_type': 'applicant'}, on_delete=django.db.models.deletion.CASCADE, related_name='job_recommendations', to=settings.AUTH_USER_MODEL)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Job Recommendation',
+                'verbose_name_plural': 'Job Recommendations',
+                'ordering': ['applicant', 'rank'],
+                'indexes': [models.Index(fields=['applicant', 'rank'], name='jobs_jobrec_applica_0e195c_idx'), models.Index(fields=['-computed_at'], name='jobs_jobrec_compute_399075_idx')],
+                'unique_together': {('applicant', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_jobrecommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='similar_jobs',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Most similar active jobs as [job_id, cosine score] pairs'),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='similar_jobs_computed_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When similar_jobs was last computed', null=True),
+        ),
+    ]
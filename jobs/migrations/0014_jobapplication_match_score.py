@@ -0,0 +1,22 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_job_similar_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='match_score',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='How well the applicant matches the job (0-100), see jobs/matching.py', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-match_score'], name='jobs_jobapp_job_id_44c24c_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_jobapplication_match_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAlertDigestRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_start', models.DateTimeField(help_text='Jobs posted after this time are included')),
+                ('window_end', models.DateTimeField(help_text='High-water mark: jobs posted up to this time are included')),
+                ('last_user_id', models.BigIntegerField(default=0, help_text='Users up to this id have been processed')),
+                ('alerts_checked', models.PositiveIntegerField(default=0)),
+                ('emails_sent', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Job Alert Digest Run',
+                'verbose_name_plural': 'Job Alert Digest Runs',
+                'ordering': ['-window_end'],
+            },
+        ),
+    ]
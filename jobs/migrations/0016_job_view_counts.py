@@ -0,0 +1,35 @@
+# Generated by Django 4.2.25 on 2026-10-19 01:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_jobalertdigestrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text="Times the job detail page was viewed (excluding the employer's own views)"),
+        ),
+        migrations.CreateModel(
+            name='JobDailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('viewers', models.BinaryField(default=bytes, help_text="HyperLogLog sketch of the day's distinct visitors")),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Job Daily Views',
+                'verbose_name_plural': 'Job Daily Views',
+                'ordering': ['job', '-date'],
+                'unique_together': {('job', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.25 on 2026-10-19 01:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0016_job_view_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStageTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_stage_name', models.CharField(blank=True, max_length=100)),
+                ('to_stage_name', models.CharField(blank=True, max_length=100)),
+                ('hired', models.BooleanField(default=False, help_text='The move hired the applicant')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Application Stage Transition',
+                'verbose_name_plural': 'Application Stage Transitions',
+                'ordering': ['application', 'created_at', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobFunnelSummary',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='funnel_summary', serialize=False, to='jobs.job')),
+                ('signature', models.CharField(max_length=64)),
+                ('data', models.JSONField(default=dict)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Job Funnel Summary',
+                'verbose_name_plural': 'Job Funnel Summaries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['employer', '-posted_at'], name='jobs_job_employe_59242e_idx'),
+        ),
+        migrations.AddField(
+            model_name='applicationstagetransition',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_transitions', to='jobs.jobapplication'),
+        ),
+        migrations.AddField(
+            model_name='applicationstagetransition',
+            name='from_stage',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jobs.applicationstage'),
+        ),
+        migrations.AddField(
+            model_name='applicationstagetransition',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_transitions', to='jobs.job'),
+        ),
+        migrations.AddField(
+            model_name='applicationstagetransition',
+            name='moved_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='applicationstagetransition',
+            name='to_stage',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jobs.applicationstage'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationstagetransition',
+            index=models.Index(fields=['job', 'application', 'created_at'], name='jobs_applic_job_id_4975b7_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.25 on 2026-10-19 02:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_stage_transitions_funnel'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_status_3f7a1d_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(models.F('status'), models.OrderBy(models.F('annual_max'), descending=True, nulls_last=True), name='jobs_job_status_annual_max_idx'),
+        ),
+    ]
@@ -4,7 +4,8 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.utils.text import slugify
 from datetime import date
-from utils.managers import JobManager
+from decimal import Decimal
+from utils.managers import ApplicationStageTransitionManager, JobManager, open_jobs_q
 
 
 class JobCategory(models.Model):
@@ -128,6 +129,37 @@ class SalaryType(models.Model):
     
     def __str__(self):
         return self.name
+
+
+# Number of pay periods per year for each SalaryType code. Codes missing from
+# this map (e.g. 'fixed_fee') cannot be annualized and are left out of
+# salary filters and sorts.
+SALARY_PERIODS_PER_YEAR = {
+    'hourly': 2080,
+    'daily': 260,
+    'weekly': 52,
+    'monthly': 12,
+    'annually': 1,
+}
+
+
+def annualize_salary(amount, salary_type_code=None):
+    """
+    Convert a salary amount to its yearly equivalent.
+    Jobs without a salary type are assumed to already be annual amounts.
+    Returns None when the amount is missing or the type has no yearly equivalent.
+    """
+    if amount is None:
+        return None
+    if salary_type_code is None:
+        multiplier = 1
+    else:
+        multiplier = SALARY_PERIODS_PER_YEAR.get(salary_type_code)
+        if multiplier is None:
+            return None
+    return (Decimal(amount) * multiplier).quantize(Decimal('0.01'))
+
+
 # ============================================================================
 # JOB MODEL
 # ============================================================================
@@ -192,6 +224,26 @@ class Job(models.Model):
         blank=True,
         help_text="Salary payment frequency"
     )
+
+    # Denormalized yearly salary bounds derived from min/max_salary and
+    # salary_type, so salary filters and sorts can use a plain indexed column.
+    # Maintained by save() and JobQuerySet.update_annual_salaries().
+    annual_min = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Minimum salary per year (falls back to the maximum when no minimum is set)"
+    )
+    annual_max = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Maximum salary per year (falls back to the minimum when no maximum is set)"
+    )
     
     # Advanced information - All Foreign Keys (nullable during migration)
     education = models.ForeignKey(
@@ -240,6 +292,28 @@ class Job(models.Model):
     # Note: JOB_CATEGORIES constant removed, values stored in JobCategory table
     tags = models.CharField(max_length=255, blank=True, help_text="Legacy tags field, replaced by Many-to-Many Tag relationship")
     
+    # Precomputed nearest neighbours for the "Similar jobs" panel, stored as
+    # [[job_id, score], ...] best first. Maintained by `manage.py build_similar_jobs`.
+    similar_jobs = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        help_text="Most similar active jobs as [job_id, cosine score] pairs"
+    )
+    similar_jobs_computed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="When similar_jobs was last computed"
+    )
+
+    # Buffered in each web process and added in batches by jobs/impressions.py
+    view_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Times the job detail page was viewed (excluding the employer's own views)"
+    )
+
     # Status and metadata
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
     posted_at = models.DateTimeField(auto_now_add=True)
@@ -253,6 +327,13 @@ class Job(models.Model):
         indexes = [
             models.Index(fields=['-posted_at']),
             models.Index(fields=['employer', 'status']),
+            models.Index(fields=['employer', '-posted_at']),
+            models.Index(fields=['status', 'annual_min']),
+            # DESC NULLS LAST, as JobQuerySet.order_by_salary() sorts it
+            models.Index(
+                'status', models.F('annual_max').desc(nulls_last=True),
+                name='jobs_job_status_annual_max_idx',
+            ),
         ]
 
     def clean(self):
@@ -292,6 +373,16 @@ class Job(models.Model):
         if errors:
             raise ValidationError(errors)
 
+    def get_similar_jobs(self, limit=10):
+        """Open jobs from the precomputed similar_jobs list, best first, in one id__in query."""
+        ids = [job_id for job_id, _ in self.similar_jobs[:limit]]
+        if not ids:
+            return []
+        jobs = Job.objects.filter(open_jobs_q()).select_related(
+            'employer__employer_profile_rel', 'job_type'
+        ).in_bulk(ids)
+        return [jobs[job_id] for job_id in ids if job_id in jobs]
+
     def save(self, *args, **kwargs):
         # Update status based on expiration date
         if self.expiration_date and self.expiration_date < date.today():
@@ -317,12 +408,22 @@ class Job(models.Model):
             if company:
                 self.company_name = company
 
+        self.compute_annual_salary()
+
         self.full_clean()
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} - {self.company_name}"
     
+    def compute_annual_salary(self):
+        """Refresh annual_min/annual_max from the raw salary fields."""
+        salary_type_code = self.salary_type.code if self.salary_type_id else None
+        low = self.min_salary if self.min_salary is not None else self.max_salary
+        high = self.max_salary if self.max_salary is not None else self.min_salary
+        self.annual_min = annualize_salary(low, salary_type_code)
+        self.annual_max = annualize_salary(high, salary_type_code)
+
     @property
     def is_active(self):
         return self.status == 'active' and self.expiration_date >= date.today()
@@ -448,6 +549,12 @@ class JobApplication(models.Model):
         blank=True,
         help_text="Date when status changed to 'hired'"
     )
+    match_score = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="How well the applicant matches the job (0-100), see jobs/matching.py"
+    )
     
     class Meta:
         unique_together = ['applicant', 'job']
@@ -456,6 +563,7 @@ class JobApplication(models.Model):
             models.Index(fields=['applicant', 'status']),
             models.Index(fields=['job', 'status']),
             models.Index(fields=['-application_date']),
+            models.Index(fields=['job', '-match_score']),
         ]
     
     def save(self, *args, **kwargs):
@@ -574,11 +682,14 @@ class JobAlert(models.Model):
         return f"{self.user.email} - {self.alert_name}"
     
     def get_matching_jobs(self):
-        """Returns queryset of active jobs matching this alert's criteria."""
+        """
+        Returns queryset of active jobs matching this alert's criteria.
+        jobs/alerts.py applies the same rules in Python for digest emails.
+        """
         from django.db.models import Q
         
         # Start with all active jobs
-        jobs = Job.objects.filter(status='active', is_deleted=False)
+        jobs = Job.objects.filter(status='active')
         
         # Filter by job title if specified
         if self.job_title:
@@ -596,15 +707,15 @@ class JobAlert(models.Model):
         if self.job_category:
             jobs = jobs.filter(category=self.job_category)
         
-        # Filter by salary range if specified
+        # Filter by salary range if specified (alert amounts are yearly)
         if self.min_salary:
             jobs = jobs.filter(
-                Q(min_salary__gte=self.min_salary) | Q(min_salary__isnull=True)
+                Q(annual_min__gte=self.min_salary) | Q(annual_min__isnull=True)
             )
         
         if self.max_salary:
             jobs = jobs.filter(
-                Q(max_salary__lte=self.max_salary) | Q(max_salary__isnull=True)
+                Q(annual_max__lte=self.max_salary) | Q(annual_max__isnull=True)
             )
         
         # Filter by keywords if specified
@@ -615,4 +726,181 @@ class JobAlert(models.Model):
                 keyword_query |= Q(title__icontains=keyword) | Q(description__icontains=keyword)
             jobs = jobs.filter(keyword_query)
         
-        return jobs.distinct().order_by('-posted_date')
+        return jobs.distinct().order_by('-posted_at')
+
+
+class JobAlertDigestRun(models.Model):
+    """
+    One run of the job-alert digest emails (see jobs/alerts.py).
+
+    Each run covers jobs posted in (window_start, window_end]; the next run
+    starts from this run's window_end (the high-water mark). `last_user_id`
+    records how far the run got, so an interrupted run resumes without
+    emailing anyone twice.
+    """
+    window_start = models.DateTimeField(help_text="Jobs posted after this time are included")
+    window_end = models.DateTimeField(help_text="High-water mark: jobs posted up to this time are included")
+    last_user_id = models.BigIntegerField(
+        default=0,
+        help_text="Users up to this id have been processed"
+    )
+    alerts_checked = models.PositiveIntegerField(default=0)
+    emails_sent = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-window_end']
+        verbose_name = "Job Alert Digest Run"
+        verbose_name_plural = "Job Alert Digest Runs"
+
+    def __str__(self):
+        return f"Digest {self.window_start:%Y-%m-%d %H:%M} - {self.window_end:%Y-%m-%d %H:%M}"
+
+
+class JobRecommendation(models.Model):
+    """
+    Precomputed job recommendation for an applicant.
+    Rows are rebuilt in batch by `manage.py build_recommendations` (see jobs/recommendations.py).
+    """
+    applicant = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='job_recommendations',
+        limit_choices_to={'user_type': 'applicant'}
+    )
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='recommendations'
+    )
+    score = models.FloatField(help_text="Cosine similarity between the applicant profile and the job (0-1)")
+    rank = models.PositiveSmallIntegerField(help_text="Position in the applicant's list (1 = best match)")
+    computed_at = models.DateTimeField(default=timezone.now, help_text="When this recommendation was scored")
+
+    class Meta:
+        unique_together = ['applicant', 'job']
+        ordering = ['applicant', 'rank']
+        indexes = [
+            models.Index(fields=['applicant', 'rank']),
+            models.Index(fields=['-computed_at']),
+        ]
+        verbose_name = "Job Recommendation"
+        verbose_name_plural = "Job Recommendations"
+
+    def __str__(self):
+        return f"{self.applicant.email} - {self.job.title} ({self.score:.2f})"
+
+
+class JobDailyViews(models.Model):
+    """
+    Views of a job's detail page on one day, written in batches by
+    jobs/impressions.py. `viewers` is a HyperLogLog sketch of the distinct
+    visitors (utils/hyperloglog.py); sketches of several days merge into the
+    unique viewers over that range.
+    """
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='daily_views'
+    )
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    viewers = models.BinaryField(default=bytes, help_text="HyperLogLog sketch of the day's distinct visitors")
+
+    class Meta:
+        unique_together = ['job', 'date']
+        ordering = ['job', '-date']
+        verbose_name = "Job Daily Views"
+        verbose_name_plural = "Job Daily Views"
+
+    def __str__(self):
+        return f"{self.job_id} on {self.date}: {self.views} views"
+
+
+class ApplicationStageTransition(models.Model):
+    """
+    Append-only log of applications moving between pipeline stages, written
+    by the board's drag-and-drop and by hiring (see
+    ApplicationStageTransitionManager.record). A null stage is the default
+    "All Applications" column. Stage names are copied so the history survives
+    a stage being renamed or deleted. Feeds the hiring funnel (jobs/funnel.py).
+    """
+    application = models.ForeignKey(
+        JobApplication,
+        on_delete=models.CASCADE,
+        related_name='stage_transitions'
+    )
+    # Denormalized from the application so a job's history is read without a join
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='stage_transitions'
+    )
+    from_stage = models.ForeignKey(
+        ApplicationStage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    to_stage = models.ForeignKey(
+        ApplicationStage,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    from_stage_name = models.CharField(max_length=100, blank=True)
+    to_stage_name = models.CharField(max_length=100, blank=True)
+    hired = models.BooleanField(default=False, help_text="The move hired the applicant")
+    moved_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    objects = ApplicationStageTransitionManager()
+
+    class Meta:
+        ordering = ['application', 'created_at', 'id']
+        indexes = [
+            models.Index(fields=['job', 'application', 'created_at']),
+        ]
+        verbose_name = "Application Stage Transition"
+        verbose_name_plural = "Application Stage Transitions"
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_stage_name or 'All Applications'} -> {self.to_stage_name or 'All Applications'}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Stage transitions are append-only.")
+        super().save(*args, **kwargs)
+
+
+class JobFunnelSummary(models.Model):
+    """
+    Cached hiring funnel of one job (jobs/funnel.py). `signature` records the
+    application count and last stage transition it was computed from; the
+    summary is recomputed when either has changed.
+    """
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='funnel_summary'
+    )
+    signature = models.CharField(max_length=64)
+    data = models.JSONField(default=dict)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "Job Funnel Summary"
+        verbose_name_plural = "Job Funnel Summaries"
+
+    def __str__(self):
+        return f"Funnel of job {self.job_id}"
@@ -0,0 +1,328 @@
+"""
+Content-based job recommendations and similar-job neighbours.
+
+Active jobs and applicant profiles are turned into hashed TF-IDF vectors
+(utils.text_vectors). Each applicant's top-K jobs by cosine similarity are
+stored in JobRecommendation, so the dashboard reads them with one indexed query
+and never scores anything per request.
+
+A full run rescores every applicant against every active job. An incremental
+run only rescores applicants whose profile or history changed since the last
+run, and scores jobs posted or edited since then against everyone else, merging
+them into the stored lists. IDF weights are recomputed from the current active
+jobs on every run, so scores from older runs drift slightly until the next full
+rebuild.
+
+Similar jobs use the same job vectors: each active job's nearest neighbours are
+stored on Job.similar_jobs by build_similar_jobs(), so job detail pages only
+load the neighbour rows.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from utils.managers import open_jobs_q
+from utils.text_vectors import SparseIndex, blocked_top_k, idf_weights, term_counts, tfidf_vector
+
+from .models import FavoriteJob, Job, JobApplication, JobRecommendation
+
+
+TOP_K = 20
+
+SIMILAR_JOBS_K = 10
+
+# Number of recent applications/favorites whose jobs feed an applicant's profile vector
+HISTORY_LIMIT = 20
+
+# ApplicantProfile choice values mapped onto the job lookup-table codes
+PROFILE_EDUCATION_CODES = {'doctorate': 'phd_doctorate'}
+PROFILE_EXPERIENCE_CODES = {
+    '0-1': 'entry',
+    '1-3': 'entry',
+    '3-5': 'mid',
+    '5-10': 'senior',
+    '10+': 'expert',
+}
+
+
+def job_features(job):
+    """Categorical features shared by job and applicant vectors."""
+    features = []
+    if job.category_id:
+        features.append((f'category:{job.category.code}', 3))
+    if job.job_level_id:
+        features.append((f'level:{job.job_level.code}', 2))
+    if job.education_id:
+        features.append((f'education:{job.education.code}', 1))
+    if job.experience_id:
+        features.append((f'experience:{job.experience.code}', 1))
+    return features
+
+
+def job_term_counts(job):
+    return term_counts(
+        texts=[
+            (job.title, 3),
+            (job.tags, 2),
+            (job.description, 1),
+            (job.responsibilities, 1),
+        ],
+        features=job_features(job),
+    )
+
+
+def applicant_term_counts(profile, history_jobs=()):
+    """Term counts for an applicant from their profile plus applied/favorited jobs."""
+    texts = []
+    features = []
+    if profile is not None:
+        texts += [(profile.title, 3), (profile.biography, 1)]
+        if profile.education_level:
+            code = PROFILE_EDUCATION_CODES.get(profile.education_level, profile.education_level)
+            features.append((f'education:{code}', 1))
+        if profile.experience in PROFILE_EXPERIENCE_CODES:
+            features.append((f'experience:{PROFILE_EXPERIENCE_CODES[profile.experience]}', 1))
+    for job in history_jobs:
+        texts.append((job.title, 1))
+        features += [(token, 1) for token, _ in job_features(job)]
+    return term_counts(texts=texts, features=features)
+
+
+def active_jobs():
+    return Job.objects.filter(open_jobs_q()).select_related(
+        'category', 'job_level', 'education', 'experience'
+    )
+
+
+def build_job_vectors(jobs):
+    """Return ({job_id: vector}, idf, default_idf) for an iterable of jobs."""
+    counts = {job.id: job_term_counts(job) for job in jobs}
+    idf, default_idf = idf_weights(counts.values())
+    vectors = {job_id: tfidf_vector(c, idf, default_idf) for job_id, c in counts.items()}
+    return vectors, idf, default_idf
+
+
+def load_applicant_histories(applicant_ids):
+    """
+    Return ({applicant_id: [recent jobs]}, {applicant_id: {job ids to exclude}}).
+    Jobs an applicant already applied to or favorited are never recommended.
+    """
+    histories = {pk: [] for pk in applicant_ids}
+    seen = {pk: set() for pk in applicant_ids}
+    related = ('job__category', 'job__job_level', 'job__education', 'job__experience')
+
+    applications = JobApplication.objects.filter(
+        applicant_id__in=applicant_ids
+    ).select_related(*related).order_by('applicant_id', '-application_date')
+    favorites = FavoriteJob.objects.filter(
+        applicant_id__in=applicant_ids
+    ).select_related(*related).order_by('applicant_id', '-created_at')
+
+    for row in list(applications) + list(favorites):
+        if row.job_id in seen[row.applicant_id]:
+            continue
+        seen[row.applicant_id].add(row.job_id)
+        if len(histories[row.applicant_id]) < HISTORY_LIMIT:
+            histories[row.applicant_id].append(row.job)
+    return histories, seen
+
+
+def applicant_queries(applicants, idf, default_idf):
+    """Yield (applicant_id, vector, excluded job ids) for blocked_top_k()."""
+    applicants = list(applicants)
+    histories, seen = load_applicant_histories([user.id for user in applicants])
+    for user in applicants:
+        profile = getattr(user, 'applicant_profile_rel', None)
+        counts = applicant_term_counts(profile, histories[user.id])
+        vector = tfidf_vector(counts, idf, default_idf)
+        if vector:
+            yield user.id, vector, seen[user.id]
+
+
+def save_recommendations(results, computed_at):
+    """Replace the stored lists of the applicants in `results` ({applicant_id: [(job_id, score)]})."""
+    rows = [
+        JobRecommendation(
+            applicant_id=applicant_id,
+            job_id=job_id,
+            score=round(score, 6),
+            rank=rank,
+            computed_at=computed_at,
+        )
+        for applicant_id, matches in results.items()
+        for rank, (job_id, score) in enumerate(matches, start=1)
+    ]
+    with transaction.atomic():
+        JobRecommendation.objects.filter(applicant_id__in=list(results)).delete()
+        JobRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def build_recommendations(incremental=False, top_k=TOP_K, workers=1, block_size=500, chunk_size=2000):
+    """
+    Recompute stored recommendations. Returns a dict of counts for reporting.
+
+    Applicants are processed `chunk_size` at a time so memory stays bounded; within
+    a chunk, queries are scored in blocks of `block_size`, optionally in a pool of
+    `workers` processes.
+    """
+    User = get_user_model()
+    started_at = timezone.now()
+    last_run = None
+    if incremental:
+        last_run = JobRecommendation.objects.aggregate(last=Max('computed_at'))['last']
+
+    job_vectors, idf, default_idf = build_job_vectors(active_jobs())
+    full_index = SparseIndex(job_vectors)
+
+    applicants = User.objects.filter(
+        user_type='applicant', is_active=True
+    ).select_related('applicant_profile_rel').order_by('pk')
+
+    new_index = None
+    new_job_ids = set()
+    if last_run is None:
+        changed = applicants
+        unchanged = applicants.none()
+    else:
+        changed_filter = (
+            Q(applicant_profile_rel__updated_at__gt=last_run) |
+            Q(job_applications__application_date__gt=last_run) |
+            Q(favorite_jobs__created_at__gt=last_run) |
+            Q(job_recommendations__isnull=True)
+        )
+        changed_ids = applicants.filter(changed_filter).values('pk')
+        changed = applicants.filter(pk__in=changed_ids)
+        unchanged = applicants.exclude(pk__in=changed_ids)
+
+        new_job_ids = set(
+            Job.objects.filter(status='active', updated_at__gt=last_run).values_list('id', flat=True)
+        ) & set(job_vectors)
+        new_index = SparseIndex({pk: job_vectors[pk] for pk in new_job_ids})
+
+    stats = {'rescored': 0, 'merged': 0, 'rows': 0, 'jobs': len(job_vectors)}
+
+    # Changed (or all) applicants: score against every active job
+    for chunk in _chunked(changed.iterator(chunk_size=chunk_size), chunk_size):
+        results = {user.id: [] for user in chunk}
+        queries = applicant_queries(chunk, idf, default_idf)
+        for applicant_id, matches in blocked_top_k(full_index, queries, top_k, block_size, workers):
+            results[applicant_id] = matches
+        stats['rescored'] += len(results)
+        stats['rows'] += save_recommendations(results, started_at)
+
+    # Everyone else: score only new/edited jobs and merge into the stored lists
+    if new_job_ids:
+        for chunk in _chunked(unchanged.iterator(chunk_size=chunk_size), chunk_size):
+            queries = applicant_queries(chunk, idf, default_idf)
+            new_matches = dict(blocked_top_k(new_index, queries, top_k, block_size, workers))
+            results = _merge_new_matches(new_matches, new_job_ids, job_vectors, top_k)
+            stats['merged'] += len(results)
+            stats['rows'] += save_recommendations(results, started_at)
+
+    return stats
+
+
+def _merge_new_matches(new_matches, new_job_ids, job_vectors, top_k):
+    """
+    Merge freshly scored jobs into the stored top-K lists of the given applicants.
+    Stored rows for inactive or re-scored jobs are dropped.
+    """
+    stored = {}
+    stale = set()
+    for rec in JobRecommendation.objects.filter(applicant_id__in=list(new_matches)).only(
+        'applicant_id', 'job_id', 'score'
+    ):
+        if rec.job_id in job_vectors and rec.job_id not in new_job_ids:
+            stored.setdefault(rec.applicant_id, []).append((rec.job_id, rec.score))
+        else:
+            stale.add(rec.applicant_id)
+
+    results = {}
+    for applicant_id, matches in new_matches.items():
+        if not matches and applicant_id not in stale:
+            continue
+        merged = stored.get(applicant_id, []) + matches
+        merged.sort(key=lambda item: (item[1], item[0]), reverse=True)
+        results[applicant_id] = merged[:top_k]
+    return results
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def get_recommended_jobs(user, limit=6):
+    """Stored recommendations for `user` that still point at open jobs, best first."""
+    return JobRecommendation.objects.filter(
+        open_jobs_q('job__'), applicant=user
+    ).select_related(
+        'job', 'job__employer__employer_profile_rel', 'job__job_type'
+    ).order_by('rank')[:limit]
+
+
+def build_similar_jobs(incremental=False, top_k=SIMILAR_JOBS_K, workers=1, block_size=500):
+    """
+    Recompute Job.similar_jobs for active jobs. Returns a dict of counts for reporting.
+
+    Incremental runs rescore jobs that are new or edited since their last
+    computation, or whose stored neighbours include jobs that are no longer
+    active; every other job only scores the new/edited jobs and merges them into
+    its stored list.
+    """
+    started_at = timezone.now()
+    jobs = list(active_jobs())
+    job_vectors, _, _ = build_job_vectors(jobs)
+    index = SparseIndex(job_vectors)
+
+    if incremental:
+        fresh = {
+            job.id for job in jobs
+            if job.similar_jobs_computed_at is None or job.updated_at > job.similar_jobs_computed_at
+        }
+        stale = {
+            job.id for job in jobs
+            if any(job_id not in job_vectors for job_id, _ in job.similar_jobs)
+        }
+        rescore = fresh | stale
+    else:
+        fresh = set()
+        rescore = set(job_vectors)
+
+    queries = ((job.id, job_vectors[job.id], {job.id}) for job in jobs if job.id in rescore)
+    results = dict(blocked_top_k(index, queries, top_k, block_size, workers))
+
+    merged = {}
+    if fresh:
+        fresh_index = SparseIndex({job_id: job_vectors[job_id] for job_id in fresh})
+        queries = ((job.id, job_vectors[job.id], {job.id}) for job in jobs if job.id not in rescore)
+        for job_id, matches in blocked_top_k(fresh_index, queries, top_k, block_size, workers):
+            if matches:
+                merged[job_id] = matches
+
+    updated = []
+    for job in jobs:
+        if job.id in rescore:
+            neighbours = results.get(job.id, [])
+        elif job.id in merged:
+            neighbours = [
+                (job_id, score) for job_id, score in job.similar_jobs if job_id not in fresh
+            ] + merged[job.id]
+            neighbours.sort(key=lambda item: (item[1], item[0]), reverse=True)
+        else:
+            continue
+        job.similar_jobs = [[job_id, round(score, 6)] for job_id, score in neighbours[:top_k]]
+        job.similar_jobs_computed_at = started_at
+        updated.append(job)
+
+    # bulk_update() leaves updated_at alone, so this does not mark jobs as edited
+    Job.objects.bulk_update(updated, ['similar_jobs', 'similar_jobs_computed_at'], batch_size=500)
+    return {'jobs': len(jobs), 'rescored': len(rescore), 'merged': len(merged), 'updated': len(updated)}
@@ -0,0 +1,14 @@
+"""
+Background tasks for jobs (run by `manage.py run_worker`, see taskqueue).
+"""
+from taskqueue.queue import task
+
+
+@task()
+def score_new_application(application_id):
+    from .matching import score_application
+    from .models import JobApplication
+
+    application = JobApplication.objects.filter(pk=application_id).first()
+    if application is not None:
+        score_application(application)
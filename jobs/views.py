@@ -6,9 +6,22 @@ from django.urls import reverse
 from utils.mixins import applicant_required, employer_required
 from .models import Job, FavoriteJob
 from .forms import JobSearchForm
-from django.db.models import Q, Value, DecimalField
-from notifications.utils import notify_application_received
-from django.db.models.functions import Coalesce
+from .impressions import record_job_view, unique_viewers
+from django.db.models import Q
+from utils.pagination import KeysetPaginator, bounded_count
+
+# Public job search: results per page, and the point past which the total is
+# shown as "N+" instead of being counted exactly.
+JOB_SEARCH_PAGE_SIZE = 20
+JOB_SEARCH_COUNT_LIMIT = 1000
+
+# sort param -> (keyset sort field, descending)
+JOB_SEARCH_SORTS = {
+    'recent': ('posted_at', True),
+    'salary_low': ('annual_min', False),
+    'salary_high': ('annual_max', True),
+}
+
 
 def job_search(request):
     from decimal import Decimal, InvalidOperation
@@ -36,15 +49,9 @@ def job_search(request):
     from django.utils import timezone
     today = timezone.localdate()
 
-    # Start with active jobs with optimized queries
+    # Start with active jobs; only join what the results rows display (company logo)
     jobs = Job.objects.select_related(
-        'employer',
-        'category',
-        'job_type',
-        'education',
-        'experience',
-        'job_level',
-        'salary_type'
+        'employer__employer_profile_rel',
     ).filter(
         status='active',
         expiration_date__gte=today,
@@ -81,12 +88,12 @@ def job_search(request):
     if job_levels:
         jobs = jobs.filter(job_level_id__in=job_levels)
 
-    # 💰 Salary filter (use actual model fields min_salary / max_salary,
-    # parse to Decimal safely)
+    # 💰 Salary filter (yearly amounts, compared against the precomputed
+    # annual_min / annual_max columns; parse to Decimal safely)
+    salary_min_val = salary_max_val = None
     if salary_min_raw:
         try:
             salary_min_val = Decimal(salary_min_raw)
-            jobs = jobs.filter(min_salary__gte=salary_min_val)
         except (InvalidOperation, ValueError):
             # ignore invalid numeric input
             pass
@@ -94,10 +101,11 @@ def job_search(request):
     if salary_max_raw:
         try:
             salary_max_val = Decimal(salary_max_raw)
-            jobs = jobs.filter(max_salary__lte=salary_max_val)
         except (InvalidOperation, ValueError):
             pass
 
+    jobs = jobs.filter_by_salary_range(salary_min_val, salary_max_val)
+
     # DYNAMIC FILTER VALUES (from lookup tables)
     all_job_types = EmploymentType.objects.filter(is_active=True)
     all_categories = JobCategory.objects.filter(is_active=True)
@@ -106,30 +114,36 @@ def job_search(request):
     all_job_levels = JobLevel.objects.filter(is_active=True)
     all_locations = Job.objects.values_list("location", flat=True).distinct()
 
-    # Get favorited job IDs for logged-in applicants
+    # --- Sorting + keyset pagination ---
+    # sorts: 'recent' (default), 'salary_low', 'salary_high'. Each page is fetched
+    # by seeking past the previous page's last (sort key, id) instead of OFFSET,
+    # so response time stays flat however deep the user browses.
+    sort_field, descending = JOB_SEARCH_SORTS.get(sort, JOB_SEARCH_SORTS['recent'])
+    paginator = KeysetPaginator(jobs, JOB_SEARCH_PAGE_SIZE, sort_field=sort_field, descending=descending)
+    page = paginator.page(request.GET.get("cursor"))
+    total_count, count_capped = bounded_count(jobs, JOB_SEARCH_COUNT_LIMIT)
+
+    # Get favorited job IDs (for the jobs on this page) for logged-in applicants
     favorited_job_ids = []
     if request.user.is_authenticated and getattr(request.user, "user_type", "") == 'applicant':
         favorited_job_ids = list(
-            FavoriteJob.objects.filter(applicant=request.user).values_list('job_id', flat=True)
+            FavoriteJob.objects.filter(
+                applicant=request.user,
+                job_id__in=[job.id for job in page],
+            ).values_list('job_id', flat=True)
         )
 
-    # --- Sorting (minimal insert) ---
-    # sorts: 'recent' (default), 'salary_low', 'salary_high'
-    if sort == "salary_low":
-        jobs = jobs.annotate(
-            sort_salary=Coalesce('min_salary', 'max_salary', Value(0, output_field=DecimalField()))
-        ).order_by('sort_salary', '-posted_at')
-    elif sort == "salary_high":
-        jobs = jobs.annotate(
-            sort_salary=Coalesce('max_salary', 'min_salary', Value(0, output_field=DecimalField()))
-        ).order_by('-sort_salary', '-posted_at')
-    else:
-        jobs = jobs.order_by('-posted_at')
-    # --- end sorting ---
-
+    # Query string for the "next page" link, without the current cursor
+    params = request.GET.copy()
+    for key in ("cursor", "partial"):
+        params.pop(key, None)
 
     context = {
-        "jobs": jobs,
+        "jobs": page.object_list,
+        "page": page,
+        "total_count": total_count,
+        "count_capped": count_capped,
+        "querystring": params.urlencode(),
         "query": query,
         "location": location,
         "salary_min": salary_min_raw,
@@ -155,6 +169,12 @@ def job_search(request):
         "favorited_job_ids": favorited_job_ids,
     }
 
+    # Partial mode: return only the results fragment (used by filter/sort changes
+    # and "next page" loads) instead of re-sending the page chrome.
+    is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
+    if request.GET.get("partial") or is_ajax:
+        return render(request, "jobs/components/job_search_results.html", context)
+
     return render(request, "jobs/job_search.html", context)
 
 def job_suggestions(request):
@@ -338,6 +358,10 @@ def job_detail(request, job_id):
         from django.shortcuts import redirect
         return redirect('dashboard:employer_job_applications', job.id)
 
+    # Buffered in memory and written in batches, see jobs/impressions.py
+    record_job_view(request, job)
+    is_owner = request.user.is_authenticated and job.employer_id == request.user.pk
+
     context = {
         'job': job,
         'is_favorited': is_favorited,
@@ -348,6 +372,9 @@ def job_detail(request, job_id):
         'base_template': base_template,
         'days_since_posted': days_since_posted,
         'can_edit_job': can_edit,
+        # Neighbours are precomputed by `manage.py build_similar_jobs`
+        'similar_jobs': job.get_similar_jobs(),
+        'unique_viewers': unique_viewers(job) if is_owner else None,
     }
     # If the query param `goto=applications` was provided, and the current user
     # is the job owner (employer), set a context flag so the template can
@@ -419,9 +446,13 @@ def apply_job(request, job_id):
             applicant_notes=cover_letter,
             status='pending'
         )
-        
-        # Notify employer about new application
-        notify_application_received(job.employer, request.user, job, application)
+
+        # Score the applicant for the employer's "best match" sort and notify the
+        # employer in the background, once the application is committed
+        from notifications.tasks import send_application_received
+        from .tasks import score_new_application
+        score_new_application.enqueue(application.id)
+        send_application_received.enqueue(application.id)
         
         # If the request was AJAX, return JSON response; otherwise redirect back with message
         is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest' or 'application/json' in request.META.get('HTTP_ACCEPT', '')
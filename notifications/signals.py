@@ -4,7 +4,7 @@ Signals for automatic notification creation on model changes.
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from jobs.models import JobApplication
-from notifications.utils import notify_application_status_change
+from notifications.tasks import send_application_status_change
 
 
 @receiver(pre_save, sender=JobApplication)
@@ -26,6 +26,7 @@ def detect_status_change(sender, instance, **kwargs):
 def notify_on_status_change(sender, instance, created, **kwargs):
     """
     Send notification to applicant when their application status changes.
+    The notification is created by a background task after the save commits.
     """
     if not created and hasattr(instance, '_old_status'):
         old_status = instance._old_status
@@ -33,4 +34,4 @@ def notify_on_status_change(sender, instance, created, **kwargs):
         
         # Only notify if status actually changed and is significant
         if old_status != new_status and new_status in ['reviewed', 'interview', 'rejected', 'hired']:
-            notify_application_status_change(instance.applicant, instance.job, new_status)
+            send_application_status_change.enqueue(instance.pk, new_status)
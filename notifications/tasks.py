@@ -0,0 +1,28 @@
+"""
+Background tasks for notifications (run by `manage.py run_worker`, see taskqueue).
+"""
+from taskqueue.queue import task
+
+from .utils import notify_application_received, notify_application_status_change
+
+
+@task()
+def send_application_received(application_id):
+    from jobs.models import JobApplication
+
+    application = JobApplication.objects.select_related('job__employer', 'applicant').filter(
+        pk=application_id
+    ).first()
+    if application is None:
+        return
+    notify_application_received(application.job.employer, application.applicant, application.job, application)
+
+
+@task()
+def send_application_status_change(application_id, new_status):
+    from jobs.models import JobApplication
+
+    application = JobApplication.objects.select_related('job', 'applicant').filter(pk=application_id).first()
+    if application is None:
+        return
+    notify_application_status_change(application.applicant, application.job, new_status)
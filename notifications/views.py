@@ -3,6 +3,9 @@ from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+
+from utils.sessions import session_readonly
+
 from .models import Notification
 
 
@@ -60,6 +63,7 @@ def get_notifications(request):
         }, status=500)
 
 
+@session_readonly
 @login_required
 @require_http_methods(["GET"])
 def get_unread_count(request):
@@ -0,0 +1,144 @@
+"""
+Background text extraction for uploaded resumes.
+
+After an upload commits, a background task (resumes.tasks.extract_resume)
+streams the file from storage (with a size limit), hashes it, and parses it in
+a separate process that is killed if it runs past the time limit. The
+normalized text and SHA-256 content hash are stored on the Resume, the full-text
+search vector is refreshed, and applications that used the resume are rescored.
+
+Everything goes through the storage API, so a FileSystemStorage works the same
+as the S3 bucket (set USE_LOCAL_MEDIA=True for local runs).
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from utils.document_text import SUPPORTED_EXTENSIONS, DocumentTextError, extract_text, normalize_text
+
+
+logger = logging.getLogger(__name__)
+
+
+def read_resume_file(resume, max_bytes, chunk_size=64 * 1024):
+    """
+    Stream the resume file from storage. Returns (data, sha256 hex digest).
+    Raises DocumentTextError as soon as the file grows past `max_bytes`.
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    resume.file.open('rb')
+    try:
+        for chunk in resume.file.chunks(chunk_size):
+            buffer += chunk
+            digest.update(chunk)
+            if len(buffer) > max_bytes:
+                raise DocumentTextError(f'File is larger than {max_bytes // (1024 * 1024)} MB.')
+    finally:
+        resume.file.close()
+    return bytes(buffer), digest.hexdigest()
+
+
+def parse_document(data, extension, timeout):
+    """
+    Run extract_text() in a fresh worker process and wait at most `timeout` seconds.
+    Leaving the pool terminates the process, so a stuck parser never lingers.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(processes=1) as pool:
+        result = pool.apply_async(extract_text, (data, extension))
+        try:
+            return result.get(timeout)
+        except multiprocessing.TimeoutError:
+            raise DocumentTextError(f'Extraction timed out after {timeout} seconds.')
+
+
+def extract_resume_text(resume_id):
+    """Extract, normalize and index the text of one resume. Safe to call repeatedly."""
+    from .models import Resume
+
+    resume = Resume.objects.filter(pk=resume_id).first()
+    if resume is None or not resume.file:
+        return None
+
+    Resume.objects.filter(pk=resume.pk).update(extraction_status=Resume.EXTRACTION_PROCESSING)
+    extension = os.path.splitext(resume.file.name)[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        Resume.objects.filter(pk=resume.pk).update(
+            extraction_status=Resume.EXTRACTION_UNSUPPORTED,
+            extraction_error=f'No text extraction for {extension or "files without an extension"}.',
+            extracted_at=timezone.now(),
+        )
+        return None
+
+    max_bytes = getattr(settings, 'RESUME_EXTRACTION_MAX_BYTES', 10 * 1024 * 1024)
+    timeout = getattr(settings, 'RESUME_EXTRACTION_TIMEOUT', 30)
+    max_chars = getattr(settings, 'RESUME_TEXT_MAX_CHARS', 100000)
+    try:
+        data, content_hash = read_resume_file(resume, max_bytes)
+
+        # The same file was already extracted (re-upload or copy): reuse its text
+        text = Resume.objects.filter(
+            content_hash=content_hash, extraction_status=Resume.EXTRACTION_DONE
+        ).exclude(pk=resume.pk).values_list('extracted_text', flat=True).first()
+        if text is None:
+            text = normalize_text(parse_document(data, extension, timeout), max_chars)
+    except DocumentTextError as e:
+        Resume.objects.filter(pk=resume.pk).update(
+            extraction_status=Resume.EXTRACTION_FAILED,
+            extraction_error=str(e)[:255],
+            extracted_at=timezone.now(),
+        )
+        return None
+    except Exception:
+        logger.exception('Resume text extraction failed for resume %s', resume.pk)
+        Resume.objects.filter(pk=resume.pk).update(
+            extraction_status=Resume.EXTRACTION_FAILED,
+            extraction_error='Unexpected error while reading the file.',
+            extracted_at=timezone.now(),
+        )
+        return None
+
+    Resume.objects.filter(pk=resume.pk).update(
+        extracted_text=text,
+        content_hash=content_hash,
+        extraction_status=Resume.EXTRACTION_DONE,
+        extraction_error='',
+        extracted_at=timezone.now(),
+    )
+    index_resume(resume.pk)
+    return text
+
+
+def index_resume(resume_id):
+    """
+    Refresh the resume's search vector and its owner's candidate search vector,
+    and rescore the applications that used the resume.
+    """
+    from applicant_profile.models import ApplicantProfile
+    from applicant_profile.search import update_search_vectors
+    from jobs.matching import RELATED, score_applications
+    from jobs.models import JobApplication
+    from .models import Resume
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        Resume.objects.filter(pk=resume_id).update(
+            search_vector=SearchVector('extracted_text', config='english')
+        )
+    update_search_vectors(ApplicantProfile.objects.filter(user__resumes=resume_id))
+
+    applications = JobApplication.objects.filter(resume_id=resume_id).select_related(*RELATED)
+    score_applications(applications)
+
+
+def schedule_extraction(resume):
+    """Queue text extraction for the resume; it runs once the current transaction commits."""
+    from .tasks import extract_resume
+    extract_resume.enqueue(resume.pk)
@@ -1,7 +1,10 @@
 from django import forms
+from uploads.forms import DirectUploadFormMixin
 from .models import Resume
 
-class ResumeUploadForm(forms.ModelForm):
+class ResumeUploadForm(DirectUploadFormMixin, forms.ModelForm):
+    direct_upload_fields = {'file': 'resume'}
+
     class Meta:
         model = Resume
         fields = ['name', 'file', 'is_default']
@@ -46,6 +49,9 @@ class ResumeUploadForm(forms.ModelForm):
     def clean_file(self):
         file = self.cleaned_data.get('file')
         if not file:
+            # Uploaded straight to storage and verified there
+            if self.has_direct_upload('file'):
+                return file
             raise forms.ValidationError('Please select a file to upload.')
         
         # Check file size (5MB limit)
@@ -0,0 +1,38 @@
+"""
+Extract and index resume text in the foreground.
+
+Uploads are extracted in the background automatically; use this to backfill
+existing resumes or retry failures:
+    python manage.py extract_resumes
+    python manage.py extract_resumes --all
+"""
+from django.core.management.base import BaseCommand
+
+from resumes.extraction import extract_resume_text
+from resumes.models import Resume
+
+
+class Command(BaseCommand):
+    help = 'Extract text from resumes that are pending or failed (or all with --all).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-extract every resume.')
+        parser.add_argument('--user', type=int, help='Only resumes of this user id.')
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.order_by('pk')
+        if not options['all']:
+            resumes = resumes.filter(
+                extraction_status__in=[Resume.EXTRACTION_PENDING, Resume.EXTRACTION_FAILED]
+            )
+        if options['user']:
+            resumes = resumes.filter(user_id=options['user'])
+
+        counts = {}
+        for resume_id in resumes.values_list('pk', flat=True).iterator():
+            extract_resume_text(resume_id)
+            status = Resume.objects.filter(pk=resume_id).values_list('extraction_status', flat=True).first()
+            counts[status] = counts.get(status, 0) + 1
+
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(counts.items())) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f'Resume extraction: {summary}.'))
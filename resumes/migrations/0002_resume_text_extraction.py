@@ -0,0 +1,57 @@
+# Generated by Django 4.2.25 on 2026-10-19 00:33
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the file contents', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extracted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extracted_text',
+            field=models.TextField(blank=True, editable=False, help_text='Normalized plain text of the file'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extraction_error',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='extraction_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed'), ('unsupported', 'Unsupported')], default='pending', editable=False, help_text='State of the background text extraction', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full-text index of extracted_text', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['extraction_status'], name='resumes_res_extract_1f6a97_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['content_hash'], name='resumes_res_content_5eacc7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='resumes_res_search__4bbb9a_gin'),
+        ),
+    ]
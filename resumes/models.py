@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 User = get_user_model()
 
@@ -14,9 +16,40 @@ class Resume(models.Model):
     file = models.FileField(upload_to='resumes/%Y/%m/', help_text="PDF, DOC, or DOCX file")
     uploaded_at = models.DateTimeField(auto_now_add=True)
     is_default = models.BooleanField(default=False, help_text="Use this resume by default when applying")
+
+    # Text extraction, filled in the background by resumes/extraction.py
+    EXTRACTION_PENDING = 'pending'
+    EXTRACTION_PROCESSING = 'processing'
+    EXTRACTION_DONE = 'done'
+    EXTRACTION_FAILED = 'failed'
+    EXTRACTION_UNSUPPORTED = 'unsupported'
+    EXTRACTION_STATUS_CHOICES = [
+        (EXTRACTION_PENDING, 'Pending'),
+        (EXTRACTION_PROCESSING, 'Processing'),
+        (EXTRACTION_DONE, 'Done'),
+        (EXTRACTION_FAILED, 'Failed'),
+        (EXTRACTION_UNSUPPORTED, 'Unsupported'),
+    ]
+    extraction_status = models.CharField(
+        max_length=20,
+        choices=EXTRACTION_STATUS_CHOICES,
+        default=EXTRACTION_PENDING,
+        editable=False,
+        help_text="State of the background text extraction"
+    )
+    extracted_text = models.TextField(blank=True, editable=False, help_text="Normalized plain text of the file")
+    content_hash = models.CharField(max_length=64, blank=True, editable=False, help_text="SHA-256 of the file contents")
+    extraction_error = models.CharField(max_length=255, blank=True, editable=False)
+    extracted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Full-text index of extracted_text")
     
     class Meta:
         ordering = ['-is_default', '-uploaded_at']
+        indexes = [
+            models.Index(fields=['extraction_status']),
+            models.Index(fields=['content_hash']),
+            GinIndex(fields=['search_vector']),
+        ]
         verbose_name = 'Resume'
         verbose_name_plural = 'Resumes'
     
@@ -0,0 +1,17 @@
+"""
+Background tasks for resumes (run by `manage.py run_worker`, see taskqueue).
+"""
+from taskqueue.queue import PRIORITY_LOW, task
+
+
+@task(max_attempts=3)
+def extract_resume(resume_id):
+    from .extraction import extract_resume_text
+    extract_resume_text(resume_id)
+
+
+@task(priority=PRIORITY_LOW)
+def delete_resume_file(name):
+    """Remove a deleted resume's file from storage."""
+    from .models import Resume
+    Resume._meta.get_field('file').storage.delete(name)
@@ -4,6 +4,8 @@ from django.contrib import messages
 from django.http import JsonResponse
 from .models import Resume
 from .forms import ResumeUploadForm
+from .extraction import schedule_extraction
+from .tasks import delete_resume_file
 
 @login_required
 def upload_resume(request):
@@ -13,7 +15,7 @@ def upload_resume(request):
         return redirect('dashboard:dashboard')
     
     if request.method == 'POST':
-        form = ResumeUploadForm(request.POST, request.FILES)
+        form = ResumeUploadForm(request.POST, request.FILES, upload_user=request.user)
         if form.is_valid():
             resume = form.save(commit=False)
             resume.user = request.user
@@ -23,6 +25,7 @@ def upload_resume(request):
                 Resume.objects.filter(user=request.user, is_default=True).update(is_default=False)
             
             resume.save()
+            schedule_extraction(resume)
             
             # Check if it's an AJAX request
             if request.headers.get('x-requested-with') == 'XMLHttpRequest':
@@ -64,8 +67,11 @@ def delete_resume(request, resume_id):
     
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
     resume_name = resume.name
-    resume.file.delete()  # Delete the file from storage
+    file_name = resume.file.name
     resume.delete()
+    if file_name:
+        # Remove the file from storage in the background
+        delete_resume_file.enqueue(file_name)
     
     if request.headers.get('x-requested-with') == 'XMLHttpRequest':
         return JsonResponse({'success': True, 'message': f'Resume "{resume_name}" deleted successfully.'})
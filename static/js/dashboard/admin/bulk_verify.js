@@ -0,0 +1,25 @@
+// Pending employers: "select all" checkbox and confirmation for bulk approve/reject
+(function () {
+    const form = document.getElementById('bulkVerifyForm');
+    const selectAll = document.getElementById('selectAllEmployers');
+    if (!form || !selectAll) return;
+
+    const boxes = () => document.querySelectorAll('.employer-select');
+
+    selectAll.addEventListener('change', function () {
+        boxes().forEach(function (box) { box.checked = selectAll.checked; });
+    });
+
+    form.addEventListener('submit', function (event) {
+        const selected = Array.from(boxes()).filter(function (box) { return box.checked; }).length;
+        if (!selected) {
+            event.preventDefault();
+            alert('Select at least one employer.');
+            return;
+        }
+        const action = event.submitter && event.submitter.value === 'reject' ? 'Reject' : 'Approve';
+        if (!confirm(action + ' ' + selected + ' employer(s)?')) {
+            event.preventDefault();
+        }
+    });
+})();
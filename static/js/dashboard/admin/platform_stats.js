@@ -0,0 +1,149 @@
+// Admin dashboard: line charts of the daily platform rollups (see dashboard/stats.py)
+(function () {
+    const section = document.getElementById('platformStats');
+    if (!section) return;
+
+    const SVG_NS = 'http://www.w3.org/2000/svg';
+    const WIDTH = 400;
+    const HEIGHT = 160;
+    const PAD = { top: 8, right: 8, bottom: 20, left: 36 };
+    const COLORS = ['#e74c3c', '#3498db', '#f5b921', '#27ae60', '#8e44ad', '#7f8c8d'];
+    const charts = section.querySelectorAll('.platform-chart');
+    const buttons = section.querySelectorAll('.btn-range');
+    const loaded = {};
+    let current = null;
+
+    function svgElement(name, attrs) {
+        const el = document.createElementNS(SVG_NS, name);
+        Object.keys(attrs).forEach(function (key) { el.setAttribute(key, attrs[key]); });
+        return el;
+    }
+
+    // Round the axis maximum up to 1, 2 or 5 times a power of ten
+    function niceMax(value) {
+        if (value <= 4) return 4;
+        const magnitude = Math.pow(10, Math.floor(Math.log10(value)));
+        const steps = [1, 2, 5, 10];
+        for (let i = 0; i < steps.length; i++) {
+            if (value <= steps[i] * magnitude) return steps[i] * magnitude;
+        }
+        return 10 * magnitude;
+    }
+
+    function clear(chart) {
+        chart.querySelectorAll('svg, .platform-chart-legend, .platform-chart-tooltip, .platform-chart-empty')
+            .forEach(function (el) { el.remove(); });
+    }
+
+    function drawChart(chart, data) {
+        clear(chart);
+        const fields = chart.dataset.series.split(',');
+        const dates = data.dates;
+        if (!dates.length) {
+            const empty = document.createElement('div');
+            empty.className = 'platform-chart-empty';
+            empty.textContent = 'No data for this range yet.';
+            chart.appendChild(empty);
+            return;
+        }
+
+        let max = 0;
+        fields.forEach(function (field) {
+            data.series[field].forEach(function (value) { max = Math.max(max, value); });
+        });
+        max = niceMax(max);
+        const plotWidth = WIDTH - PAD.left - PAD.right;
+        const plotHeight = HEIGHT - PAD.top - PAD.bottom;
+        const x = function (i) { return PAD.left + (dates.length > 1 ? i * plotWidth / (dates.length - 1) : plotWidth / 2); };
+        const y = function (value) { return PAD.top + plotHeight - value * plotHeight / max; };
+
+        const svg = svgElement('svg', { viewBox: '0 0 ' + WIDTH + ' ' + HEIGHT, role: 'img' });
+        [0, max / 2, max].forEach(function (tick) {
+            svg.appendChild(svgElement('line', {
+                class: 'grid-line', x1: PAD.left, x2: WIDTH - PAD.right, y1: y(tick), y2: y(tick),
+            }));
+            const label = svgElement('text', { class: 'axis-label', x: PAD.left - 4, y: y(tick) + 3, 'text-anchor': 'end' });
+            label.textContent = tick.toLocaleString();
+            svg.appendChild(label);
+        });
+        [[0, 'start'], [dates.length - 1, 'end']].forEach(function (item) {
+            const label = svgElement('text', { class: 'axis-label', x: x(item[0]), y: HEIGHT - 4, 'text-anchor': item[1] });
+            label.textContent = dates[item[0]];
+            svg.appendChild(label);
+        });
+
+        const legend = document.createElement('div');
+        legend.className = 'platform-chart-legend';
+        fields.forEach(function (field, index) {
+            const color = COLORS[index % COLORS.length];
+            const points = data.series[field].map(function (value, i) { return x(i) + ',' + y(value); });
+            svg.appendChild(svgElement('polyline', {
+                points: points.join(' '), fill: 'none', stroke: color, 'stroke-width': 1.5,
+                'stroke-linejoin': 'round',
+            }));
+            const item = document.createElement('span');
+            item.style.setProperty('--series-color', color);
+            item.textContent = data.labels[field];
+            legend.appendChild(item);
+        });
+
+        const hoverLine = svgElement('line', { class: 'hover-line', y1: PAD.top, y2: PAD.top + plotHeight, visibility: 'hidden' });
+        svg.appendChild(hoverLine);
+        const tooltip = document.createElement('div');
+        tooltip.className = 'platform-chart-tooltip';
+
+        svg.addEventListener('mousemove', function (event) {
+            const box = svg.getBoundingClientRect();
+            const position = (event.clientX - box.left) * WIDTH / box.width;
+            const i = Math.max(0, Math.min(dates.length - 1,
+                Math.round((position - PAD.left) * (dates.length - 1) / plotWidth)));
+            hoverLine.setAttribute('x1', x(i));
+            hoverLine.setAttribute('x2', x(i));
+            hoverLine.setAttribute('visibility', 'visible');
+            tooltip.textContent = dates[i] + ': ' + fields.map(function (field) {
+                return data.labels[field] + ' ' + data.series[field][i].toLocaleString();
+            }).join(', ');
+        });
+        svg.addEventListener('mouseleave', function () {
+            hoverLine.setAttribute('visibility', 'hidden');
+            tooltip.textContent = '';
+        });
+
+        chart.appendChild(svg);
+        chart.appendChild(legend);
+        chart.appendChild(tooltip);
+    }
+
+    function load(days) {
+        current = days;
+        buttons.forEach(function (button) {
+            button.classList.toggle('active', button.dataset.days === String(days));
+        });
+        if (!loaded[days]) {
+            loaded[days] = fetch(section.dataset.url + '?days=' + days, { credentials: 'same-origin' })
+                .then(function (response) {
+                    if (!response.ok) throw new Error('HTTP ' + response.status);
+                    return response.json();
+                });
+        }
+        loaded[days].then(function (data) {
+            if (current !== days) return;
+            charts.forEach(function (chart) { drawChart(chart, data); });
+        }).catch(function () {
+            delete loaded[days];
+            if (current !== days) return;
+            charts.forEach(function (chart) {
+                clear(chart);
+                const empty = document.createElement('div');
+                empty.className = 'platform-chart-empty';
+                empty.textContent = 'Could not load the chart data.';
+                chart.appendChild(empty);
+            });
+        });
+    }
+
+    buttons.forEach(function (button) {
+        button.addEventListener('click', function () { load(Number(button.dataset.days)); });
+    });
+    if (buttons.length) load(Number(buttons[0].dataset.days));
+})();
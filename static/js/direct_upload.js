@@ -0,0 +1,119 @@
+// Direct-to-storage uploads (see uploads/direct.py)
+//
+// File inputs with data-upload-kind are uploaded straight to the bucket before
+// their form is sent: the file is hashed, a grant is requested, the file is PUT
+// to the presigned URL and the upload is verified. The verified token goes in a
+// hidden "<name>_upload" input and the file input is disabled so the file is
+// not posted again. Forms marked data-direct-upload are handled on submit;
+// forms sent with fetch() call DirectUpload.prepare(form) themselves.
+// Without Web Crypto (plain http) files are posted through the server as before.
+(function() {
+    const GRANT_URL = '/uploads/grant/';
+    const COMPLETE_URL = '/uploads/complete/';
+
+    function csrfToken(form) {
+        const input = form.querySelector('input[name="csrfmiddlewaretoken"]');
+        if (input) return input.value;
+        const cookie = document.cookie.split('; ').find(row => row.startsWith('csrftoken='));
+        return cookie ? cookie.split('=')[1] : '';
+    }
+
+    function supported() {
+        return !!(window.crypto && window.crypto.subtle && window.fetch);
+    }
+
+    async function sha256(file) {
+        const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+        return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+    }
+
+    async function postForm(url, form, fields) {
+        const body = new FormData();
+        Object.keys(fields).forEach(name => body.append(name, fields[name]));
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: {'X-CSRFToken': csrfToken(form), 'X-Requested-With': 'XMLHttpRequest'},
+            body: body,
+            credentials: 'same-origin',
+        });
+        let data = {};
+        try {
+            data = await response.json();
+        } catch (e) {
+            // Non-JSON error page
+        }
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || 'Upload failed. Please try again.');
+        }
+        return data;
+    }
+
+    async function uploadFile(form, input) {
+        const file = input.files[0];
+        const grant = await postForm(GRANT_URL, form, {
+            kind: input.dataset.uploadKind,
+            filename: file.name,
+            size: file.size,
+            sha256: await sha256(file),
+        });
+
+        const put = await fetch(grant.url, {method: grant.method, headers: grant.headers, body: file});
+        if (!put.ok) {
+            throw new Error('Upload to storage failed (' + put.status + '). Please try again.');
+        }
+
+        const done = await postForm(COMPLETE_URL, form, {grant: grant.grant});
+        const hidden = document.createElement('input');
+        hidden.type = 'hidden';
+        hidden.name = input.name + '_upload';
+        hidden.value = done.token;
+        hidden.dataset.directUploadToken = '';
+        form.appendChild(hidden);
+        input.disabled = true;
+    }
+
+    function pendingInputs(form) {
+        return Array.from(form.querySelectorAll('input[type="file"][data-upload-kind]'))
+            .filter(input => !input.disabled && input.files && input.files.length > 0);
+    }
+
+    // Upload every selected file in the form. Resolves once all are verified.
+    async function prepare(form) {
+        if (!supported()) return;
+        await Promise.all(pendingInputs(form).map(input => uploadFile(form, input)));
+    }
+
+    // Undo prepare() after a form sent with fetch() so it can be reused.
+    function reset(form) {
+        form.querySelectorAll('input[data-direct-upload-token]').forEach(el => el.remove());
+        form.querySelectorAll('input[type="file"][data-upload-kind]').forEach(input => { input.disabled = false; });
+    }
+
+    function setBusy(form, busy) {
+        form.querySelectorAll('button[type="submit"], input[type="submit"]').forEach(button => {
+            button.disabled = busy;
+        });
+    }
+
+    // Bubble phase, so forms' own validation handlers run (and may cancel) first
+    document.addEventListener('submit', async function(e) {
+        const form = e.target;
+        if (e.defaultPrevented || !form.hasAttribute('data-direct-upload')) return;
+        if (!supported() || pendingInputs(form).length === 0) return;
+
+        e.preventDefault();
+        setBusy(form, true);
+        try {
+            await prepare(form);
+        } catch (err) {
+            setBusy(form, false);
+            reset(form);
+            alert(err.message);
+            return;
+        }
+        // Submit natively; the file inputs are disabled now so this handler lets it through
+        HTMLFormElement.prototype.submit.call(form);
+    });
+
+    window.DirectUpload = {prepare: prepare, reset: reset};
+})();
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'priority', 'attempts', 'run_at', 'created_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'last_error')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'locked_by', 'locked_at')
+    list_per_page = 50
+    actions = ['retry_tasks']
+
+    @admin.action(description='Retry selected tasks now')
+    def retry_tasks(self, request, queryset):
+        from django.utils import timezone
+
+        updated = queryset.exclude(status=Task.STATUS_RUNNING).update(
+            status=Task.STATUS_QUEUED, attempts=0, run_at=timezone.now(), last_error=''
+        )
+        self.message_user(request, f'{updated} task(s) queued again.')
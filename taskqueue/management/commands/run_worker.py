@@ -0,0 +1,45 @@
+"""
+Run background tasks from the Task table (see taskqueue/queue.py).
+
+Start one or more workers next to the web process:
+    python manage.py run_worker
+    python manage.py run_worker --concurrency 8 --pool process
+    python manage.py run_worker --once    # drain due tasks, then exit (cron)
+"""
+import logging
+
+from django.core.management.base import BaseCommand
+
+from taskqueue.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Claim and run queued background tasks until stopped.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Tasks run at the same time.')
+        parser.add_argument(
+            '--pool',
+            choices=['thread', 'process'],
+            default='thread',
+            help='Run tasks in threads (I/O-bound work) or processes (CPU-bound work).',
+        )
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls when idle.')
+        parser.add_argument('--stats-interval', type=int, default=60, help='Seconds between queue stats log lines (0 to disable).')
+        parser.add_argument('--once', action='store_true', help='Exit once no tasks are due.')
+
+    def handle(self, *args, **options):
+        if not logging.getLogger().handlers:
+            logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+        worker = Worker(
+            concurrency=max(1, options['concurrency']),
+            pool=options['pool'],
+            poll_interval=options['poll_interval'],
+            stats_interval=options['stats_interval'],
+        )
+        self.stdout.write(
+            f'Worker {worker.worker_id} started ({options["pool"]} pool, concurrency {worker.concurrency}).'
+        )
+        processed = worker.run(once=options['once'])
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped after {processed} task(s).'))
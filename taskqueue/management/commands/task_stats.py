@@ -0,0 +1,35 @@
+"""
+Print task queue throughput and lag metrics.
+
+    python manage.py task_stats
+    python manage.py task_stats --window 3600 --json
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from taskqueue.queue import queue_stats
+
+
+class Command(BaseCommand):
+    help = 'Show queued/running/failed counts, lag and throughput of the background task queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=300, help='Seconds of history for throughput.')
+        parser.add_argument('--json', action='store_true', help='Print the metrics as JSON.')
+
+    def handle(self, *args, **options):
+        stats = queue_stats(window=options['window'])
+        if options['json']:
+            self.stdout.write(json.dumps(stats))
+            return
+
+        self.stdout.write(
+            f"queued {stats['queued']} (due {stats['due']}), running {stats['running']}, "
+            f"done {stats['done']}, failed {stats['failed']}"
+        )
+        self.stdout.write(f"lag of oldest due task: {stats['lag_seconds']:.1f}s")
+        self.stdout.write(
+            f"last {stats['window_seconds']}s: {stats['throughput_per_minute']:.1f} tasks/min, "
+            f"avg run time {stats['avg_runtime_seconds']:.2f}s, {stats['failed_recently']} failed"
+        )
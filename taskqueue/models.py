@@ -0,0 +1,57 @@
+from django.db import models
+
+
+class Task(models.Model):
+    """
+    A unit of background work, run by `manage.py run_worker`.
+    See taskqueue/queue.py for enqueueing, claiming and retries.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(
+        max_length=200,
+        help_text="Registered task name (module path of the @task function)"
+    )
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    priority = models.SmallIntegerField(
+        default=0,
+        help_text="Higher runs first"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(
+        help_text="Earliest time the task may run (pushed back after each failed attempt)"
+    )
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Claim query: queued tasks that are due, highest priority first
+            models.Index(
+                fields=['-priority', 'run_at'],
+                name='task_ready_idx',
+                condition=models.Q(status='queued'),
+            ),
+            models.Index(fields=['status', 'locked_at']),
+            models.Index(fields=['status', 'finished_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
@@ -0,0 +1,247 @@
+"""
+Database-backed background tasks.
+
+Functions decorated with @task are registered by name (apps declare them in a
+tasks.py module, which is imported at startup). `func.enqueue(*args, **kwargs)`
+writes a Task row in the caller's transaction, so a worker only sees it once
+that transaction commits and never sees it if it rolls back. Arguments are
+stored as JSON: pass primary keys, not model instances.
+
+Workers (`manage.py run_worker`) claim due tasks with SELECT ... FOR UPDATE
+SKIP LOCKED, so several workers can poll the same table without handing out a
+task twice. Failed tasks are retried with exponential backoff up to
+max_attempts. While a task runs its worker refreshes locked_at every
+TASKS_HEARTBEAT_INTERVAL seconds; tasks whose lock has not been refreshed for
+TASKS_LOCK_TIMEOUT seconds were left by a crashed worker and are requeued.
+
+With TASKS_EAGER = True (the default when DEBUG is on) tasks run in-process
+right after the commit instead, so local development needs no worker.
+"""
+from datetime import timedelta
+import functools
+import logging
+import random
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Min
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 10
+PRIORITY_DEFAULT = 0
+PRIORITY_LOW = -10
+
+_registry = {}
+
+
+class TaskFunction:
+    """A registered task. Call it to run inline, or use .enqueue() to run it in a worker."""
+
+    def __init__(self, func, name, priority, max_attempts):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, **kwargs):
+        return enqueue(self.name, args, kwargs)
+
+    def __repr__(self):
+        return f'<TaskFunction {self.name}>'
+
+
+def task(name=None, priority=PRIORITY_DEFAULT, max_attempts=5):
+    """
+    Register a function as a background task.
+
+    Usage:
+        @task(priority=PRIORITY_HIGH)
+        def send_welcome_email(user_id):
+            ...
+
+        send_welcome_email.enqueue(user.id)
+    """
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registered = TaskFunction(func, task_name, priority, max_attempts)
+        _registry[task_name] = registered
+        return registered
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'No task registered as {name!r}.')
+
+
+def enqueue(name, args=(), kwargs=None, priority=None, delay=None):
+    """
+    Queue the task registered as `name`. Returns the Task row, or None in eager mode.
+    `delay` (seconds) postpones the first run.
+    """
+    from .models import Task
+
+    func = get_task(name)
+    args = list(args)
+    kwargs = dict(kwargs or {})
+
+    if getattr(settings, 'TASKS_EAGER', False):
+        transaction.on_commit(functools.partial(_run_eager, func, args, kwargs))
+        return None
+
+    run_at = timezone.now()
+    if delay:
+        run_at += timedelta(seconds=delay)
+    return Task.objects.create(
+        name=name,
+        args=args,
+        kwargs=kwargs,
+        priority=func.priority if priority is None else priority,
+        max_attempts=func.max_attempts,
+        run_at=run_at,
+    )
+
+
+def _run_eager(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Task %s failed', func.name)
+
+
+def claim_tasks(worker_id, limit):
+    """Lock up to `limit` due tasks for `worker_id` and mark them running."""
+    from .models import Task
+
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True).filter(
+                status=Task.STATUS_QUEUED, run_at__lte=now
+            ).order_by('-priority', 'run_at')[:limit]
+        )
+        if not tasks:
+            return []
+        Task.objects.filter(pk__in=[t.pk for t in tasks]).update(
+            status=Task.STATUS_RUNNING,
+            attempts=F('attempts') + 1,
+            locked_by=worker_id,
+            locked_at=now,
+            started_at=now,
+        )
+    for t in tasks:
+        t.status = Task.STATUS_RUNNING
+        t.attempts += 1
+        t.locked_by = worker_id
+        t.locked_at = t.started_at = now
+    return tasks
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt: exponential with jitter, capped."""
+    base = getattr(settings, 'TASKS_RETRY_BASE_DELAY', 30)
+    cap = getattr(settings, 'TASKS_RETRY_MAX_DELAY', 60 * 60)
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.75, 1.25)
+
+
+def finish_task(task, error=None):
+    """
+    Record the outcome of a claimed task: done, queued for a retry, or failed
+    once max_attempts is used up. Ignored if the task was requeued meanwhile.
+    """
+    from .models import Task
+
+    now = timezone.now()
+    claimed = Task.objects.filter(pk=task.pk, status=Task.STATUS_RUNNING, locked_by=task.locked_by)
+    unlock = {'locked_by': '', 'locked_at': None}
+    if error is None:
+        return claimed.update(status=Task.STATUS_DONE, finished_at=now, last_error='', **unlock)
+    if task.attempts >= task.max_attempts:
+        logger.error('Task %s #%s failed after %s attempts: %s', task.name, task.pk, task.attempts, error)
+        return claimed.update(status=Task.STATUS_FAILED, finished_at=now, last_error=error, **unlock)
+    logger.warning('Task %s #%s failed (attempt %s), retrying', task.name, task.pk, task.attempts)
+    return claimed.update(
+        status=Task.STATUS_QUEUED,
+        run_at=now + timedelta(seconds=retry_delay(task.attempts)),
+        last_error=error,
+        **unlock,
+    )
+
+
+def heartbeat_tasks(worker_id, task_ids):
+    """Refresh locked_at on the tasks `worker_id` is still running, so they are not taken for stale."""
+    from .models import Task
+
+    if not task_ids:
+        return 0
+    return Task.objects.filter(
+        pk__in=list(task_ids), status=Task.STATUS_RUNNING, locked_by=worker_id
+    ).update(locked_at=timezone.now())
+
+
+def requeue_stale_tasks():
+    """Release tasks whose worker has not refreshed their lock for TASKS_LOCK_TIMEOUT."""
+    from .models import Task
+
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=getattr(settings, 'TASKS_LOCK_TIMEOUT', 15 * 60))
+    stale = Task.objects.filter(status=Task.STATUS_RUNNING, locked_at__lt=cutoff)
+    unlock = {'locked_by': '', 'locked_at': None, 'last_error': 'Worker stopped before the task finished.'}
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Task.STATUS_FAILED, finished_at=now, **unlock
+    )
+    requeued = stale.update(status=Task.STATUS_QUEUED, run_at=now, **unlock)
+    return requeued + failed
+
+
+def prune_tasks():
+    """Delete completed tasks older than TASKS_RETENTION seconds."""
+    from .models import Task
+
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'TASKS_RETENTION', 7 * 24 * 60 * 60))
+    deleted, _ = Task.objects.filter(status=Task.STATUS_DONE, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def queue_stats(window=300):
+    """
+    Queue health over the last `window` seconds:
+    per-status counts, how many tasks are due, lag of the oldest due task,
+    completed tasks per minute, average run time and recent failures.
+    """
+    from .models import Task
+
+    now = timezone.now()
+    counts = dict(Task.objects.order_by().values_list('status').annotate(n=Count('pk')))
+
+    due = Task.objects.filter(status=Task.STATUS_QUEUED, run_at__lte=now)
+    oldest = due.aggregate(oldest=Min('run_at'))['oldest']
+
+    recent = Task.objects.filter(finished_at__gte=now - timedelta(seconds=window))
+    runtime = ExpressionWrapper(F('finished_at') - F('started_at'), output_field=DurationField())
+    done = recent.filter(status=Task.STATUS_DONE).aggregate(n=Count('pk'), runtime=Avg(runtime))
+
+    return {
+        'queued': counts.get(Task.STATUS_QUEUED, 0),
+        'running': counts.get(Task.STATUS_RUNNING, 0),
+        'done': counts.get(Task.STATUS_DONE, 0),
+        'failed': counts.get(Task.STATUS_FAILED, 0),
+        'due': due.count(),
+        'lag_seconds': (now - oldest).total_seconds() if oldest else 0.0,
+        'throughput_per_minute': done['n'] * 60 / window,
+        'avg_runtime_seconds': done['runtime'].total_seconds() if done['runtime'] else 0.0,
+        'failed_recently': recent.filter(status=Task.STATUS_FAILED).count(),
+        'window_seconds': window,
+    }
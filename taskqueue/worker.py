@@ -0,0 +1,156 @@
+"""
+Worker loop for `manage.py run_worker`.
+
+The main thread claims due tasks (taskqueue.queue.claim_tasks) and hands them
+to a thread or process pool, then records each outcome as it completes. Only
+as many tasks are claimed as there are free slots in the pool, so a busy
+worker leaves the rest of the queue to other workers. While tasks run, the
+main thread refreshes their locks (taskqueue.queue.heartbeat_tasks) so long
+tasks are not requeued under a live worker.
+
+Process pools use the "spawn" start method: each child sets Django up from
+scratch instead of inheriting the parent's open database connection.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+
+
+logger = logging.getLogger(__name__)
+
+HOUSEKEEPING_INTERVAL = 60
+PRUNE_INTERVAL = 60 * 60
+
+
+def _init_process():
+    import django
+    django.setup()
+
+
+def run_task_function(name, args, kwargs):
+    """
+    Run one task body inside a pool worker. Returns None on success or the
+    formatted traceback on failure (tracebacks pickle, arbitrary exceptions may not).
+    """
+    from django.db import close_old_connections
+    from .queue import get_task
+
+    close_old_connections()
+    try:
+        get_task(name)(*args, **kwargs)
+        return None
+    except Exception:
+        return traceback.format_exc()[-4000:]
+    finally:
+        close_old_connections()
+
+
+class Worker:
+    def __init__(self, concurrency=4, pool='thread', poll_interval=1.0, stats_interval=60):
+        self.concurrency = concurrency
+        self.pool = pool
+        self.poll_interval = poll_interval
+        self.stats_interval = stats_interval
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+        self.processed = 0
+        self._last_housekeeping = None
+        self._last_heartbeat = time.monotonic()
+        self._last_prune = None
+        self._last_stats = time.monotonic()
+
+    def stop(self, *args):
+        if not self.stopping.is_set():
+            logger.info('Worker %s stopping after running tasks finish', self.worker_id)
+        self.stopping.set()
+
+    def make_executor(self):
+        if self.pool == 'process':
+            return ProcessPoolExecutor(
+                max_workers=self.concurrency,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_process,
+            )
+        return ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='task-worker')
+
+    def run(self, once=False):
+        """Process tasks until stopped (SIGINT/SIGTERM), or until the queue is empty with `once`."""
+        from .queue import claim_tasks
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.stop)
+
+        running = {}
+        with self.make_executor() as executor:
+            while not self.stopping.is_set():
+                self.housekeeping()
+
+                claimed = claim_tasks(self.worker_id, self.concurrency - len(running))
+                for task in claimed:
+                    future = executor.submit(run_task_function, task.name, task.args, task.kwargs)
+                    running[future] = task
+
+                if running:
+                    self.heartbeat(running)
+                    # Go straight back for more work while slots are free and the queue is not empty
+                    busy = len(running) >= self.concurrency or not claimed
+                    done, _ = wait(running, timeout=self.poll_interval if busy else 0, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.record(running.pop(future), future)
+                elif once:
+                    break
+                else:
+                    self.stopping.wait(self.poll_interval)
+
+            # Let claimed tasks finish rather than leave them for the stale-lock timeout
+            while running:
+                self.heartbeat(running)
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.record(running.pop(future), future)
+        return self.processed
+
+    def heartbeat(self, running):
+        from django.conf import settings
+        from .queue import heartbeat_tasks
+
+        now = time.monotonic()
+        if now - self._last_heartbeat < getattr(settings, 'TASKS_HEARTBEAT_INTERVAL', 60):
+            return
+        self._last_heartbeat = now
+        heartbeat_tasks(self.worker_id, [task.pk for task in running.values()])
+
+    def record(self, task, future):
+        from .queue import finish_task
+
+        try:
+            error = future.result()
+        except Exception as e:
+            # The pool itself failed (e.g. a child process died)
+            error = f'{e.__class__.__name__}: {e}'
+        finish_task(task, error)
+        self.processed += 1
+
+    def housekeeping(self):
+        from .queue import prune_tasks, queue_stats, requeue_stale_tasks
+
+        now = time.monotonic()
+        if self._last_housekeeping is not None and now - self._last_housekeeping < HOUSEKEEPING_INTERVAL:
+            return
+        self._last_housekeeping = now
+
+        requeued = requeue_stale_tasks()
+        if requeued:
+            logger.warning('Requeued %s stale task(s)', requeued)
+        if self._last_prune is None or now - self._last_prune >= PRUNE_INTERVAL:
+            self._last_prune = now
+            prune_tasks()
+        if self.stats_interval and now - self._last_stats >= self.stats_interval:
+            self._last_stats = now
+            logger.info('Task queue: %s', queue_stats())
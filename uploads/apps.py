@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+
+
+class UploadsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'uploads'
+
+    def ready(self):
+        """Connect the image-variant signals for every model listed in IMAGE_VARIANT_FIELDS."""
+        from django.apps import apps
+        from django.db.models.signals import post_save, pre_save
+        from .images import IMAGE_VARIANT_FIELDS
+        from .signals import note_replaced_images, queue_image_variants
+
+        for label in {path.rsplit('.', 1)[0] for path in IMAGE_VARIANT_FIELDS}:
+            model = apps.get_model(label)
+            pre_save.connect(note_replaced_images, sender=model, dispatch_uid=f'image_variants_pre_{label}')
+            post_save.connect(queue_image_variants, sender=model, dispatch_uid=f'image_variants_post_{label}')
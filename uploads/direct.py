@@ -0,0 +1,301 @@
+"""
+Direct-to-storage uploads.
+
+Instead of posting a file through the app server, the browser asks for an
+upload grant (uploads:grant), PUTs the file straight to the bucket with the
+presigned URL in the grant, then calls uploads:complete. Completion checks
+the stored object's size, leading bytes and SHA-256 against what the grant
+was issued for, deletes the object if anything is off, and otherwise returns
+a signed token. Forms using uploads.forms.DirectUploadFormMixin accept that
+token in place of the file and store the object key on the FileField. A token
+is good for one row: once its key is stored, other rows cannot claim it.
+static/js/direct_upload.js drives the browser side.
+
+Grants and tokens are signed with SECRET_KEY, so nothing is written to the
+database until the form is saved. The presigned PUT signs the exact
+Content-Length and Content-Type, so the bucket rejects any other size or type.
+With a FileSystemStorage (USE_LOCAL_MEDIA=True) the grant points at
+uploads:local_upload, which writes through the storage API instead.
+"""
+import hashlib
+import os
+import re
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils.text import get_valid_filename
+
+
+GRANT_SALT = 'uploads.grant'
+TOKEN_SALT = 'uploads.verified'
+
+MB = 1024 * 1024
+
+# Extension -> (content type, accepted leading bytes). None skips the signature check.
+FILE_TYPES = {
+    '.pdf': ('application/pdf', (b'%PDF-',)),
+    '.doc': ('application/msword', (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',)),
+    '.docx': ('application/vnd.openxmlformats-officedocument.wordprocessingml.document', (b'PK\x03\x04',)),
+    '.jpg': ('image/jpeg', (b'\xff\xd8\xff',)),
+    '.jpeg': ('image/jpeg', (b'\xff\xd8\xff',)),
+    '.png': ('image/png', (b'\x89PNG\r\n\x1a\n',)),
+    '.gif': ('image/gif', (b'GIF87a', b'GIF89a')),
+    '.webp': ('image/webp', (b'RIFF',)),
+    '.txt': ('text/plain', None),
+    '.zip': ('application/zip', (b'PK\x03\x04',)),
+}
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# What each kind of upload may contain and where it ends up.
+# `user_type` limits who can request a grant (None: any signed-in user).
+UPLOAD_KINDS = {
+    'resume': {
+        'field': 'resumes.Resume.file',
+        'max_size': 5 * MB,
+        'extensions': ('.pdf', '.doc', '.docx'),
+        'user_type': 'applicant',
+    },
+    'applicant_profile_image': {
+        'field': 'applicant_profile.ApplicantProfile.profile_image',
+        'max_size': 5 * MB,
+        'extensions': ('.jpg', '.jpeg', '.png', '.gif'),
+        'user_type': 'applicant',
+    },
+    'company_profile_image': {
+        'field': 'employer_profile.EmployerProfile.company_profile_image',
+        'max_size': 5 * MB,
+        'extensions': IMAGE_EXTENSIONS,
+        'user_type': 'employer',
+    },
+    'company_banner_image': {
+        'field': 'employer_profile.EmployerProfile.company_banner_image',
+        'max_size': 5 * MB,
+        'extensions': IMAGE_EXTENSIONS,
+        'user_type': 'employer',
+    },
+    'company_business_permit': {
+        'field': 'employer_profile.EmployerProfile.company_business_permit',
+        'max_size': 10 * MB,
+        'extensions': ('.pdf', '.jpg', '.jpeg', '.png'),
+        'user_type': 'employer',
+    },
+    'message_attachment': {
+        'field': 'dashboard.Message.attachment',
+        'max_size': 10 * MB,
+        'extensions': ('.pdf', '.doc', '.docx', '.txt', '.zip') + IMAGE_EXTENSIONS,
+        'user_type': None,
+    },
+}
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class UploadError(Exception):
+    """A grant or completion request that cannot be honoured; the message is shown to the user."""
+
+
+def get_kind(name):
+    try:
+        return UPLOAD_KINDS[name]
+    except KeyError:
+        raise UploadError('Unknown upload type.')
+
+
+def model_field(kind):
+    app_label, model_name, field_name = kind['field'].split('.')
+    return apps.get_model(app_label, model_name)._meta.get_field(field_name)
+
+
+def is_presigned_storage(storage):
+    """True when the storage is an S3 bucket the browser can upload to directly."""
+    try:
+        from storages.backends.s3boto3 import S3Boto3Storage
+    except ImportError:
+        return False
+    return isinstance(storage, S3Boto3Storage)
+
+
+def allowed_for(kind, user):
+    return kind['user_type'] is None or getattr(user, 'user_type', '') == kind['user_type']
+
+
+def object_key(kind, filename):
+    """A new, unguessable storage name under the field's upload_to directory."""
+    stem, extension = os.path.splitext(os.path.basename(filename))
+    stem = get_valid_filename(stem)[:30] or 'file'
+    return model_field(kind).generate_filename(None, f'{stem}_{uuid.uuid4().hex[:16]}{extension.lower()}')
+
+
+def issue_grant(kind_name, user, filename, size, sha256):
+    """
+    Validate an upload request and return the grant the browser needs:
+    {'grant', 'key', 'method', 'url', 'headers'}. Raises UploadError.
+    """
+    kind = get_kind(kind_name)
+    if not allowed_for(kind, user):
+        raise UploadError('You cannot upload this type of file.')
+
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in kind['extensions']:
+        allowed = ', '.join(ext.lstrip('.').upper() for ext in kind['extensions'])
+        raise UploadError(f'File type "{extension or filename}" is not allowed. Accepted: {allowed}.')
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError('Missing file size.')
+    if size <= 0:
+        raise UploadError('The file is empty.')
+    if size > kind['max_size']:
+        raise UploadError(f'File size ({round(size / MB, 2)}MB) exceeds the {kind["max_size"] // MB}MB limit.')
+    sha256 = (sha256 or '').lower()
+    if not SHA256_RE.match(sha256):
+        raise UploadError('Missing or malformed SHA-256 checksum.')
+
+    content_type = FILE_TYPES[extension][0]
+    key = object_key(kind, filename)
+    grant = signing.dumps({
+        'kind': kind_name,
+        'user': user.pk,
+        'key': key,
+        'size': size,
+        'sha256': sha256,
+        'content_type': content_type,
+    }, salt=GRANT_SALT, compress=True)
+
+    ttl = getattr(settings, 'DIRECT_UPLOAD_GRANT_TTL', 15 * 60)
+    storage = model_field(kind).storage
+    if is_presigned_storage(storage):
+        url, headers = presigned_put(storage, key, size, content_type, ttl)
+    else:
+        url = reverse('uploads:local_upload', kwargs={'grant': grant})
+        headers = {'Content-Type': content_type}
+    return {'grant': grant, 'key': key, 'method': 'PUT', 'url': url, 'headers': headers}
+
+
+# put_object parameters the browser has to send back as headers
+PARAM_HEADERS = {
+    'ContentType': 'Content-Type',
+    'ACL': 'x-amz-acl',
+    'CacheControl': 'Cache-Control',
+    'ContentDisposition': 'Content-Disposition',
+}
+
+
+def presigned_put(storage, key, size, content_type, ttl):
+    """
+    Presigned PUT URL for `key` in the storage's bucket, with the storage's
+    object parameters (ACL, Cache-Control). Content-Length is signed too,
+    so the upload must be exactly `size` bytes.
+    """
+    from storages.utils import clean_name
+
+    params = {
+        name: value for name, value in storage.get_object_parameters(key).items()
+        if name in PARAM_HEADERS
+    }
+    params['ContentType'] = content_type
+    if 'ACL' not in params and storage.default_acl:
+        params['ACL'] = storage.default_acl
+    headers = {PARAM_HEADERS[name]: value for name, value in params.items()}
+
+    url = storage.bucket.meta.client.generate_presigned_url(
+        'put_object',
+        Params={
+            'Bucket': storage.bucket_name,
+            'Key': storage._normalize_name(clean_name(key)),
+            'ContentLength': size,
+            **params,
+        },
+        ExpiresIn=ttl,
+        HttpMethod='PUT',
+    )
+    return url, headers
+
+
+def read_grant(grant, user=None):
+    """Decode a grant issued by issue_grant(); `user` must be the user it was issued to."""
+    max_age = getattr(settings, 'DIRECT_UPLOAD_GRANT_TTL', 15 * 60)
+    try:
+        data = signing.loads(grant, salt=GRANT_SALT, max_age=max_age)
+    except signing.SignatureExpired:
+        raise UploadError('The upload took too long. Please try again.')
+    except signing.BadSignature:
+        raise UploadError('Invalid upload grant.')
+    if user is not None and data['user'] != user.pk:
+        raise UploadError('Invalid upload grant.')
+    return data
+
+
+def hash_object(storage, key, chunk_size=64 * 1024):
+    """Stream a stored object. Returns (sha256 hex digest, first bytes)."""
+    digest = hashlib.sha256()
+    head = b''
+    with storage.open(key, 'rb') as f:
+        for chunk in f.chunks(chunk_size):
+            if len(head) < 16:
+                head += chunk[:16 - len(head)]
+            digest.update(chunk)
+    return digest.hexdigest(), head
+
+
+def verify_upload(grant, user):
+    """
+    Check the uploaded object against its grant and return a verified-upload
+    token for the form. A mismatching object is deleted. Raises UploadError.
+    """
+    data = read_grant(grant, user)
+    kind = get_kind(data['kind'])
+    storage = model_field(kind).storage
+    key = data['key']
+
+    try:
+        size = storage.size(key)
+    except (FileNotFoundError, OSError):
+        raise UploadError('The file has not been uploaded yet.')
+
+    extension = os.path.splitext(key)[1].lower()
+    signatures = FILE_TYPES[extension][1]
+    if size != data['size']:
+        problem = 'The uploaded file does not match the size that was declared.'
+    else:
+        sha256, head = hash_object(storage, key)
+        if signatures and not head.startswith(signatures):
+            problem = f'The file content does not look like a {extension.lstrip(".").upper()} file.'
+        elif sha256 != data['sha256']:
+            problem = 'The uploaded file is corrupted (checksum mismatch). Please try again.'
+        else:
+            problem = None
+    if problem:
+        storage.delete(key)
+        raise UploadError(problem)
+
+    return signing.dumps({'kind': data['kind'], 'user': data['user'], 'key': key}, salt=TOKEN_SALT)
+
+
+def read_upload_token(token, kind_name, user, instance=None):
+    """
+    Object key of a verified upload of `kind_name` by `user`. Raises UploadError,
+    also when a row other than `instance` already stores the key: two rows
+    sharing an object would lose it when either one's file is deleted.
+    """
+    max_age = getattr(settings, 'DIRECT_UPLOAD_TOKEN_MAX_AGE', 24 * 60 * 60)
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.SignatureExpired:
+        raise UploadError('The uploaded file has expired. Please upload it again.')
+    except signing.BadSignature:
+        raise UploadError('Invalid upload.')
+    if data['kind'] != kind_name or user is None or data['user'] != user.pk:
+        raise UploadError('Invalid upload.')
+
+    field = model_field(get_kind(kind_name))
+    used = field.model._default_manager.filter(**{field.name: data['key']})
+    if isinstance(instance, field.model) and instance.pk is not None:
+        used = used.exclude(pk=instance.pk)
+    if used.exists():
+        raise UploadError('This upload has already been used. Please upload the file again.')
+    return data['key']
@@ -0,0 +1,50 @@
+from .direct import UploadError, read_upload_token
+
+
+class DirectUploadFormMixin:
+    """
+    Lets file fields be filled by a direct-to-storage upload (uploads/direct.py).
+
+    `direct_upload_fields` maps form field names to upload kinds. When the data
+    carries `<field>_upload` (the token returned by uploads:complete) and no
+    file was posted for the field, the verified object key becomes the field's
+    cleaned value. Size and type were checked when the upload completed, so
+    clean_<field>() methods only validate posted files.
+
+    Pass `upload_user=request.user`: tokens issued to anyone else are rejected,
+    as are tokens whose key another row already stores.
+    The file inputs get a `data-upload-kind` attribute for direct_upload.js.
+    """
+    direct_upload_fields = {}
+
+    def __init__(self, *args, upload_user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.direct_uploads = {}
+        self._direct_upload_errors = {}
+        for name, kind in self.direct_upload_fields.items():
+            self.fields[name].widget.attrs['data-upload-kind'] = kind
+            if not self.is_bound or self.files.get(self.add_prefix(name)):
+                continue
+            token = self.data.get(self.add_prefix(name) + '_upload')
+            if not token:
+                continue
+            try:
+                self.direct_uploads[name] = read_upload_token(
+                    token, kind, upload_user, instance=getattr(self, 'instance', None),
+                )
+            except UploadError as e:
+                self._direct_upload_errors[name] = str(e)
+            self.fields[name].required = False
+
+    def has_direct_upload(self, name):
+        """True if an upload token was sent for `name`, valid or not."""
+        return name in self.direct_uploads or name in self._direct_upload_errors
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name, error in self._direct_upload_errors.items():
+            self.add_error(name, error)
+        for name, key in self.direct_uploads.items():
+            if name not in self.errors:
+                cleaned_data[name] = key
+        return cleaned_data
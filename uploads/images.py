@@ -0,0 +1,225 @@
+"""
+Resized variants of profile photos, company logos and banners.
+
+When one of the IMAGE_VARIANT_FIELDS changes, a background task
+(uploads.tasks.generate_image_variants) reads the original from storage and
+writes WebP and JPEG copies at each size next to it, e.g.
+    applicant_documents/profile_images/me.png
+    applicant_documents/profile_images/me__thumb.webp
+    applicant_documents/profile_images/me__thumb.jpg
+Their names and dimensions are recorded in the model's `<field>_variants`
+JSONField together with the original's name, so templates can build srcset
+attributes without touching storage ({% load image_variants %}), and stale
+variants of a replaced image are ignored. `manage.py generate_image_variants`
+backfills existing images.
+
+Uploads are untrusted: the file is read with a size limit and its header is
+checked against IMAGE_VARIANT_MAX_PIXELS before any pixel data is decoded.
+"""
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
+
+# Variant name -> longest side in pixels. Images are never upscaled.
+AVATAR_SIZES = {'thumb': 96, 'card': 240, 'full': 640}
+BANNER_SIZES = {'thumb': 480, 'card': 960, 'full': 1920}
+
+IMAGE_VARIANT_FIELDS = {
+    'applicant_profile.ApplicantProfile.profile_image': AVATAR_SIZES,
+    'employer_profile.EmployerProfile.company_profile_image': AVATAR_SIZES,
+    'employer_profile.EmployerProfile.company_banner_image': BANNER_SIZES,
+}
+
+# Output format -> (Pillow format, extension, save options)
+FORMATS = {
+    'webp': ('WEBP', '.webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', '.jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+class ImageVariantError(Exception):
+    pass
+
+
+def variant_fields(model):
+    """(field name, sizes) pairs of `model` that get image variants."""
+    label = model._meta.label
+    return [
+        (path.rsplit('.', 1)[1], sizes)
+        for path, sizes in IMAGE_VARIANT_FIELDS.items()
+        if path.rsplit('.', 1)[0] == label
+    ]
+
+
+def variants_are_current(instance, field_name):
+    image = getattr(instance, field_name)
+    variants = getattr(instance, f'{field_name}_variants') or {}
+    return bool(image) and variants.get('source') == image.name
+
+
+def read_image(image, max_bytes, chunk_size=64 * 1024):
+    """Read a stored image, refusing files larger than `max_bytes`."""
+    buffer = bytearray()
+    image.open('rb')
+    try:
+        for chunk in image.chunks(chunk_size):
+            buffer += chunk
+            if len(buffer) > max_bytes:
+                raise ImageVariantError(f'Image is larger than {max_bytes // (1024 * 1024)} MB.')
+    finally:
+        image.close()
+    return bytes(buffer)
+
+
+def open_image(data, max_pixels, largest_size):
+    """
+    Decode an image (first frame only) without trusting it: the pixel count is
+    checked from the header before decoding, and JPEGs are decoded at a reduced
+    scale when only a small variant is needed.
+    """
+    try:
+        img = Image.open(io.BytesIO(data))
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ImageVariantError(f'Not a readable image: {e}')
+    if img.format not in ('JPEG', 'PNG', 'GIF', 'WEBP'):
+        raise ImageVariantError(f'Unsupported image format {img.format}.')
+    width, height = img.size
+    if width * height > max_pixels:
+        raise ImageVariantError(f'Image is too large ({width}x{height} pixels).')
+
+    # Lets libjpeg decode at 1/2, 1/4 or 1/8 scale, never below what the largest variant needs
+    img.draft('RGB', (largest_size, largest_size))
+    try:
+        img.load()
+        img = ImageOps.exif_transpose(img)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        raise ImageVariantError(f'Could not decode image: {e}')
+
+    if img.mode in ('RGBA', 'LA', 'P'):
+        img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+    return img.convert('RGB')
+
+
+def resize(img, longest_side):
+    """Copy of `img` scaled to fit a `longest_side` square, or `img` itself if it already fits."""
+    if max(img.size) <= longest_side:
+        return img
+    resized = img.copy()
+    resized.thumbnail((longest_side, longest_side), Image.LANCZOS)
+    return resized
+
+
+def variant_name(source_name, variant, extension):
+    stem = os.path.splitext(source_name)[0]
+    return f'{stem}__{variant}{extension}'
+
+
+def build_variants(image, sizes):
+    """
+    Render and store every variant of a FieldFile. Returns the JSON recorded
+    on the model: {'source': name, 'variants': {name: {width, height, webp, jpeg}}}.
+    """
+    max_bytes = getattr(settings, 'IMAGE_VARIANT_MAX_BYTES', 10 * 1024 * 1024)
+    max_pixels = getattr(settings, 'IMAGE_VARIANT_MAX_PIXELS', 25 * 1000 * 1000)
+    img = open_image(read_image(image, max_bytes), max_pixels, max(sizes.values()))
+
+    storage = image.storage
+    variants = {}
+    rendered = {}
+    for variant, longest_side in sorted(sizes.items(), key=lambda item: item[1]):
+        resized = resize(img, longest_side)
+        if resized.size in rendered:
+            # The original is smaller than this size too: share the smaller variant's files
+            variants[variant] = dict(rendered[resized.size])
+            continue
+        entry = {'width': resized.width, 'height': resized.height}
+        for fmt, (pil_format, extension, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            name = variant_name(image.name, variant, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            entry[fmt] = storage.save(name, ContentFile(buffer.getvalue()))
+        rendered[resized.size] = entry
+        variants[variant] = entry
+    return {'source': image.name, 'variants': variants}
+
+
+def stored_variant_names(data):
+    names = set()
+    for entry in (data or {}).get('variants', {}).values():
+        names.update(entry.get(fmt) for fmt in FORMATS if entry.get(fmt))
+    return names
+
+
+def generate_image_variants(model_label, pk, field_name, force=False):
+    """
+    Create the variants of one image field and record them on the row.
+    Variants of a previous image are deleted. Images that cannot be processed
+    are recorded with an `error` and no variants. Returns the recorded JSON, or
+    None if there was nothing to do.
+    """
+    model = apps.get_model(model_label)
+    sizes = dict(variant_fields(model)).get(field_name)
+    if sizes is None:
+        raise ValueError(f'{model_label}.{field_name} has no image variants.')
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    image = getattr(instance, field_name)
+    variants_field = f'{field_name}_variants'
+    previous = getattr(instance, variants_field) or {}
+    if not image:
+        data = {}
+    elif variants_are_current(instance, field_name) and not force:
+        return None
+    else:
+        try:
+            data = build_variants(image, sizes)
+        except ImageVariantError as e:
+            logger.warning('No variants for %s %s %s: %s', model_label, pk, field_name, e)
+            data = {'source': image.name, 'error': str(e)[:255], 'variants': {}}
+
+    # Only record the variants if the image was not replaced meanwhile
+    if image:
+        unchanged = Q(**{field_name: image.name})
+    else:
+        unchanged = Q(**{field_name: ''}) | Q(**{f'{field_name}__isnull': True})
+    updated = model.objects.filter(unchanged, pk=pk).update(**{variants_field: data})
+    stale = stored_variant_names(previous) - stored_variant_names(data) if updated else stored_variant_names(data)
+    for name in stale:
+        image.storage.delete(name)
+    return data if updated else None
+
+
+def schedule_image_variants(instance, update_fields=None, replaced=()):
+    """
+    Queue variant generation for the changed image fields of a saved instance.
+    `replaced` names fields that received a new file, which may have kept the
+    old name (storages that overwrite).
+    """
+    from .tasks import generate_image_variants as task
+
+    for field_name, _sizes in variant_fields(type(instance)):
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        image = getattr(instance, field_name)
+        variants = getattr(instance, f'{field_name}_variants') or {}
+        if field_name in replaced:
+            task.enqueue(instance._meta.label, instance.pk, field_name, force=True)
+        elif image and not variants_are_current(instance, field_name):
+            task.enqueue(instance._meta.label, instance.pk, field_name)
+        elif not image and variants:
+            task.enqueue(instance._meta.label, instance.pk, field_name)
@@ -0,0 +1,48 @@
+"""
+Backfill resized variants for existing profile photos, logos and banners.
+
+Queues one task per image whose variants are missing or out of date (run a
+worker to process them), or generates them in this process with --inline:
+    python manage.py generate_image_variants
+    python manage.py generate_image_variants --inline
+    python manage.py generate_image_variants --force   # regenerate everything
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from uploads.images import IMAGE_VARIANT_FIELDS, generate_image_variants, variants_are_current
+from uploads.tasks import generate_image_variants as generate_task
+
+
+class Command(BaseCommand):
+    help = 'Generate missing resized variants of uploaded profile images, logos and banners.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inline', action='store_true', help='Generate here instead of queueing tasks.')
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that are already current.')
+
+    def handle(self, *args, **options):
+        total = 0
+        for path in IMAGE_VARIANT_FIELDS:
+            model_label, field_name = path.rsplit('.', 1)
+            model = apps.get_model(model_label)
+            rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True}).only(
+                'pk', field_name, f'{field_name}_variants'
+            ).order_by('pk')
+
+            count = 0
+            for instance in rows.iterator(chunk_size=500):
+                if variants_are_current(instance, field_name) and not options['force']:
+                    continue
+                if options['inline']:
+                    data = generate_image_variants(model_label, instance.pk, field_name, force=options['force'])
+                    if data and data.get('error'):
+                        self.stderr.write(f'{model_label} {instance.pk} {field_name}: {data["error"]}')
+                else:
+                    generate_task.enqueue(model_label, instance.pk, field_name, force=options['force'])
+                count += 1
+            self.stdout.write(f'{path}: {count} image(s)')
+            total += count
+
+        action = 'Processed' if options['inline'] else 'Queued'
+        self.stdout.write(self.style.SUCCESS(f'{action} {total} image(s).'))
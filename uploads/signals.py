@@ -0,0 +1,18 @@
+"""
+Signals that keep image variants (uploads/images.py) in step with their originals.
+"""
+from .images import schedule_image_variants, variant_fields
+
+
+def note_replaced_images(sender, instance, **kwargs):
+    """Remember which image fields are getting a new file (not yet committed to storage)."""
+    instance._replaced_images = {
+        name for name, _sizes in variant_fields(sender)
+        if not getattr(instance, name)._committed
+    }
+
+
+def queue_image_variants(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    schedule_image_variants(instance, update_fields, getattr(instance, '_replaced_images', ()))
@@ -0,0 +1,10 @@
+"""
+Background tasks for uploaded files (run by `manage.py run_worker`, see taskqueue).
+"""
+from taskqueue.queue import task
+
+
+@task(max_attempts=3)
+def generate_image_variants(model_label, pk, field_name, force=False):
+    from .images import generate_image_variants as generate
+    generate(model_label, pk, field_name, force=force)
@@ -0,0 +1,55 @@
+"""
+Template tags for resized image variants (uploads/images.py).
+
+    {% load image_variants %}
+    <img src="{% image_url profile.profile_image 'thumb' %}"
+         srcset="{% image_srcset profile.profile_image %}" sizes="48px" alt="">
+
+Both fall back to the original image until its variants have been generated.
+"""
+from django import template
+
+from uploads.images import FORMATS, variants_are_current
+
+
+register = template.Library()
+
+
+def _variants(image):
+    """The current variants of a FieldFile, or {} if there are none (yet)."""
+    instance = getattr(image, 'instance', None)
+    field = getattr(image, 'field', None)
+    if not image or instance is None or field is None:
+        return {}
+    if not hasattr(instance, f'{field.name}_variants') or not variants_are_current(instance, field.name):
+        return {}
+    return getattr(instance, f'{field.name}_variants').get('variants', {})
+
+
+def _original_url(image):
+    try:
+        return image.url if image else ''
+    except ValueError:
+        return ''
+
+
+@register.simple_tag
+def image_url(image, variant='full', fmt='jpeg'):
+    """URL of one variant of an image field (thumb, card or full), or of the original."""
+    entry = _variants(image).get(variant)
+    if not entry or fmt not in FORMATS or not entry.get(fmt):
+        return _original_url(image)
+    return image.storage.url(entry[fmt])
+
+
+@register.simple_tag
+def image_srcset(image, fmt='webp'):
+    """A srcset value listing every variant width, or the original URL when there are none."""
+    variants = _variants(image)
+    candidates = {}
+    for entry in variants.values():
+        if entry.get(fmt):
+            candidates[entry['width']] = image.storage.url(entry[fmt])
+    if not candidates:
+        return _original_url(image)
+    return ', '.join(f'{url} {width}w' for width, url in sorted(candidates.items()))
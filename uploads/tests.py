@@ -0,0 +1,86 @@
+import hashlib
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from .direct import UploadError, issue_grant, read_upload_token, verify_upload
+
+
+PDF = b'%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n'
+
+
+class DirectUploadTests(TestCase):
+    """The direct-upload flow (uploads/direct.py) against a local FileSystemStorage."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Before super(), which runs setUpTestData()
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        storage = override_settings(
+            MEDIA_ROOT=cls.media_root,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+        )
+        storage.enable()
+        cls.addClassCleanup(storage.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='uploader', email='uploader@example.com', password='x', user_type='applicant',
+        )
+
+    def upload(self, body, sha256=None, size=None):
+        """Request a resume grant and store `body` under its key, as the browser would."""
+        grant = issue_grant(
+            'resume', self.user, 'cv.pdf',
+            len(body) if size is None else size,
+            sha256 or hashlib.sha256(body).hexdigest(),
+        )
+        default_storage.save(grant['key'], ContentFile(body))
+        return grant
+
+    def assertRejected(self, grant, message):
+        with self.assertRaisesMessage(UploadError, message):
+            verify_upload(grant['grant'], self.user)
+        self.assertFalse(default_storage.exists(grant['key']))
+
+    def test_valid_upload_is_accepted(self):
+        grant = self.upload(PDF)
+        token = verify_upload(grant['grant'], self.user)
+        self.assertEqual(read_upload_token(token, 'resume', self.user), grant['key'])
+        self.assertTrue(default_storage.exists(grant['key']))
+        with default_storage.open(grant['key'], 'rb') as f:
+            self.assertEqual(f.read(), PDF)
+
+    def test_checksum_mismatch_is_rejected(self):
+        grant = self.upload(PDF, sha256=hashlib.sha256(b'other').hexdigest())
+        self.assertRejected(grant, 'checksum mismatch')
+
+    def test_wrong_content_is_rejected(self):
+        junk = b'not really a .pdf file' + b'.' * 32
+        grant = self.upload(junk)
+        self.assertRejected(grant, 'does not look like a PDF file')
+
+    def test_wrong_size_is_rejected(self):
+        grant = self.upload(PDF + b'extra', sha256=hashlib.sha256(PDF).hexdigest(), size=len(PDF))
+        self.assertRejected(grant, 'does not match the size that was declared')
+
+    def test_local_upload_checks_content_length(self):
+        grant = issue_grant('resume', self.user, 'cv.pdf', len(PDF), hashlib.sha256(PDF).hexdigest())
+        response = self.client.put(grant['url'], PDF + b'extra', content_type='application/pdf')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(default_storage.exists(grant['key']))
+
+        response = self.client.put(grant['url'], PDF, content_type='application/pdf')
+        self.assertEqual(response.status_code, 200)
+        token = verify_upload(grant['grant'], self.user)
+        self.assertEqual(read_upload_token(token, 'resume', self.user), grant['key'])
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = 'uploads'
+
+urlpatterns = [
+    path('grant/', views.grant_upload, name='grant'),
+    path('complete/', views.complete_upload, name='complete'),
+    path('local/<str:grant>/', views.local_upload, name='local_upload'),
+]
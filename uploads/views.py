@@ -0,0 +1,65 @@
+from django.contrib.auth.decorators import login_required
+from django.core.files import File
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods, require_POST
+
+from .direct import UploadError, get_kind, is_presigned_storage, issue_grant, model_field, read_grant, verify_upload
+
+
+@login_required
+@require_POST
+def grant_upload(request):
+    """Issue a short-lived grant to upload one file straight to storage."""
+    try:
+        grant = issue_grant(
+            request.POST.get('kind'),
+            request.user,
+            request.POST.get('filename', ''),
+            request.POST.get('size'),
+            request.POST.get('sha256'),
+        )
+    except UploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, **grant})
+
+
+@login_required
+@require_POST
+def complete_upload(request):
+    """Verify a finished direct upload and return the token its form accepts."""
+    try:
+        token = verify_upload(request.POST.get('grant', ''), request.user)
+    except UploadError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    return JsonResponse({'success': True, 'token': token})
+
+
+@csrf_exempt
+@require_http_methods(['PUT'])
+def local_upload(request, grant):
+    """
+    Stand-in for the bucket's presigned PUT when media is kept on local disk.
+    Like a presigned URL, the grant in the path is the only authorization.
+    """
+    try:
+        data = read_grant(grant)
+    except UploadError as e:
+        return HttpResponse(str(e), status=403, content_type='text/plain')
+
+    storage = model_field(get_kind(data['kind'])).storage
+    if is_presigned_storage(storage):
+        return HttpResponse('Upload to the bucket instead.', status=404, content_type='text/plain')
+    if request.META.get('CONTENT_LENGTH') != str(data['size']):
+        return HttpResponse('Content-Length does not match the grant.', status=400, content_type='text/plain')
+    if storage.exists(data['key']):
+        return HttpResponse('Already uploaded.', status=409, content_type='text/plain')
+
+    # Stream the request body into storage rather than reading it into memory
+    content = File(request, name=data['key'])
+    content.size = data['size']
+    saved = storage.save(data['key'], content)
+    if saved != data['key']:
+        storage.delete(saved)
+        return HttpResponse('Already uploaded.', status=409, content_type='text/plain')
+    return HttpResponse(status=200)
@@ -0,0 +1,211 @@
+"""
+Build-time static asset pipeline, run by `manage.py build_assets` before
+collectstatic (see build.sh).
+
+- Bundles: the stylesheets and scripts each layout loads (STATIC_BUNDLES) are
+  concatenated and minified into STATIC_BUILD_DIR/bundles/<name>.<css|js>.
+  {% bundle %} (dashboard/templatetags/assets.py) links the bundle once it has
+  been built and STATIC_BUNDLES_ENABLED is on, and the separate source files
+  otherwise, so development needs no build step.
+- Images: every PNG and JPEG in STATICFILES_DIRS gets WebP and AVIF copies
+  under STATIC_BUILD_DIR (img/Illustration.png -> img/Illustration.webp, ...)
+  when they are smaller, offered by {% static_picture %}.
+- BuildFinder hands STATIC_BUILD_DIR to collectstatic, and StaticAssetStorage
+  fingerprints every file through staticfiles.json and writes .gz and .br
+  copies next to it, which WhiteNoise serves with far-future cache headers.
+"""
+import io
+import os
+import posixpath
+import re
+from functools import lru_cache
+
+import rcssmin
+import rjsmin
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.finders import BaseFinder, FileSystemFinder
+from django.contrib.staticfiles.utils import get_files
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import FileSystemStorage
+from PIL import Image, features
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+BUNDLE_KINDS = ('css', 'js')
+STATIC_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# Output format -> (Pillow format, save options)
+STATIC_IMAGE_FORMATS = {
+    'avif': ('AVIF', {'quality': 60}),
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+}
+
+# url(...) references in stylesheets, quoted or not
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def build_dir():
+    return str(settings.STATIC_BUILD_DIR)
+
+
+def bundle_path(name, kind):
+    return f'bundles/{name}.{kind}'
+
+
+def bundle_sources(name, kind):
+    """The static paths making up one bundle, in load order."""
+    if kind not in BUNDLE_KINDS:
+        raise ImproperlyConfigured(f"Bundle kind must be one of {BUNDLE_KINDS}, not '{kind}'.")
+    try:
+        return list(settings.STATIC_BUNDLES[name].get(kind, ()))
+    except KeyError:
+        raise ImproperlyConfigured(f"No static bundle named '{name}' in STATIC_BUNDLES.")
+
+
+@lru_cache(maxsize=None)
+def built_size(path):
+    """Size of `path` as written by build_assets, or None (cached per process, cleared by the build)."""
+    try:
+        return os.path.getsize(os.path.join(build_dir(), path))
+    except OSError:
+        return None
+
+
+def is_built(path):
+    return built_size(path) is not None
+
+
+def built_image_variants(path):
+    """(format, path) of the built copies of a static image, smallest first."""
+    variants = [(fmt, image_variant_path(path, fmt)) for fmt in available_image_formats()]
+    return sorted(
+        ((fmt, variant) for fmt, variant in variants if is_built(variant)),
+        key=lambda item: built_size(item[1]),
+    )
+
+
+def rewrite_css_urls(css, source, target):
+    """Point relative url()s of the stylesheet at `source` at the same files from `target`."""
+    def rewrite(match):
+        quote, url = match.groups()
+        if url.startswith(('/', '#', 'data:')) or '://' in url:
+            return match.group(0)
+        absolute = posixpath.normpath(posixpath.join(posixpath.dirname(source), url))
+        return f'url({quote}{posixpath.relpath(absolute, posixpath.dirname(target))}{quote})'
+    return CSS_URL_RE.sub(rewrite, css)
+
+
+def build_bundle(name, kind):
+    """
+    Concatenate and minify one bundle into STATIC_BUILD_DIR. Returns
+    (path, size of the sources, size of the bundle) in bytes.
+    """
+    path = bundle_path(name, kind)
+    parts = []
+    source_bytes = 0
+    for source in bundle_sources(name, kind):
+        found = finders.find(source)
+        if not found:
+            raise ImproperlyConfigured(f"Static bundle '{name}' lists {source}, which does not exist.")
+        with open(found, encoding='utf-8') as f:
+            text = f.read()
+        source_bytes += len(text.encode())
+        if kind == 'css':
+            parts.append(rcssmin.cssmin(rewrite_css_urls(text, source, path)))
+        else:
+            # Each script ends its own statement, whatever its last line is
+            parts.append(rjsmin.jsmin(text).rstrip().rstrip(';') + ';')
+    output = '\n'.join(parts) + '\n'
+
+    target = os.path.join(build_dir(), path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write(output)
+    return path, source_bytes, len(output.encode())
+
+
+def build_bundles():
+    results = []
+    for name, kinds in settings.STATIC_BUNDLES.items():
+        for kind in BUNDLE_KINDS:
+            if kinds.get(kind):
+                results.append(build_bundle(name, kind))
+    built_size.cache_clear()
+    return results
+
+
+def image_variant_path(path, fmt):
+    return f'{os.path.splitext(path)[0]}.{fmt}'
+
+
+def available_image_formats():
+    return [fmt for fmt in STATIC_IMAGE_FORMATS if features.check(fmt)]
+
+
+def build_image_variants():
+    """
+    Write a WebP and an AVIF copy of each PNG and JPEG in STATICFILES_DIRS,
+    keeping a copy only if it is smaller than the original. Returns
+    (path, format, original size, variant size or None if dropped) tuples.
+    """
+    results = []
+    ignore_patterns = apps.get_app_config('staticfiles').ignore_patterns
+    for path, storage in FileSystemFinder().list(ignore_patterns):
+        if not path.lower().endswith(STATIC_IMAGE_EXTENSIONS):
+            continue
+        with storage.open(path) as f:
+            original = f.read()
+        with Image.open(io.BytesIO(original)) as image:
+            image.load()
+            for fmt in available_image_formats():
+                pil_format, options = STATIC_IMAGE_FORMATS[fmt]
+                buffer = io.BytesIO()
+                image.save(buffer, pil_format, **options)
+                target = os.path.join(build_dir(), image_variant_path(path, fmt))
+                if buffer.tell() < len(original):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with open(target, 'wb') as out:
+                        out.write(buffer.getvalue())
+                    results.append((path, fmt, len(original), buffer.tell()))
+                else:
+                    if os.path.exists(target):
+                        os.remove(target)
+                    results.append((path, fmt, len(original), None))
+    built_size.cache_clear()
+    return results
+
+
+class BuildFinder(BaseFinder):
+    """Finds the files build_assets wrote to STATIC_BUILD_DIR, if it has run."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=build_dir())
+
+    def find(self, path, all=False):
+        absolute = os.path.join(build_dir(), path)
+        if os.path.exists(absolute):
+            return [absolute] if all else absolute
+        return []
+
+    def list(self, ignore_patterns):
+        if not os.path.isdir(build_dir()):
+            return
+        for path in get_files(self.storage, ignore_patterns):
+            yield path, self.storage
+
+
+class StaticAssetStorage(CompressedManifestStaticFilesStorage):
+    """
+    Fingerprinted, gzip and brotli precompressed static files (WhiteNoise).
+    A template referring to a file that was never collected gets its plain
+    URL (and a 404) instead of failing the whole page.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
@@ -0,0 +1,69 @@
+"""
+Support for async views on Django 4.2, whose login_required,
+require_http_methods and lazy request.user only work in sync code.
+
+    @login_required
+    @require_GET
+    async def unread_count(request):
+        user = await aget_user(request)
+        count = await Notification.objects.filter(user=user, is_read=False).acount()
+        ...
+
+The decorators here accept sync and async views alike (sync views get
+Django's own). Once aget_user() has run, request.user can be read from async
+code without touching the session or the database.
+"""
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.decorators import login_required as sync_login_required
+from django.contrib.auth.middleware import get_user
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed
+from django.utils.log import log_response
+from django.views.decorators.http import require_http_methods as sync_require_http_methods
+
+
+async def aget_user(request):
+    """The request's user, loaded from the session in a thread on first use."""
+    if hasattr(request, '_cached_user'):
+        return request._cached_user
+    return await sync_to_async(get_user)(request)
+
+
+def login_required(view_func):
+    """django.contrib.auth's login_required, for async views as well."""
+    if not iscoroutinefunction(view_func):
+        return sync_login_required(view_func)
+
+    @wraps(view_func)
+    async def wrapped_view(request, *args, **kwargs):
+        user = await aget_user(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+    return wrapped_view
+
+
+def require_http_methods(request_method_list):
+    """django.views.decorators.http.require_http_methods, for async views as well."""
+    def decorator(view_func):
+        if not iscoroutinefunction(view_func):
+            return sync_require_http_methods(request_method_list)(view_func)
+
+        @wraps(view_func)
+        async def wrapped_view(request, *args, **kwargs):
+            if request.method not in request_method_list:
+                response = HttpResponseNotAllowed(request_method_list)
+                log_response(
+                    'Method Not Allowed (%s): %s', request.method, request.path,
+                    response=response, request=request,
+                )
+                return response
+            return await view_func(request, *args, **kwargs)
+        return wrapped_view
+    return decorator
+
+
+require_GET = require_http_methods(['GET'])
+require_POST = require_http_methods(['POST'])
@@ -2,11 +2,16 @@
 Caching utilities for JobConnect.
 Demonstrates Django's caching framework best practices.
 """
-from django.core.cache import cache
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.memcached import BaseMemcachedCache
+from django.core.cache.backends.redis import RedisCache
 from django.db.models import Count
 from functools import wraps
 import hashlib
 import json
+import time
 
 
 def make_cache_key(prefix, *args, **kwargs):
@@ -147,6 +152,45 @@ def get_or_set_cache(key, callable_func, timeout=300):
     return result
 
 
+def cache_version(key, backend=None):
+    """
+    Current value of the version counter stored under `key` (in the default
+    cache unless `backend` is given), starting a fresh one if there is none.
+    Entries whose keys include it are retired by bump_cache_version().
+    """
+    backend = backend or cache
+    version = backend.get(key)
+    if version is None:
+        # A new value rather than 0, so entries keyed on a version that was
+        # evicted cannot be picked up again
+        backend.add(key, time.time_ns(), None)
+        version = backend.get(key)
+    return version
+
+
+def bump_cache_version(key, backend=None):
+    """Replace the version counter under `key`, retiring every entry keyed on the old one."""
+    (backend or cache).set(key, time.time_ns(), None)
+
+
+# Backends whose entries every process (web workers, the task worker) sees
+SHARED_CACHE_BACKENDS = (RedisCache, BaseMemcachedCache, DatabaseCache)
+
+
+def shared_cache(alias=None):
+    """
+    The cache named `alias` (SHARED_CACHE_ALIAS by default) if every process
+    sees the same entries in it, else None. A per-process cache (LocMemCache)
+    cannot hold anything one process has to drop for all of them, such as a
+    session after logout or a user after a password change.
+    """
+    alias = alias or getattr(settings, 'SHARED_CACHE_ALIAS', 'shared')
+    if alias not in settings.CACHES:
+        return None
+    backend = caches[alias]
+    return backend if isinstance(backend, SHARED_CACHE_BACKENDS) else None
+
+
 # Example of per-user caching
 def get_user_notification_count(user_id):
     """
@@ -0,0 +1,86 @@
+"""
+Plain-text extraction from uploaded documents (PDF and DOCX).
+
+This module has no Django imports so it can run inside a short-lived worker
+process (see resumes/extraction.py), where a hung or hostile file can be killed
+without affecting the web or worker process.
+"""
+import io
+import re
+import unicodedata
+import zipfile
+from xml.etree import ElementTree
+
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+MAX_PDF_PAGES = 50
+
+# Upper bound for the uncompressed word/document.xml of a DOCX (zip bomb guard)
+MAX_DOCX_XML_BYTES = 20 * 1024 * 1024
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+SPACES_RE = re.compile(r'[ \t]+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+class DocumentTextError(Exception):
+    """The document could not be read or is not a supported format."""
+
+
+def extract_pdf_text(data, max_pages=MAX_PDF_PAGES):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise DocumentTextError('PDF support requires the pypdf package.')
+
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted and not reader.decrypt(''):
+        raise DocumentTextError('PDF is password protected.')
+    return '\n'.join(page.extract_text() or '' for page in reader.pages[:max_pages])
+
+
+def extract_docx_text(data, max_xml_bytes=MAX_DOCX_XML_BYTES):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        try:
+            info = archive.getinfo('word/document.xml')
+        except KeyError:
+            raise DocumentTextError('Not a Word document.')
+        if info.file_size > max_xml_bytes:
+            raise DocumentTextError('Document is too large to index.')
+        root = ElementTree.fromstring(archive.read(info))
+
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NS}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{WORD_NS}t')))
+    return '\n'.join(paragraphs)
+
+
+def extract_text(data, extension):
+    """Raw text of a PDF or DOCX file given as bytes. Raises DocumentTextError on failure."""
+    extension = extension.lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise DocumentTextError(f'Unsupported file type: {extension or "unknown"}')
+    try:
+        if extension == '.pdf':
+            return extract_pdf_text(data)
+        return extract_docx_text(data)
+    except DocumentTextError:
+        raise
+    except Exception as e:
+        # Parsers raise a wide range of errors on malformed files
+        raise DocumentTextError(f'Could not read {extension} file: {e.__class__.__name__}')
+
+
+def normalize_text(text, max_chars=None):
+    """NFKC-normalize, drop control characters and collapse whitespace."""
+    text = unicodedata.normalize('NFKC', text or '')
+    text = CONTROL_CHARS_RE.sub(' ', text.replace('\r\n', '\n').replace('\r', '\n'))
+    text = SPACES_RE.sub(' ', text)
+    text = BLANK_LINES_RE.sub('\n\n', text)
+    text = '\n'.join(line.strip() for line in text.split('\n')).strip()
+    if max_chars is not None:
+        text = text[:max_chars]
+    return text
@@ -0,0 +1,63 @@
+"""
+Cached HTML fragments keyed on the objects they show.
+
+{% cachefragment %} (jobs/templatetags/fragment_cache.py) keeps the rendered
+HTML of a template block under a key made of the fragment name, the model,
+pk, updated_at and recorded image variants of each object it is given, and
+the lookup registry version. Editing a job or an employer profile changes its
+updated_at and so its key, as does the worker recording new logo or banner
+variants (with update(), which leaves updated_at alone). Editing a lookup
+table (job types, categories, ...) which the fragments read through foreign
+keys bumps the registry version (see JobsConfig.ready), which retires every
+fragment at once. Old entries are never deleted, they expire after
+FRAGMENT_CACHE_TIMEOUT.
+
+The registry version lives in the shared cache (utils.caching.shared_cache)
+so a bump reaches every process. Without one it falls back to the default
+cache, which is per process: the others keep showing fragments with the old
+lookup names until those expire, i.e. for up to FRAGMENT_CACHE_TIMEOUT.
+
+Anything that depends on the viewer or the time (bookmarks, CSRF tokens,
+"3 days ago") must stay outside the cached block.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models
+
+from uploads.images import variant_fields
+from utils.caching import bump_cache_version, cache_version, shared_cache
+
+
+REGISTRY_VERSION_KEY = 'fragment:registry-version'
+
+
+def fragment_cache():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def registry_version():
+    return cache_version(REGISTRY_VERSION_KEY, shared_cache())
+
+
+def bump_registry_version(**kwargs):
+    """post_save/post_delete receiver for the lookup tables fragments read."""
+    bump_cache_version(REGISTRY_VERSION_KEY, shared_cache())
+
+
+def _key_part(value):
+    if isinstance(value, models.Model):
+        updated_at = getattr(value, 'updated_at', None)
+        part = f'{value._meta.label_lower}:{value.pk}:{updated_at.timestamp() if updated_at else ""}'
+        variants = [getattr(value, f'{name}_variants') for name, _sizes in variant_fields(type(value))]
+        if variants:
+            part += ':' + json.dumps(variants, sort_keys=True)
+        return part
+    return '' if value is None else str(value)
+
+
+def fragment_key(name, vary_on, version):
+    digest = hashlib.md5('|'.join(_key_part(value) for value in vary_on).encode()).hexdigest()
+    return f'fragment:{name}:{version}:{digest}'
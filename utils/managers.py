@@ -3,9 +3,19 @@ Custom Django managers and querysets for reusable query logic.
 Managers provide a clean interface for common database operations.
 """
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 
+def open_jobs_q(prefix=''):
+    """Jobs still taking applications: active and not past their deadline, even if not yet marked expired."""
+    today = timezone.localdate()
+    return models.Q(**{f'{prefix}status': 'active'}) & (
+        models.Q(**{f'{prefix}expiration_date__isnull': True}) |
+        models.Q(**{f'{prefix}expiration_date__gte': today})
+    )
+
+
 class ActiveJobManager(models.Manager):
     """Manager that returns only active jobs."""
     def get_queryset(self):
@@ -48,14 +58,42 @@ class JobQuerySet(models.QuerySet):
         ).distinct()
     
     def filter_by_salary_range(self, min_salary=None, max_salary=None):
-        """Filter jobs by salary range."""
+        """Filter jobs by yearly salary range (uses the annual_min/annual_max columns)."""
         qs = self
         if min_salary:
-            qs = qs.filter(min_salary__gte=min_salary)
+            qs = qs.filter(annual_min__gte=min_salary)
         if max_salary:
-            qs = qs.filter(max_salary__lte=max_salary)
+            qs = qs.filter(annual_max__lte=max_salary)
         return qs
 
+    def order_by_salary(self, descending=False):
+        """Order by yearly salary; jobs without a comparable salary sort last."""
+        if descending:
+            return self.order_by(models.F('annual_max').desc(nulls_last=True), '-posted_at')
+        return self.order_by(models.F('annual_min').asc(nulls_last=True), '-posted_at')
+
+    def update_annual_salaries(self):
+        """
+        Bulk backfill annual_min/annual_max with one UPDATE per salary type.
+        Returns the number of rows updated.
+        """
+        from jobs.models import SALARY_PERIODS_PER_YEAR
+
+        low = Coalesce('min_salary', 'max_salary')
+        high = Coalesce('max_salary', 'min_salary')
+
+        updated = self.filter(salary_type__isnull=True).update(annual_min=low, annual_max=high)
+        for code, multiplier in SALARY_PERIODS_PER_YEAR.items():
+            updated += self.filter(salary_type__code=code).update(
+                annual_min=low * multiplier,
+                annual_max=high * multiplier,
+            )
+        # Salary types without a yearly equivalent (e.g. fixed fee)
+        updated += self.filter(salary_type__isnull=False).exclude(
+            salary_type__code__in=SALARY_PERIODS_PER_YEAR.keys()
+        ).update(annual_min=None, annual_max=None)
+        return updated
+
 
 class JobManager(models.Manager):
     """Enhanced manager for Job model with custom QuerySet."""
@@ -109,3 +147,77 @@ class NotificationManager(models.Manager):
     
     def recent(self, limit=20):
         return self.get_queryset().recent(limit)
+
+
+class UserVerificationManager(models.Manager):
+    """Manager for UserVerification with bulk status changes."""
+
+    def set_status(self, user_ids, status, admin_verifier=None, notes=''):
+        """
+        Give every user in `user_ids` the verification `status` in one
+        INSERT ... ON CONFLICT DO UPDATE, creating the missing records.
+        Returns the number of users updated.
+        """
+        from accounts.backends import invalidate_identity
+
+        user_ids = list(user_ids)
+        now = timezone.now()
+        records = [
+            self.model(
+                user_id=user_id,
+                status=status,
+                admin_verifier=admin_verifier,
+                verification_date=now,
+                notes=notes,
+            )
+            for user_id in user_ids
+        ]
+        self.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['status', 'admin_verifier', 'verification_date', 'notes'],
+        )
+        # bulk_create sends no post_save, so cached identities are dropped here
+        for user_id in user_ids:
+            invalidate_identity(user_id)
+        return len(records)
+
+
+class ApplicationStageTransitionManager(models.Manager):
+    """Manager for the append-only ApplicationStageTransition log."""
+
+    def record(self, application, from_stage, to_stage, moved_by=None, hired=False):
+        """
+        Log `application` moving from `from_stage` to `to_stage` (None is the
+        "All Applications" column). Moves that change nothing are not logged.
+        Returns the new transition, or None.
+        """
+        from_id = from_stage.pk if from_stage else None
+        to_id = to_stage.pk if to_stage else None
+        if from_id == to_id and not hired:
+            return None
+        transition = self._transition(application, from_stage, to_stage, moved_by, hired)
+        transition.save(force_insert=True, using=self.db)
+        return transition
+
+    def record_many(self, applications, from_stage, to_stage, moved_by=None):
+        """Log a bulk move of `applications` from `from_stage` to `to_stage` in one INSERT."""
+        if (from_stage.pk if from_stage else None) == (to_stage.pk if to_stage else None):
+            return []
+        return self.bulk_create([
+            self._transition(application, from_stage, to_stage, moved_by)
+            for application in applications
+        ])
+
+    def _transition(self, application, from_stage, to_stage, moved_by=None, hired=False):
+        return self.model(
+            application=application,
+            job_id=application.job_id,
+            from_stage=from_stage,
+            to_stage=to_stage,
+            from_stage_name=from_stage.name if from_stage else '',
+            to_stage_name=to_stage.name if to_stage else '',
+            hired=hired,
+            moved_by=moved_by,
+        )
@@ -8,10 +8,43 @@ from django.shortcuts import redirect
 from django.contrib import messages
 from django.urls import reverse_lazy
 from functools import wraps
-from django.contrib.auth.decorators import login_required
+
+from asgiref.sync import iscoroutinefunction
+
+from utils.async_views import aget_user, login_required
+from utils.permissions import ADMIN, APPLICANT, EMPLOYER, ROLE_DENIED_MESSAGES, has_role
 
 
 # Decorator versions for function-based views
+def role_required(role):
+    """
+    Decorator factory behind employer_required, applicant_required and
+    admin_required. The role is also recorded on the view as `required_role`,
+    which the route permission table (utils/permissions.py) reads. Works on
+    async views too.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            @login_required
+            async def wrapped_view(request, *args, **kwargs):
+                if not has_role(await aget_user(request), role):
+                    messages.error(request, ROLE_DENIED_MESSAGES[role])
+                    return redirect('dashboard:dashboard')
+                return await view_func(request, *args, **kwargs)
+        else:
+            @wraps(view_func)
+            @login_required
+            def wrapped_view(request, *args, **kwargs):
+                if not has_role(request.user, role):
+                    messages.error(request, ROLE_DENIED_MESSAGES[role])
+                    return redirect('dashboard:dashboard')
+                return view_func(request, *args, **kwargs)
+        wrapped_view.required_role = role
+        return wrapped_view
+    return decorator
+
+
 def employer_required(view_func):
     """
     Decorator that requires the user to be authenticated and have employer user type.
@@ -22,14 +55,7 @@ def employer_required(view_func):
         def my_view(request):
             ...
     """
-    @wraps(view_func)
-    @login_required
-    def wrapped_view(request, *args, **kwargs):
-        if request.user.user_type != 'employer':
-            messages.error(request, 'Access denied. Employer account required.')
-            return redirect('dashboard:dashboard')
-        return view_func(request, *args, **kwargs)
-    return wrapped_view
+    return role_required(EMPLOYER)(view_func)
 
 
 def applicant_required(view_func):
@@ -42,14 +68,7 @@ def applicant_required(view_func):
         def my_view(request):
             ...
     """
-    @wraps(view_func)
-    @login_required
-    def wrapped_view(request, *args, **kwargs):
-        if request.user.user_type != 'applicant':
-            messages.error(request, 'Access denied. Applicant account required.')
-            return redirect('dashboard:dashboard')
-        return view_func(request, *args, **kwargs)
-    return wrapped_view
+    return role_required(APPLICANT)(view_func)
 
 
 def admin_required(view_func):
@@ -62,65 +81,50 @@ def admin_required(view_func):
         def my_view(request):
             ...
     """
-    @wraps(view_func)
-    @login_required
-    def wrapped_view(request, *args, **kwargs):
-        if not (request.user.is_staff or request.user.user_type == 'admin'):
-            messages.error(request, 'Access denied. Admin privileges required.')
-            return redirect('dashboard:dashboard')
-        return view_func(request, *args, **kwargs)
-    return wrapped_view
+    return role_required(ADMIN)(view_func)
 
 
-class EmployerRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+class RoleRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     """
-    Mixin that requires the user to be authenticated and have employer user type.
-    Redirects to login if not authenticated, or shows error if wrong user type.
+    Mixin that requires the user to be authenticated and meet `required_role`
+    (see utils/permissions.py). Redirects to login if not authenticated, or
+    shows error if the role does not match.
     """
     login_url = reverse_lazy('accounts:login')
-    
+    required_role = None
+
     def test_func(self):
-        return self.request.user.user_type == 'employer'
-    
+        return has_role(self.request.user, self.required_role)
+
     def handle_no_permission(self):
         if not self.request.user.is_authenticated:
             return super().handle_no_permission()
-        messages.error(self.request, 'Access denied. Employer account required.')
+        messages.error(self.request, ROLE_DENIED_MESSAGES[self.required_role])
         return redirect('dashboard:dashboard')
 
 
-class ApplicantRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+class EmployerRequiredMixin(RoleRequiredMixin):
+    """
+    Mixin that requires the user to be authenticated and have employer user type.
+    Redirects to login if not authenticated, or shows error if wrong user type.
+    """
+    required_role = EMPLOYER
+
+
+class ApplicantRequiredMixin(RoleRequiredMixin):
     """
     Mixin that requires the user to be authenticated and have applicant user type.
     Redirects to login if not authenticated, or shows error if wrong user type.
     """
-    login_url = reverse_lazy('accounts:login')
-    
-    def test_func(self):
-        return self.request.user.user_type == 'applicant'
-    
-    def handle_no_permission(self):
-        if not self.request.user.is_authenticated:
-            return super().handle_no_permission()
-        messages.error(self.request, 'Access denied. Applicant account required.')
-        return redirect('dashboard:dashboard')
+    required_role = APPLICANT
 
 
-class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+class AdminRequiredMixin(RoleRequiredMixin):
     """
     Mixin that requires the user to be authenticated and be an admin/staff user.
     Redirects to login if not authenticated, or shows error if not admin.
     """
-    login_url = reverse_lazy('accounts:login')
-    
-    def test_func(self):
-        return self.request.user.is_staff or self.request.user.user_type == 'admin'
-    
-    def handle_no_permission(self):
-        if not self.request.user.is_authenticated:
-            return super().handle_no_permission()
-        messages.error(self.request, 'Access denied. Admin privileges required.')
-        return redirect('dashboard:dashboard')
+    required_role = ADMIN
 
 
 class JobOwnerRequiredMixin(UserPassesTestMixin):
@@ -182,3 +186,63 @@ class AjaxResponseMixin:
                 'errors': form.errors
             }, status=400)
         return response
+
+
+class SearchSnapshotMixin:
+    """
+    Mixin for ListViews that paginate search results through a cached ID snapshot.
+
+    The first request runs get_queryset() once as an ID-only query and caches the
+    ordered IDs (see utils.search_cache). Following pages reuse the snapshot named
+    by the `snapshot` query parameter and load only the page's rows through
+    get_hydration_queryset().
+    """
+    snapshot_prefix = 'search'
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        from django.conf import settings
+        from utils.pagination import CappedCountPaginator
+
+        kwargs.setdefault('count_limit', getattr(settings, 'SEARCH_SNAPSHOT_MAX_RESULTS', 10000))
+        return CappedCountPaginator(queryset, per_page, **kwargs)
+
+    def get_hydration_queryset(self):
+        """
+        Queryset (joins, annotations) used to load the rows of one page. It should
+        repeat the listing's base filter, so rows that stopped matching after the
+        snapshot was taken are dropped from the page.
+        """
+        return self.model._default_manager.all()
+
+    def get_result_ids(self, queryset):
+        from django.conf import settings
+        from utils.search_cache import filters_hash, load_result_ids, store_result_ids
+
+        search_hash = filters_hash(self.snapshot_prefix, self.request.GET)
+        token = self.request.GET.get('snapshot', '')
+        ids = load_result_ids(search_hash, token)
+        if ids is None:
+            # One ID past the limit so the paginator can tell the list was capped
+            max_results = getattr(settings, 'SEARCH_SNAPSHOT_MAX_RESULTS', 10000)
+            ids = list(queryset.values_list('id', flat=True)[:max_results + 1])
+            token = store_result_ids(search_hash, ids)
+        self.snapshot_token = token
+        return ids
+
+    def paginate_queryset(self, queryset, page_size):
+        from utils.search_cache import hydrate
+
+        ids = self.get_result_ids(queryset)
+        paginator = self.get_paginator(
+            ids, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # get_page() falls back to the first/last page for malformed or out-of-range numbers
+        page = paginator.get_page(self.request.GET.get(self.page_kwarg))
+        page.object_list = hydrate(self.get_hydration_queryset(), page.object_list)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['snapshot'] = getattr(self, 'snapshot_token', '')
+        return context
@@ -0,0 +1,230 @@
+"""
+Pagination helpers for large listings.
+
+Keyset ("seek") pagination walks an ordered queryset with a cursor made of the
+last row's sort key and primary key, so every page costs the same no matter how
+deep the user browses, unlike OFFSET-based pages.
+
+CappedCountPaginator keeps Django's numbered pages but stops counting exactly
+once a listing grows past COUNT_LIMIT rows.
+"""
+import base64
+import json
+from math import ceil
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+
+def bounded_count(queryset, limit):
+    """
+    Count rows up to `limit` + 1 and stop there.
+    Returns (count, is_capped); when capped, the real total is larger than `limit`.
+    """
+    count = queryset.order_by()[:limit + 1].count()
+    if count > limit:
+        return limit, True
+    return count, False
+
+
+def estimate_count(queryset):
+    """
+    Row estimate for `queryset` from the PostgreSQL planner (EXPLAIN), without running it.
+    Returns None on other databases or when the plan cannot be read.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]['Plan']['Plan Rows'])
+    except (LookupError, TypeError, ValueError):
+        return None
+
+
+def capped_count(queryset, limit=None):
+    """
+    Count `queryset` exactly up to `limit` rows (PAGINATION_COUNT_LIMIT by
+    default). Returns (count, is_capped, is_estimated): past the limit the count
+    is the planner estimate when there is one, else the limit itself.
+    """
+    if limit is None:
+        limit = getattr(settings, 'PAGINATION_COUNT_LIMIT', 10000)
+    total, capped = bounded_count(queryset, limit)
+    if not capped:
+        return total, False, False
+    estimate = estimate_count(queryset)
+    if estimate is not None and estimate > limit:
+        return estimate, True, True
+    return total, True, False
+
+
+class CappedCountPaginator(Paginator):
+    """
+    Paginator that counts exactly only up to `count_limit` rows.
+
+    Past the limit the count is the PostgreSQL planner estimate (or the limit itself
+    elsewhere), `count_capped` is set and templates should show `display_count`
+    ("10,000+"). Plain lists are capped the same way, so callers can pass
+    `count_limit + 1` IDs to signal "more than the limit". Numbered pages only
+    reach as far as `count_limit` rows, since an estimate can be too high.
+    The count is computed once per paginator; views should read `paginator.count`
+    instead of counting the queryset again.
+    """
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True,
+                 count_limit=None):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        if count_limit is None:
+            count_limit = getattr(settings, 'PAGINATION_COUNT_LIMIT', 10000)
+        self.count_limit = count_limit
+        self.count_capped = False
+        self.count_estimated = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            total = len(self.object_list)
+            if total > self.count_limit:
+                self.count_capped = True
+                return self.count_limit
+            return total
+
+        total, self.count_capped, self.count_estimated = capped_count(self.object_list, self.count_limit)
+        return total
+
+    @cached_property
+    def num_pages(self):
+        if self.count and self.count_capped:
+            # Only the first count_limit rows are known to exist
+            return ceil(self.count_limit / int(self.per_page))
+        return super().num_pages
+
+    @property
+    def display_count(self):
+        """Human-readable total: exact below the limit, "10,000+" above it."""
+        if self.count and self.count_capped:
+            return f'{self.count_limit:,}+'
+        return f'{self.count:,}'
+
+
+def encode_cursor(values):
+    """Encode a list of JSON-serializable sort-key values as an opaque URL-safe token."""
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token from encode_cursor(); returns None for missing or malformed tokens."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class KeysetPage:
+    """One page of keyset-paginated results."""
+
+    def __init__(self, object_list, next_cursor, cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.cursor = cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self):
+        return not self.cursor
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by (sort_field, pk) instead of OFFSET.
+
+    `sort_field` is a model field name or a non-null annotation; `descending`
+    applies to both the sort field and the pk tie-breaker. Nullable sort fields
+    are ordered NULLS LAST. Annotations need `parse_value` to turn a decoded
+    cursor value back into a query parameter (e.g. float for a search rank).
+    """
+
+    def __init__(self, queryset, per_page, sort_field='posted_at', descending=True, parse_value=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.sort_field = sort_field
+        self.descending = descending
+        try:
+            field = queryset.model._meta.get_field(sort_field)
+        except FieldDoesNotExist:
+            field = None
+        self.nullable = field is not None and field.null
+        self.parse_value = parse_value or field.to_python
+
+    def get_ordering(self):
+        if not self.nullable:
+            # Plain ordering so the database can use an existing index on the field
+            prefix = '-' if self.descending else ''
+            return (f'{prefix}{self.sort_field}', f'{prefix}pk')
+        if self.descending:
+            return (F(self.sort_field).desc(nulls_last=True), '-pk')
+        return (F(self.sort_field).asc(nulls_last=True), 'pk')
+
+    def _after(self, value, pk):
+        """Filter for rows that come strictly after (value, pk) in the page ordering."""
+        op = 'lt' if self.descending else 'gt'
+        if value is None:
+            # Already in the trailing NULL block: only the pk tie-breaker remains
+            return Q(**{f'{self.sort_field}__isnull': True, f'pk__{op}': pk})
+        condition = (
+            Q(**{f'{self.sort_field}__{op}': value}) |
+            Q(**{self.sort_field: value, f'pk__{op}': pk})
+        )
+        if self.nullable:
+            condition |= Q(**{f'{self.sort_field}__isnull': True})
+        return condition
+
+    def page(self, cursor=None):
+        qs = self.queryset.order_by(*self.get_ordering())
+
+        values = decode_cursor(cursor)
+        if values and len(values) == 2:
+            try:
+                value = None if values[0] is None else self.parse_value(values[0])
+                pk = int(values[1])
+            except (ValueError, TypeError, ValidationError):
+                value = pk = None
+            if pk is not None:
+                qs = qs.filter(self._after(value, pk))
+        else:
+            cursor = None
+
+        rows = list(qs[:self.per_page + 1])
+        next_cursor = None
+        if len(rows) > self.per_page:
+            rows = rows[:self.per_page]
+            last = rows[-1]
+            next_cursor = encode_cursor([getattr(last, self.sort_field), last.pk])
+        return KeysetPage(rows, next_cursor, cursor)
@@ -0,0 +1,129 @@
+"""
+Which role each URL route requires, compiled once into a dict keyed by the
+resolved view name (e.g. 'dashboard:employer_my_jobs').
+
+A route's requirement comes from, in order:
+- ROUTE_NAME_ROLES, for routes that differ from their prefix,
+- ROUTE_PREFIX_ROLES, matched against the route's full pattern
+  ('dashboard/employer/...'), so a view that forgets its decorator or mixin
+  under a protected prefix is still protected,
+- the role declared by the view itself through the decorators and mixins in
+  utils/mixins.py (`required_role`), or AUTHENTICATED for login_required /
+  LoginRequiredMixin views.
+
+RoleBasedAccessMiddleware looks the current route up with one dict access per
+request. check_route_permissions() (a system check registered by the
+dashboard app) fails when a dashboard route has no requirement or when a
+view's own role disagrees with the table; dashboard/tests.py runs it too.
+"""
+from functools import lru_cache
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core import checks
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+APPLICANT = 'applicant'
+EMPLOYER = 'employer'
+ADMIN = 'admin'
+# Any signed-in user; nothing for the middleware to check
+AUTHENTICATED = 'authenticated'
+
+ROLE_DENIED_MESSAGES = {
+    APPLICANT: 'Access denied. Applicant account required.',
+    EMPLOYER: 'Access denied. Employer account required.',
+    ADMIN: 'Access denied. Admin privileges required.',
+}
+
+# Full route prefixes and the role everything under them requires
+ROUTE_PREFIX_ROLES = (
+    ('dashboard/admin/', ADMIN),
+    ('dashboard/applicant/', APPLICANT),
+    ('dashboard/employer/', EMPLOYER),
+    ('applicant/setup/', APPLICANT),
+    ('employer/setup/', EMPLOYER),
+)
+
+# Routes whose requirement is not their prefix's, or that are not under one
+ROUTE_NAME_ROLES = {
+    # Company pages are for applicants; the employer's own page is employer_profile
+    'dashboard:public_employer_profile': APPLICANT,
+    'dashboard:messages_unread_counts': AUTHENTICATED,
+}
+
+# Namespaces in which every route must have a requirement
+COVERED_NAMESPACES = ('dashboard',)
+
+
+def has_role(user, role):
+    """Whether the signed-in `user` meets `role`."""
+    if role == ADMIN:
+        return user.is_staff or getattr(user, 'user_type', '') == 'admin'
+    if role in (APPLICANT, EMPLOYER):
+        return getattr(user, 'user_type', '') == role
+    return True
+
+
+def view_role(callback):
+    """The role a view declares through its decorator or mixin, or None."""
+    view_class = getattr(callback, 'view_class', None)
+    if view_class is not None:
+        role = getattr(view_class, 'required_role', None)
+        if role is None and issubclass(view_class, LoginRequiredMixin):
+            return AUTHENTICATED
+        return role
+    return getattr(callback, 'required_role', None)
+
+
+def iter_routes(resolver=None, prefix='', namespaces=()):
+    """Yields (view_name, route, callback) for every named URL pattern."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            nested = namespaces + (pattern.namespace,) if pattern.namespace else namespaces
+            yield from iter_routes(pattern, route, nested)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield ':'.join(namespaces + (pattern.name,)), route, pattern.callback
+
+
+def table_role(view_name, route):
+    """Requirement of a route from ROUTE_NAME_ROLES / ROUTE_PREFIX_ROLES, or None."""
+    if view_name in ROUTE_NAME_ROLES:
+        return ROUTE_NAME_ROLES[view_name]
+    for route_prefix, role in ROUTE_PREFIX_ROLES:
+        if route.startswith(route_prefix):
+            return role
+    return None
+
+
+@lru_cache(maxsize=None)
+def route_roles(urlconf=None):
+    """{view_name: role} for every route with a requirement, compiled once per URLconf."""
+    roles = {}
+    for view_name, route, callback in iter_routes(get_resolver(urlconf)):
+        role = table_role(view_name, route) or view_role(callback)
+        if role is not None:
+            roles.setdefault(view_name, role)
+    return roles
+
+
+def check_route_permissions(app_configs=None, **kwargs):
+    errors = []
+    for view_name, route, callback in iter_routes():
+        role = table_role(view_name, route)
+        declared = view_role(callback)
+        namespace = view_name.rpartition(':')[0]
+        if role is None and declared is None and namespace in COVERED_NAMESPACES:
+            errors.append(checks.Error(
+                f"Route '{view_name}' ({route}) has no role requirement.",
+                hint='Protect the view with a decorator or mixin from utils.mixins, '
+                     'or add the route to utils.permissions.ROUTE_NAME_ROLES.',
+                id='utils.E001',
+            ))
+        elif role is not None and declared not in (None, AUTHENTICATED, role):
+            errors.append(checks.Error(
+                f"Route '{view_name}' ({route}) requires '{role}' but its view requires '{declared}'.",
+                id='utils.E002',
+            ))
+    return errors
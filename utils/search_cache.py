@@ -0,0 +1,83 @@
+"""
+Search snapshots: cached, ordered result-ID lists for paginated searches.
+
+The first page of a search runs the filtered query once and stores the ordered
+job IDs under a hash of the normalized filters plus a random snapshot token.
+Later pages slice that list and only load the rows for the requested page, so
+pagination is cheap and results do not shift while new jobs are posted.
+"""
+from array import array
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+# Query parameters that select a page of a search rather than the search itself
+NON_FILTER_PARAMS = ('page', 'snapshot', 'partial')
+
+
+def normalize_filters(params, ignore=NON_FILTER_PARAMS):
+    """
+    Build a stable, order-independent representation of search filters.
+    Accepts a QueryDict (or plain dict); empty values and paging params are dropped.
+    """
+    normalized = []
+    keys = params.keys()
+    for key in sorted(keys):
+        if key in ignore:
+            continue
+        if hasattr(params, 'getlist'):
+            values = params.getlist(key)
+        else:
+            values = params[key]
+            values = values if isinstance(values, (list, tuple)) else [values]
+        values = sorted(str(v).strip().lower() for v in values if str(v).strip())
+        if values:
+            normalized.append((key, tuple(values)))
+    return tuple(normalized)
+
+
+def filters_hash(prefix, params):
+    """Return a short hash identifying a normalized set of search filters."""
+    key_data = f"{prefix}:{normalize_filters(params)}"
+    return hashlib.md5(key_data.encode()).hexdigest()
+
+
+def _snapshot_key(search_hash, token):
+    return f'search_snapshot:{search_hash}:{token}'
+
+
+def store_result_ids(search_hash, ids, timeout=None):
+    """
+    Store an ordered ID list as a compact array and return its snapshot token.
+    Lists are truncated to SEARCH_SNAPSHOT_MAX_RESULTS + 1 IDs; the extra ID tells
+    CappedCountPaginator that the search matched more than the limit.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'SEARCH_SNAPSHOT_TTL', 600)
+    max_results = getattr(settings, 'SEARCH_SNAPSHOT_MAX_RESULTS', 10000)
+
+    token = secrets.token_urlsafe(8)
+    cache.set(_snapshot_key(search_hash, token), array('q', ids[:max_results + 1]), timeout)
+    return token
+
+
+def load_result_ids(search_hash, token):
+    """Return the cached ID array for a snapshot, or None if it expired or never existed."""
+    if not token:
+        return None
+    return cache.get(_snapshot_key(search_hash, token))
+
+
+def hydrate(queryset, ids):
+    """
+    Load the rows for `ids` with a single id__in query, preserving the order of `ids`.
+    IDs whose rows have since been deleted, or no longer match `queryset`, are skipped.
+    """
+    ids = list(ids)
+    if not ids:
+        return []
+    objects = queryset.in_bulk(ids)
+    return [objects[pk] for pk in ids if pk in objects]
@@ -0,0 +1,116 @@
+"""
+Session engine: the django_session table, fronted by the shared cache when
+there is one.
+
+With a shared cache under SESSION_CACHE_ALIAS (Redis, see
+utils.caching.shared_cache) it is built on Django's cached_db engine, so a
+request whose session is in the cache reads nothing from the database, and a
+miss loads the row once and caches it. Otherwise it is built on the plain db
+engine: in a per-process cache, a logout or cycle_key() would only drop the
+session in the process that handled it, and every other one would keep
+accepting the old key until it expired. Either way:
+
+- a session is only written back when its data actually changed, not every
+  time a view assigns a key (e.g. the same value again),
+- views decorated with @session_readonly (polling endpoints) never write it,
+- expired rows are deleted in batches (prune_expired_sessions(), used by
+  `manage.py prune_sessions` and Django's own `clearsessions`).
+
+Enabled with SESSION_ENGINE = 'utils.sessions'.
+"""
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.utils import timezone
+
+from utils.caching import shared_cache
+
+
+PRUNE_BATCH_SIZE = 5000
+
+BaseSessionStore = CachedDBStore if shared_cache(settings.SESSION_CACHE_ALIAS) is not None else DBStore
+
+
+class SessionStore(BaseSessionStore):
+    # Set by @session_readonly: keep whatever the view does out of storage
+    readonly = False
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._loaded_state = None
+
+    def _state(self):
+        return self.serializer().dumps(self._session)
+
+    def load(self):
+        data = super().load()
+        self._loaded_state = self.serializer().dumps(data)
+        return data
+
+    def save(self, must_create=False):
+        if not must_create:
+            if self.readonly:
+                return
+            if self._loaded_state is not None and self._state() == self._loaded_state:
+                # Marked modified, but holds what was loaded
+                return
+        super().save(must_create)
+        self._loaded_state = self._state()
+
+    @classmethod
+    def clear_expired(cls):
+        prune_expired_sessions()
+
+
+def prune_expired_sessions(batch_size=PRUNE_BATCH_SIZE, pause=0):
+    """
+    Delete expired rows of the session table `batch_size` at a time, sleeping
+    `pause` seconds between batches so a large backlog does not hold long locks.
+    Returns the number of sessions deleted.
+    """
+    model = SessionStore.get_model_class()
+    deleted = 0
+    while True:
+        keys = list(
+            model.objects.filter(expire_date__lt=timezone.now())
+            .order_by('expire_date').values_list('session_key', flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        deleted += model.objects.filter(session_key__in=keys).delete()[0]
+        if len(keys) < batch_size:
+            return deleted
+        if pause:
+            time.sleep(pause)
+
+
+def session_readonly(view_func):
+    """
+    Never save the session from this view, whatever it touches. For endpoints
+    polled in the background, which have no reason to write it.
+
+    Usage:
+        @session_readonly
+        def unread_count(request):
+            ...
+    """
+    def mark_readonly(request):
+        session = getattr(request, 'session', None)
+        if session is not None:
+            session.readonly = True
+
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def wrapped_view(request, *args, **kwargs):
+            mark_readonly(request)
+            return await view_func(request, *args, **kwargs)
+    else:
+        @wraps(view_func)
+        def wrapped_view(request, *args, **kwargs):
+            mark_readonly(request)
+            return view_func(request, *args, **kwargs)
+    return wrapped_view
@@ -0,0 +1,171 @@
+"""
+Sparse TF-IDF text vectors used by job recommendations and matching.
+
+Documents are tokenized and hashed into a fixed number of buckets (the
+"hashing trick"), so no vocabulary has to be stored or kept in sync between
+runs. Vectors are plain {bucket: weight} dicts normalized to unit length, which
+makes a dot product equal to the cosine similarity.
+
+Top-K search builds an inverted index over the candidate vectors and scores a
+block of queries at a time, which is the sparse equivalent of multiplying a
+block of the query matrix by the transposed candidate matrix. Blocks can be
+spread over a process pool for large batch runs.
+"""
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import math
+import re
+import zlib
+
+
+N_FEATURES = 2 ** 18
+
+# Keeps tokens such as "c++", "c#" and "node.js" intact
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+STOP_WORDS = frozenset("""
+    a about above after all also an and any are as at be been being but by can
+    could did do does for from had has have he her his how i if in into is it its
+    job jobs may more most must no not of on or our out over per she should so
+    some such than that the their them then there these they this those through
+    to under up us very was we were what when where which while who will with
+    work would you your
+""".split())
+
+
+def tokenize(text):
+    """Lowercase word tokens with stop words and single characters removed."""
+    tokens = []
+    for token in TOKEN_RE.findall((text or '').lower()):
+        token = token.rstrip('.')
+        if len(token) > 1 and token not in STOP_WORDS:
+            tokens.append(token)
+    return tokens
+
+
+def bucket(token, n_features=N_FEATURES):
+    # crc32 rather than hash(): stable across processes and interpreter restarts
+    return zlib.crc32(token.encode()) % n_features
+
+
+def term_counts(texts=(), features=(), n_features=N_FEATURES):
+    """
+    Hashed term counts for one document.
+
+    `texts` is an iterable of (text, weight) pairs whose tokens each count `weight`
+    times; `features` is an iterable of (token, weight) pairs added verbatim, for
+    categorical values such as 'category:tech_software'.
+    """
+    counts = Counter()
+    for text, weight in texts:
+        for token in tokenize(text):
+            counts[bucket(token, n_features)] += weight
+    for token, weight in features:
+        counts[bucket(token, n_features)] += weight
+    return counts
+
+
+def idf_weights(documents):
+    """
+    Smoothed inverse document frequencies for an iterable of term-count dicts.
+    Returns (idf, default_idf); default_idf applies to buckets unseen in `documents`.
+    """
+    doc_freq = Counter()
+    n_docs = 0
+    for counts in documents:
+        doc_freq.update(counts.keys())
+        n_docs += 1
+    idf = {b: math.log((1 + n_docs) / (1 + df)) + 1 for b, df in doc_freq.items()}
+    return idf, math.log(1 + n_docs) + 1
+
+
+def tfidf_vector(counts, idf, default_idf=1.0):
+    """Unit-length TF-IDF vector with sublinear term frequency (1 + log tf)."""
+    vector = {b: (1 + math.log(tf)) * idf.get(b, default_idf) for b, tf in counts.items() if tf > 0}
+    norm = math.sqrt(sum(w * w for w in vector.values()))
+    if not norm:
+        return {}
+    return {b: w / norm for b, w in vector.items()}
+
+
+def cosine(a, b):
+    """Cosine similarity of two unit-length sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b[k] for k, w in a.items() if k in b)
+
+
+class SparseIndex:
+    """Inverted index over a set of candidate vectors keyed by id."""
+
+    def __init__(self, vectors):
+        self.postings = defaultdict(list)
+        for key, vector in vectors.items():
+            for b, w in vector.items():
+                self.postings[b].append((key, w))
+
+    def scores(self, vector):
+        """Dot product of `vector` with every candidate sharing at least one bucket."""
+        scores = defaultdict(float)
+        for b, w in vector.items():
+            for key, cw in self.postings.get(b, ()):
+                scores[key] += w * cw
+        return scores
+
+    def top_k(self, vector, k, exclude=(), min_score=0.0):
+        """The k best (key, score) pairs for `vector`, highest score first."""
+        candidates = (
+            (key, score) for key, score in self.scores(vector).items()
+            if score > min_score and key not in exclude
+        )
+        return heapq.nlargest(k, candidates, key=lambda item: (item[1], item[0]))
+
+
+# Index shared with pool workers; set once per worker by _init_worker()
+_worker_index = None
+
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _score_block(block, k, min_score):
+    return [
+        (key, _worker_index.top_k(vector, k, exclude, min_score))
+        for key, vector, exclude in block
+    ]
+
+
+def blocked_top_k(index, queries, k, block_size=500, workers=1, min_score=0.0):
+    """
+    Top-k candidates from `index` for each query, scored in blocks.
+
+    `queries` is an iterable of (key, vector, exclude) tuples. Yields
+    (key, [(candidate_key, score), ...]) in input order. With workers > 1 the
+    blocks are scored in a process pool that receives the index once per worker.
+    """
+    blocks = []
+    block = []
+    for query in queries:
+        block.append(query)
+        if len(block) >= block_size:
+            blocks.append(block)
+            block = []
+    if block:
+        blocks.append(block)
+
+    if workers <= 1 or len(blocks) <= 1:
+        _init_worker(index)
+        try:
+            for block in blocks:
+                yield from _score_block(block, k, min_score)
+        finally:
+            _init_worker(None)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index,)) as pool:
+        futures = [pool.submit(_score_block, block, k, min_score) for block in blocks]
+        for future in futures:
+            yield from future.result()